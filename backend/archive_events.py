@@ -0,0 +1,121 @@
+"""
+Move the scores of past events out of the hot scores table.
+
+Starting an event allocates a new event id (see /change-event) instead of deleting
+the previous scores, so the scores table keeps every event until it is archived.
+This script copies each past event's rows into scores_archive and removes them
+from scores, one event per transaction, using the event_id index. With --drop the
+rows are deleted without being copied. The active event (the latest one) is never
+touched, and --keep leaves the most recent past events in place as well.
+
+It also compacts the event_status and current_performer audit tables down to the
+last --keep-history events. The backend does the same in the background whenever
+an event starts (HISTORY_KEEP_EVENTS).
+
+Run it between events, e.g. from cron:
+    python archive_events.py --keep 1
+    python archive_events.py --drop
+"""
+import argparse
+import sys
+from contextlib import closing
+
+SCORE_COLUMNS = (
+    'score_id, event_id, judge_id, performer_id, '
+    'presentation, stage_presence, choreography, timing, performance'
+)
+
+
+def past_event_ids(cursor, keep=0):
+    """
+    Ids of events older than the active one that still have rows in scores,
+    leaving out the `keep` most recent of them.
+    """
+    cursor.execute("SELECT MAX(id) FROM event")
+    active = cursor.fetchone()[0]
+    if active is None:
+        return []
+    cursor.execute(
+        "SELECT DISTINCT event_id FROM scores WHERE event_id < %s ORDER BY event_id",
+        (active,)
+    )
+    event_ids = [row[0] for row in cursor.fetchall()]
+    return event_ids[:len(event_ids) - keep] if keep else event_ids
+
+
+def archive_events(conn, keep=0, drop=False):
+    """
+    Archive (or with drop=True, delete) the scores of past events.
+    Returns a list of (event_id, rows moved).
+    """
+    archived = []
+    with conn.cursor() as cursor:
+        for event_id in past_event_ids(cursor, keep):
+            conn.start_transaction()
+            try:
+                if not drop:
+                    cursor.execute(
+                        f"INSERT INTO scores_archive ({SCORE_COLUMNS}) "
+                        f"SELECT {SCORE_COLUMNS} FROM scores WHERE event_id = %s",
+                        (event_id,)
+                    )
+                cursor.execute("DELETE FROM scores WHERE event_id = %s", (event_id,))
+                archived.append((event_id, cursor.rowcount))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    return archived
+
+
+def compact_history(conn, keep_events):
+    """
+    Delete the event_status and current_performer audit rows of all but the
+    `keep_events` most recent events. Returns the number of rows removed.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT id FROM event ORDER BY id DESC LIMIT 1 OFFSET %s",
+            (max(keep_events, 1) - 1,)
+        )
+        result = cursor.fetchone()
+        if not result:
+            return 0
+        removed = 0
+        for table in ('event_status', 'current_performer'):
+            cursor.execute(f"DELETE FROM {table} WHERE event_id < %s", (result[0],))
+            removed += cursor.rowcount
+        return removed
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Archive the scores of past events.')
+    parser.add_argument('--keep', type=int, default=0,
+                        help='number of most recent past events to leave in the scores table')
+    parser.add_argument('--drop', action='store_true',
+                        help='delete past scores instead of copying them to scores_archive')
+    parser.add_argument('--keep-history', type=int, default=10,
+                        help='number of most recent events whose audit rows are kept')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    import main as backend
+
+    with closing(backend.connect_db()) as conn:
+        archived = archive_events(conn, keep=args.keep, drop=args.drop)
+        compacted = compact_history(conn, args.keep_history)
+
+    action = 'Dropped' if args.drop else 'Archived'
+    for event_id, rows in archived:
+        print(f"{action} {rows} scores of event {event_id}")
+    if not archived:
+        print('No past events to archive.')
+    print(f"Removed {compacted} audit rows of older events")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""
+Judge authentication: slow password hashes checked once at login, and signed,
+expiring session tokens verified in memory on every judge request.
+
+Passwords are stored as werkzeug hashes. Rows still holding a plaintext password
+(from before hashing was introduced) are compared in constant time and replaced by
+a hash on the judge's next successful login.
+"""
+import hmac
+
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from werkzeug.security import check_password_hash, generate_password_hash
+
+_HASH_METHODS = ('scrypt:', 'pbkdf2:')
+
+# Checked against when the email is unknown, so a failed login takes as long either way
+_dummy_hash = None
+
+
+def is_password_hash(stored):
+    return stored.startswith(_HASH_METHODS) and stored.count('$') == 2
+
+
+def hash_password(password):
+    return generate_password_hash(password)
+
+
+def check_password(stored, password):
+    """
+    Return (matches, new_hash): new_hash is set when a legacy plaintext password
+    matched and should be replaced by it.
+    """
+    if stored is None:
+        global _dummy_hash
+        if _dummy_hash is None:
+            _dummy_hash = generate_password_hash('')
+        check_password_hash(_dummy_hash, password)
+        return False, None
+    if is_password_hash(stored):
+        return check_password_hash(stored, password), None
+    if hmac.compare_digest(stored.encode(), password.encode()):
+        return True, hash_password(password)
+    return False, None
+
+
+class JudgeTokens:
+    """
+    Issues and verifies judge session tokens: the judge's id and weight, signed
+    with the server secret and timestamped, valid for `max_age` seconds.
+    """
+
+    def __init__(self, secret, max_age=12 * 3600):
+        self._serializer = URLSafeTimedSerializer(secret, salt='judge-session')
+        self.max_age = max_age
+
+    def issue(self, judge):
+        return self._serializer.dumps({'judge_id': judge['judge_id'], 'weight': float(judge['weight'])})
+
+    def verify(self, token):
+        """
+        Return the token's claims, or None if it is forged, malformed or expired.
+        """
+        try:
+            return self._serializer.loads(token, max_age=self.max_age)
+        except BadSignature:
+            return None
@@ -0,0 +1,772 @@
+"""
+Load-testing benchmark that replays a simulated event against the backend.
+
+The backend runs in-process against the SQLite stand-in (sqlite_standin.py), and
+clients are simulated the way the frontend behaves when polling:
+
+- every judge logs in, loads /performers, then polls /event-status,
+  /current-performer and /canVote/<judge_id> every 5 seconds (EventDetails.js)
+- every bystander loads /performers-and-judges, then polls /current-scores
+  every 5 seconds (Bystander.js)
+- the head judge sets each performer in turn and, after each performance, the
+  judges submit scores in judge_id order
+- the admin starts and ends the event and reads /final-scores (Admin.js)
+
+The timeline is generated from a fixed seed and replayed in one-second slices;
+requests in the same slice run concurrently. For each endpoint the report gives
+latency percentiles, error counts and database statements per request.
+
+With --memory-rows the benchmark instead seeds events of the given sizes and
+measures peak Python memory and time to first byte of /current-scores, buffered
+versus ?stream=1, to show that streamed responses stay flat as events grow.
+
+Usage:
+    python benchmark.py --judges 5 --bystanders 50 --output run.json
+    python benchmark.py --output new.json --compare run.json
+    python benchmark.py --memory-rows 1000,10000,100000
+    python benchmark.py --score-burst --judges 10 --performers 50
+    python benchmark.py --payload --judges 20 --performers 200
+    python benchmark.py --scoring --judges 15 --performers 20000
+    python benchmark.py --cold-start --judges 15 --performers 2000
+
+With --score-burst every judge submits scores for every performer as fast as the
+client threads allow, once per write mode (direct INSERTs and SCORE_WRITE_MODE=group),
+and the report compares submissions per second, commits and latency.
+
+With --payload the benchmark seeds a fully scored roster of --performers x --judges
+and compares the /current-scores row and matrix formats: body size per encoding and
+the time to build an uncached response.
+
+With --scoring the benchmark ranks a randomly scored roster of --performers x --judges
+(one judge in ten skips each performer) with every scoring.py method, checks that the
+vectorized weighted ranking matches the leaderboard exactly (totals and order), and
+reports the time of each method next to the row-by-row leaderboard rebuild. It exits
+with status 1 if the rankings differ.
+
+With --cold-start the benchmark seeds a fully scored roster and times the first request
+to each read endpoint of a freshly started backend, once cold and once after warm_up(),
+next to the steady-state latency of the same requests.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlite_standin
+
+POLL_INTERVAL = 5
+CRITERIA = ('presentation', 'stage_presence', 'choreography', 'timing', 'performance')
+
+
+class Request:
+    __slots__ = ('at', 'label', 'method', 'path', 'body', 'judge_id')
+
+    def __init__(self, at, label, method, path, body=None, judge_id=None):
+        self.at = at
+        self.label = label
+        self.method = method
+        self.path = path
+        self.body = body
+        self.judge_id = judge_id  # sent with this judge's session token
+
+
+def build_timeline(args, rng):
+    """
+    Generate the list of client requests for the whole simulated event, ordered by time.
+    """
+    timeline = []
+    judges = list(range(1, args.judges + 1))
+
+    def add(at, label, method, path, body=None, judge_id=None):
+        timeline.append(Request(at, label, method, path, body, judge_id))
+
+    # Admin opens the dashboard and starts the event
+    add(0, '/ready', 'GET', '/ready')
+    add(0, '/event-status', 'GET', '/event-status')
+    add(1, '/change-event', 'POST', '/change-event')
+
+    # Judges log in and load the performer list
+    for judge_id in judges:
+        at = rng.uniform(0, 3)
+        add(at, '/judge/login', 'POST', '/judge/login',
+            {'email': f'judge{judge_id}@sjsu.edu', 'password': f'password{judge_id}'})
+        add(at + 0.1, '/performers', 'GET', '/performers')
+
+    # Each performance: set performer, perform, judges score in judge_id order
+    at = 5
+    for performer_id in range(1, args.performers + 1):
+        add(at, '/set-current-performer', 'POST', '/set-current-performer', {'performer_id': performer_id}, 1)
+        at += args.performance_seconds
+        for judge_id in judges:
+            at += rng.uniform(1, 4)
+            scores = {criterion: rng.randint(1, 5) for criterion in CRITERIA}
+            add(at, '/scores', 'POST', '/scores',
+                {'judge_id': judge_id, 'performer_id': performer_id, 'scores': scores}, judge_id)
+        at += 2
+    end = at
+
+    # A tablet re-syncing its submissions for the first performer (all duplicates by now)
+    add(end, '/scores/batch', 'POST', '/scores/batch', {'submissions': [
+        {'judge_id': 1, 'performer_id': 1, 'scores': {criterion: 3 for criterion in CRITERIA}}
+    ]}, 1)
+
+    # Judges poll every 5 seconds from a random phase
+    for judge_id in judges:
+        phase = rng.uniform(0, POLL_INTERVAL)
+        t = 3 + phase
+        while t < end:
+            add(t, '/event-status', 'GET', '/event-status')
+            add(t, '/current-performer', 'GET', '/current-performer')
+            add(t, '/canVote/<judge_id>', 'GET', f'/canVote/{judge_id}', judge_id=judge_id)
+            t += POLL_INTERVAL
+
+    # Bystanders load the roster once, then poll the scoreboard
+    for _ in range(args.bystanders):
+        t = rng.uniform(0, end / 4)
+        add(t, '/performers-and-judges', 'GET', '/performers-and-judges')
+        t += rng.uniform(0, POLL_INTERVAL)
+        while t < end:
+            add(t, '/current-scores', 'GET', '/current-scores')
+            t += POLL_INTERVAL
+
+    # Admin checks results and ends the event; one pass over the remaining routes
+    add(end + 1, '/final-scores', 'GET', '/final-scores')
+    add(end + 1, '/canVote', 'GET', '/canVote')
+    add(end + 2, '/change-event', 'POST', '/change-event')
+    add(end + 3, '/final-scores', 'GET', '/final-scores')
+    for path in ('/', '/pool-stats', '/cache-stats', '/stream-stats', '/metrics', '/ready'):
+        add(end + 4, path, 'GET', path)
+    add(end + 4, '/stream', 'STREAM', '/stream')
+
+    timeline.sort(key=lambda request: request.at)
+    return timeline
+
+
+def judge_headers(backend, judge_id):
+    # What the judge's client sends after logging in (the token only has to verify)
+    token = backend.judge_tokens.issue({'judge_id': judge_id, 'weight': 1.0})
+    return {'Authorization': f'Bearer {token}'}
+
+
+def run_request(backend, request):
+    client = backend.app.test_client()
+    headers = judge_headers(backend, request.judge_id) if request.judge_id else {}
+    queries_before = sqlite_standin.query_count()
+    started = time.perf_counter()
+    if request.method == 'STREAM':
+        # Time to the first frame of the live stream, then disconnect
+        response = client.get(request.path, buffered=False)
+        next(iter(response.response))
+        response.close()
+    elif request.method == 'POST':
+        response = client.post(request.path, json=request.body, headers=headers)
+    else:
+        response = client.get(request.path, headers=headers)
+        response.get_data()
+    elapsed = time.perf_counter() - started
+    return request.label, elapsed, response.status_code, sqlite_standin.query_count() - queries_before
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(samples, wall_time):
+    endpoints = {}
+    for label, elapsed, status, queries in samples:
+        endpoint = endpoints.setdefault(label, {'latencies': [], 'errors': 0, 'queries': 0})
+        endpoint['latencies'].append(elapsed * 1000)
+        endpoint['queries'] += queries
+        if status >= 500:
+            endpoint['errors'] += 1
+
+    report = {}
+    for label, endpoint in sorted(endpoints.items()):
+        latencies = sorted(endpoint['latencies'])
+        count = len(latencies)
+        report[label] = {
+            'requests': count,
+            'errors': endpoint['errors'],
+            'p50_ms': round(percentile(latencies, 0.50), 3),
+            'p95_ms': round(percentile(latencies, 0.95), 3),
+            'p99_ms': round(percentile(latencies, 0.99), 3),
+            'mean_ms': round(sum(latencies) / count, 3),
+            'db_queries': endpoint['queries'],
+            'db_queries_per_request': round(endpoint['queries'] / count, 3),
+        }
+
+    total = len(samples)
+    return {
+        'total_requests': total,
+        'total_db_queries': sum(endpoint['db_queries'] for endpoint in report.values()),
+        'wall_time_s': round(wall_time, 3),
+        'throughput_rps': round(total / wall_time, 1) if wall_time else 0.0,
+        'endpoints': report,
+    }
+
+
+def replay(backend, args):
+    """
+    Replay one simulated event against a fresh database; returns (samples, wall time).
+    """
+    rng = random.Random(args.seed)
+    workdir = tempfile.mkdtemp(prefix='scoreboard-bench-')
+    db_path = os.path.join(workdir, 'bench.db')
+    sqlite_standin.create_database(db_path, performers=args.performers, judges=args.judges, seed=args.seed)
+
+    backend.reset_process_state()
+    backend.db_pool = backend.create_db_pool(
+        lambda: sqlite_standin.connect(db_path, autocommit=True),
+        size=args.pool_size,
+        ping=lambda conn: conn.ping()
+    )
+    # Workers warm up before they take traffic (see gunicorn.conf.py)
+    backend.run_warm_up()
+
+    timeline = build_timeline(args, rng)
+    samples = []
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            # Replay one simulated second at a time; requests within it run concurrently
+            index = 0
+            while index < len(timeline):
+                second = int(timeline[index].at)
+                batch = []
+                while index < len(timeline) and int(timeline[index].at) == second:
+                    batch.append(timeline[index])
+                    index += 1
+                samples.extend(executor.map(lambda request: run_request(backend, request), batch))
+        wall_time = time.perf_counter() - started
+    finally:
+        backend.db_pool.close_all()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return samples, wall_time
+
+
+def run(args):
+    import main as backend
+
+    # Latency percentiles are computed over the samples of all repetitions,
+    # which smooths out scheduler noise between runs
+    samples = []
+    wall_time = 0.0
+    for _ in range(args.repeat):
+        run_samples, run_wall_time = replay(backend, args)
+        samples.extend(run_samples)
+        wall_time += run_wall_time
+
+    result = summarize(samples, wall_time)
+    result['config'] = {
+        'judges': args.judges,
+        'bystanders': args.bystanders,
+        'performers': args.performers,
+        'performance_seconds': args.performance_seconds,
+        'concurrency': args.concurrency,
+        'pool_size': args.pool_size,
+        'repeat': args.repeat,
+        'seed': args.seed,
+    }
+    return result
+
+
+def measure_response(app, path):
+    """
+    Fetch path and read the body chunk by chunk, as a WSGI server would send it.
+    Returns (peak traced bytes, seconds to first body chunk, bytes sent).
+    """
+    client = app.test_client()
+    tracemalloc.start()
+    started = time.perf_counter()
+    first_byte = None
+    sent = 0
+    response = client.get(path, buffered=False)
+    for chunk in response.response:
+        if first_byte is None:
+            first_byte = time.perf_counter() - started
+        sent += len(chunk)
+    response.close()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak, first_byte or 0.0, sent
+
+
+def measure_memory(backend, args):
+    """
+    For each event size, seed that many score rows and compare peak memory and
+    time to first byte of /current-scores buffered and streamed.
+    """
+    results = []
+    rng = random.Random(args.seed)
+    for rows in args.memory_rows:
+        judges = min(rows, 10)
+        performers = -(-rows // judges)
+        workdir = tempfile.mkdtemp(prefix='scoreboard-bench-')
+        db_path = os.path.join(workdir, 'bench.db')
+        sqlite_standin.create_database(db_path, performers=performers, judges=judges, seed=args.seed)
+        db = sqlite3.connect(db_path)
+        db.executemany(
+            "INSERT INTO scores (event_id, judge_id, performer_id, presentation, stage_presence, "
+            "choreography, timing, performance) VALUES (1, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (index % judges + 1, index // judges + 1, *(rng.randint(1, 5) for _ in CRITERIA))
+                for index in range(rows)
+            )
+        )
+        db.commit()
+        db.close()
+
+        backend.reset_process_state()
+        backend.db_pool = backend.create_db_pool(
+            lambda: sqlite_standin.connect(db_path, autocommit=True),
+            size=args.pool_size,
+            ping=lambda conn: conn.ping()
+        )
+        try:
+            result = {'rows': rows}
+            for mode, path in (('buffered', '/current-scores'), ('streamed', '/current-scores?stream=1')):
+                # Each mode starts cold so neither benefits from the response cache
+                backend.response_cache.clear()
+                peak, first_byte, sent = measure_response(backend.app, path)
+                result[mode] = {
+                    'peak_kib': round(peak / 1024, 1),
+                    'first_byte_ms': round(first_byte * 1000, 3),
+                    'bytes': sent
+                }
+            results.append(result)
+        finally:
+            backend.db_pool.close_all()
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def measure_score_burst(backend, args):
+    """
+    Submit every judge's scores for every performer concurrently, once with direct
+    autocommitted INSERTs and once through the group commit writer.
+    """
+    from group_commit import GroupCommitWriter
+
+    rng = random.Random(args.seed)
+    submissions = [
+        {
+            'judge_id': judge_id,
+            'performer_id': performer_id,
+            'scores': {criterion: rng.randint(1, 5) for criterion in CRITERIA}
+        }
+        for performer_id in range(1, args.performers + 1)
+        for judge_id in range(1, args.judges + 1)
+    ]
+    # Resubmit a few, so the duplicate path is exercised in both modes
+    submissions += submissions[:args.judges]
+
+    results = {}
+    for mode in ('direct', 'group'):
+        workdir = tempfile.mkdtemp(prefix='scoreboard-bench-')
+        db_path = os.path.join(workdir, 'bench.db')
+        sqlite_standin.create_database(db_path, performers=args.performers, judges=args.judges, seed=args.seed)
+
+        backend.reset_process_state()
+        backend.db_pool = backend.create_db_pool(
+            lambda: sqlite_standin.connect(db_path, autocommit=True),
+            size=args.pool_size,
+            ping=lambda conn: conn.ping()
+        )
+        backend.score_writer = GroupCommitWriter(
+            backend.get_db_connection,
+            backend.INSERT_SCORES_QUERY,
+            window=args.group_commit_window_ms / 1000,
+            max_batch=args.group_commit_max_batch
+        ) if mode == 'group' else None
+
+        def submit(body):
+            client = backend.app.test_client()
+            started = time.perf_counter()
+            response = client.post('/scores', json=body, headers=judge_headers(backend, body['judge_id']))
+            return time.perf_counter() - started, response.status_code
+
+        commits_before = sqlite_standin.commit_count()
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                samples = list(executor.map(submit, submissions))
+            wall_time = time.perf_counter() - started
+            commits = sqlite_standin.commit_count() - commits_before
+        finally:
+            if backend.score_writer is not None:
+                backend.score_writer.close()
+                backend.score_writer = None
+            backend.db_pool.close_all()
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        latencies = sorted(elapsed for elapsed, _ in samples)
+        statuses = [status for _, status in samples]
+        results[mode] = {
+            'submissions': len(samples),
+            'created': statuses.count(201),
+            'duplicates': statuses.count(400),
+            'errors': sum(1 for status in statuses if status >= 500),
+            'commits': commits,
+            'submissions_per_s': round(len(samples) / wall_time, 1),
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        }
+    return results
+
+
+def create_scored_database(db_path, args):
+    """
+    Seed a roster of --performers x --judges in which every judge scored every performer.
+    """
+    rng = random.Random(args.seed)
+    sqlite_standin.create_database(db_path, performers=args.performers, judges=args.judges, seed=args.seed)
+    db = sqlite3.connect(db_path)
+    db.executemany(
+        "INSERT INTO scores (event_id, judge_id, performer_id, presentation, stage_presence, "
+        "choreography, timing, performance) VALUES (1, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (judge_id, performer_id, *(rng.randint(1, 5) for _ in CRITERIA))
+            for performer_id in range(1, args.performers + 1)
+            for judge_id in range(1, args.judges + 1)
+        )
+    )
+    db.commit()
+    db.close()
+
+
+def measure_payload(backend, args, runs=20):
+    """
+    Compare /current-scores?format=rows and ?format=matrix for a fully scored roster:
+    body size uncompressed, gzip and brotli, and median time to render the response
+    with the response cache cleared (the roster and leaderboard stay warm).
+    """
+    workdir = tempfile.mkdtemp(prefix='scoreboard-bench-')
+    db_path = os.path.join(workdir, 'bench.db')
+    create_scored_database(db_path, args)
+
+    backend.reset_process_state()
+    backend.db_pool = backend.create_db_pool(
+        lambda: sqlite_standin.connect(db_path, autocommit=True),
+        size=args.pool_size,
+        ping=lambda conn: conn.ping()
+    )
+    client = backend.app.test_client()
+    results = {}
+    try:
+        for response_format in ('rows', 'matrix'):
+            path = f'/current-scores?format={response_format}'
+            client.get(path)
+            timings = []
+            for _ in range(runs):
+                backend.response_cache.clear()
+                started = time.perf_counter()
+                client.get(path).get_data()
+                timings.append(time.perf_counter() - started)
+            result = {'render_ms': round(percentile(sorted(timings), 0.5) * 1000, 3)}
+            for encoding in ('identity', 'gzip', 'br'):
+                response = client.get(path, headers={'Accept-Encoding': encoding})
+                if response.headers.get('Content-Encoding', 'identity') == encoding:
+                    result[f'{encoding}_bytes'] = len(response.get_data())
+            results[response_format] = result
+    finally:
+        backend.db_pool.close_all()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+COLD_START_PATHS = (
+    '/event-status',
+    '/performers-and-judges',
+    '/current-scores',
+    '/current-scores?format=matrix',
+    '/final-scores',
+)
+
+
+def measure_cold_start(backend, args, runs=20):
+    """
+    Time the first request to each of COLD_START_PATHS on a freshly started backend,
+    without and with warm_up(), and the median of later requests with the response
+    cache cleared (steady state).
+    """
+    workdir = tempfile.mkdtemp(prefix='scoreboard-bench-')
+    db_path = os.path.join(workdir, 'bench.db')
+    create_scored_database(db_path, args)
+
+    results = {'paths': {path: {} for path in COLD_START_PATHS}}
+    try:
+        for mode in ('cold', 'warm'):
+            backend.db_pool.close_all()
+            backend.reset_process_state()
+            backend.db_pool = backend.create_db_pool(
+                lambda: sqlite_standin.connect(db_path, autocommit=True),
+                size=args.pool_size,
+                ping=lambda conn: conn.ping()
+            )
+            if mode == 'warm':
+                started = time.perf_counter()
+                backend.warm_up()
+                results['warm_up_ms'] = round((time.perf_counter() - started) * 1000, 3)
+            client = backend.app.test_client()
+            for path in COLD_START_PATHS:
+                started = time.perf_counter()
+                client.get(path).get_data()
+                results['paths'][path][f'{mode}_first_ms'] = round((time.perf_counter() - started) * 1000, 3)
+
+        for path in COLD_START_PATHS:
+            timings = []
+            for _ in range(runs):
+                backend.response_cache.clear()
+                started = time.perf_counter()
+                client.get(path).get_data()
+                timings.append(time.perf_counter() - started)
+            results['paths'][path]['steady_ms'] = round(percentile(sorted(timings), 0.5) * 1000, 3)
+    finally:
+        backend.db_pool.close_all()
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def measure_scoring(args, runs=5):
+    import scoring
+    from leaderboard import Leaderboard
+
+    rng = random.Random(args.seed)
+    weights = [round(rng.uniform(0.5, 2.5), 2) for _ in range(args.judges)]
+    rows = [
+        {
+            'performer_id': performer_id,
+            'performer_name': f'Performer {performer_id}',
+            'judge_id': judge_id,
+            'judge_name': f'Judge {judge_id}',
+            **{criterion: rng.randint(1, 5) for criterion in CRITERIA},
+            'weight': weights[judge_id - 1]
+        }
+        for performer_id in range(1, args.performers + 1)
+        for judge_id in range(1, args.judges + 1)
+        if rng.random() >= 0.1
+    ]
+
+    def median_ms(function):
+        timings = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            result = function()
+            timings.append(time.perf_counter() - started)
+        return round(percentile(sorted(timings), 0.5) * 1000, 3), result
+
+    leaderboard = Leaderboard()
+    results = {'rows': len(rows)}
+    results['leaderboard_rebuild_ms'], _ = median_ms(lambda: leaderboard._rebuild(rows))
+    results['arrays_build_ms'], arrays = median_ms(lambda: scoring.ScoreArrays.from_rows(rows))
+    for method in scoring.METHODS:
+        results[f'{method}_ms'], _ = median_ms(lambda: scoring.rank(arrays, method))
+    results['tiebreak_ms'], _ = median_ms(
+        lambda: scoring.rank(arrays, 'weighted', {'choreography': 2}, ['performance', 'timing'])
+    )
+
+    order, totals = scoring.rank(arrays)
+    results['weighted_matches_leaderboard'] = arrays.entries(order, totals) == leaderboard.ranked()
+    return results
+
+
+def print_scoring_report(results):
+    print(f"{results['rows']} scores")
+    for key, value in results.items():
+        if key.endswith('_ms'):
+            print(f"{key[:-3]:<24}{value:>10.3f} ms")
+    print(f"weighted ranking matches leaderboard: {results['weighted_matches_leaderboard']}")
+
+
+def print_cold_start_report(results):
+    print(f"{'path':<32}{'cold first ms':>15}{'warm first ms':>15}{'steady ms':>12}")
+    for path, result in results['paths'].items():
+        print(f"{path:<32}{result['cold_first_ms']:>15.3f}{result['warm_first_ms']:>15.3f}{result['steady_ms']:>12.3f}")
+    print(f"\nwarm-up took {results['warm_up_ms']:.3f} ms")
+
+
+def print_payload_report(results):
+    print(f"{'format':<10}{'bytes':>10}{'gzip':>10}{'brotli':>10}{'render ms':>12}")
+    for response_format, result in results.items():
+        print(
+            f"{response_format:<10}{result['identity_bytes']:>10}{result.get('gzip_bytes', '-'):>10}"
+            f"{result.get('br_bytes', '-'):>10}{result['render_ms']:>12.3f}"
+        )
+
+
+def print_burst_report(results):
+    print(f"{'mode':<10}{'subs':>7}{'201':>7}{'dup':>6}{'err':>6}{'commits':>9}{'subs/s':>10}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<10}{result['submissions']:>7}{result['created']:>7}{result['duplicates']:>6}"
+            f"{result['errors']:>6}{result['commits']:>9}{result['submissions_per_s']:>10.1f}"
+            f"{result['p50_ms']:>10.3f}{result['p95_ms']:>10.3f}"
+        )
+
+
+def print_memory_report(results):
+    print(f"{'rows':>10}{'buffered KiB':>15}{'streamed KiB':>15}{'buffered TTFB ms':>19}{'streamed TTFB ms':>19}")
+    for result in results:
+        print(
+            f"{result['rows']:>10}{result['buffered']['peak_kib']:>15.1f}{result['streamed']['peak_kib']:>15.1f}"
+            f"{result['buffered']['first_byte_ms']:>19.3f}{result['streamed']['first_byte_ms']:>19.3f}"
+        )
+
+
+def print_report(result):
+    print(f"{'endpoint':<28}{'reqs':>8}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'q/req':>8}")
+    for label, endpoint in result['endpoints'].items():
+        print(
+            f"{label:<28}{endpoint['requests']:>8}{endpoint['errors']:>6}"
+            f"{endpoint['p50_ms']:>10.3f}{endpoint['p95_ms']:>10.3f}{endpoint['p99_ms']:>10.3f}"
+            f"{endpoint['db_queries_per_request']:>8.2f}"
+        )
+    print(
+        f"\n{result['total_requests']} requests, {result['total_db_queries']} DB statements "
+        f"in {result['wall_time_s']}s ({result['throughput_rps']} req/s)"
+    )
+
+
+def compare(baseline, result, threshold, min_delta_ms, min_samples):
+    """
+    Print per-endpoint differences and return the list of regressions: p95 latency up by
+    more than `threshold` and by at least `min_delta_ms` (only for endpoints with at least
+    `min_samples` requests, since percentiles of a handful of requests are noise), or DB
+    statements per request up by more than 10% and by at least 0.1.
+    """
+    regressions = []
+    print(f"\n{'endpoint':<28}{'p95 base':>10}{'p95 new':>10}{'change':>9}{'q/req base':>12}{'q/req new':>11}")
+    for label, new in result['endpoints'].items():
+        old = baseline['endpoints'].get(label)
+        if old is None:
+            print(f"{label:<28}{'-':>10}{new['p95_ms']:>10.3f}{'new':>9}")
+            continue
+        change = (new['p95_ms'] - old['p95_ms']) / old['p95_ms'] if old['p95_ms'] else 0.0
+        print(
+            f"{label:<28}{old['p95_ms']:>10.3f}{new['p95_ms']:>10.3f}{change:>+9.1%}"
+            f"{old['db_queries_per_request']:>12.2f}{new['db_queries_per_request']:>11.2f}"
+        )
+        enough_samples = min(old['requests'], new['requests']) >= min_samples
+        if enough_samples and change > threshold and new['p95_ms'] - old['p95_ms'] > min_delta_ms:
+            regressions.append(f"{label}: p95 {old['p95_ms']}ms -> {new['p95_ms']}ms")
+        queries_delta = new['db_queries_per_request'] - old['db_queries_per_request']
+        if queries_delta >= 0.1 and queries_delta > 0.1 * old['db_queries_per_request']:
+            regressions.append(
+                f"{label}: DB statements/request {old['db_queries_per_request']} -> {new['db_queries_per_request']}"
+            )
+    return regressions
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Replay a simulated event against the backend.')
+    parser.add_argument('--judges', type=int, default=5)
+    parser.add_argument('--bystanders', type=int, default=50)
+    parser.add_argument('--performers', type=int, default=10)
+    parser.add_argument('--performance-seconds', type=int, default=60,
+                        help='simulated length of each performance')
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads')
+    parser.add_argument('--pool-size', type=int, default=10, help='database connection pool size')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3, help='number of times to replay the event')
+    parser.add_argument('--output', help='write the JSON result to this file')
+    parser.add_argument('--compare', help='baseline JSON result to compare against')
+    parser.add_argument('--threshold', type=float, default=0.5,
+                        help='relative p95 increase that counts as a regression')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='ignore p95 increases smaller than this many milliseconds')
+    parser.add_argument('--min-samples', type=int, default=20,
+                        help='only compare latency for endpoints with at least this many requests')
+    parser.add_argument('--memory-rows', type=lambda value: [int(rows) for rows in value.split(',')],
+                        help='comma-separated event sizes (score rows) for the /current-scores memory check')
+    parser.add_argument('--payload', action='store_true',
+                        help='compare /current-scores row and matrix payloads for a fully scored roster')
+    parser.add_argument('--score-burst', action='store_true',
+                        help='compare direct and group-committed score submission throughput')
+    parser.add_argument('--scoring', action='store_true',
+                        help='time the scoring.py methods and check the weighted ranking against the leaderboard')
+    parser.add_argument('--cold-start', action='store_true',
+                        help='compare first-request latency of a fresh backend with and without warm-up')
+    parser.add_argument('--group-commit-window-ms', type=float, default=5.0)
+    parser.add_argument('--group-commit-max-batch', type=int, default=100)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.payload:
+        import main as backend
+        results = measure_payload(backend, args)
+        print_payload_report(results)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'payload': results}, f, indent=2)
+        return 0
+
+    if args.scoring:
+        results = measure_scoring(args)
+        print_scoring_report(results)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'scoring': results}, f, indent=2)
+        return 0 if results['weighted_matches_leaderboard'] else 1
+
+    if args.cold_start:
+        import main as backend
+        results = measure_cold_start(backend, args)
+        print_cold_start_report(results)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'cold_start': results}, f, indent=2)
+        return 0
+
+    if args.score_burst:
+        import main as backend
+        results = measure_score_burst(backend, args)
+        print_burst_report(results)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'score_burst': results}, f, indent=2)
+        return 0
+
+    if args.memory_rows:
+        import main as backend
+        results = measure_memory(backend, args)
+        print_memory_report(results)
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump({'memory': results}, f, indent=2)
+        return 0
+
+    result = run(args)
+    print_report(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, result, args.threshold, args.min_delta_ms, args.min_samples)
+        if regressions:
+            print('\nRegressions:')
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print('\nNo regressions.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,170 @@
+import json
+import queue
+import threading
+import uuid
+from collections import deque
+
+
+class Subscription:
+    def __init__(self, max_queue):
+        self.messages = queue.Queue(maxsize=max_queue)
+        self.overflowed = False
+
+
+class Broadcaster:
+    """
+    Fan-out of live update events to any number of streaming clients.
+
+    Each published event is serialized once into a Server-Sent Events frame and the
+    same bytes are handed to every subscriber queue, so the cost of a write does not
+    grow with the number of connected screens beyond a queue put per client.
+    A short history of recent frames lets reconnecting clients replay what they
+    missed via Last-Event-ID; if that is no longer possible they receive a
+    `resync` event and should refetch over plain HTTP.
+
+    Event ids are '<epoch>-<n>' with a random epoch per process: every process numbers
+    its own events, so an id from another backend (or from before a restart) cannot
+    be replayed from and gets a resync.
+    """
+
+    def __init__(self, max_clients=1000, max_queue=100, history=256, keepalive=15.0):
+        self.max_clients = max_clients
+        self.max_queue = max_queue
+        self.keepalive = keepalive
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._history = deque(maxlen=history)  # (event id, frame)
+        self._next_id = 1
+        self.epoch = uuid.uuid4().hex[:8]
+        self._closed = False
+        self._published = 0
+        self._dropped = 0
+
+    def publish(self, event, data):
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            frame = _frame(f"{self.epoch}-{event_id}", event, data)
+            self._history.append((event_id, frame))
+            subscribers = list(self._subscribers)
+            self._published += 1
+
+        for subscription in subscribers:
+            try:
+                subscription.messages.put_nowait(frame)
+            except queue.Full:
+                # A client that cannot keep up is told to resync instead of blocking writers
+                subscription.overflowed = True
+                with self._lock:
+                    self._dropped += 1
+
+    def subscribe(self, last_event_id=None):
+        """
+        Register a new client, or return None when the client limit is reached.
+        The caller unsubscribes it once its response is closed, whether or not
+        stream() ever ran; unsubscribing twice is harmless.
+        """
+        subscription = Subscription(self.max_queue)
+        with self._lock:
+            if self._closed or len(self._subscribers) >= self.max_clients:
+                return None
+            self._subscribers.add(subscription)
+            if last_event_id is not None:
+                last_event_id = self._own_event_id(last_event_id)
+                replay = [] if last_event_id is None else [
+                    frame for event_id, frame in self._history if event_id > last_event_id
+                ]
+                oldest = self._history[0][0] if self._history else self._next_id
+                # An id we never issued comes from another process or from before a
+                # restart, and one older than the history is gone; replay is impossible
+                stale = last_event_id is None or last_event_id >= self._next_id or last_event_id + 1 < oldest
+                if stale or len(replay) > self.max_queue:
+                    subscription.overflowed = True
+                else:
+                    for frame in replay:
+                        subscription.messages.put_nowait(frame)
+        return subscription
+
+    def _own_event_id(self, last_event_id):
+        # The number in an id this process issued, or None
+        epoch, _, number = str(last_event_id).rpartition('-')
+        if epoch != self.epoch:
+            return None
+        try:
+            return int(number)
+        except ValueError:
+            return None
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def stream(self, subscription):
+        """
+        Generator of SSE frames for one client. Ends when the broadcaster is closed.
+        """
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    _drain(subscription.messages)
+                    yield _frame(None, 'resync', {})
+                try:
+                    frame = subscription.messages.get(timeout=self.keepalive)
+                except queue.Empty:
+                    # Comment line keeps proxies and load balancers from closing idle streams
+                    yield ": keepalive\n\n"
+                    continue
+                if frame is None:
+                    return
+                yield frame
+        finally:
+            self.unsubscribe(subscription)
+
+    def close(self):
+        """
+        Disconnect all clients, e.g. on graceful shutdown.
+        """
+        with self._lock:
+            self._closed = True
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            _drain(subscription.messages)
+            subscription.messages.put_nowait(None)
+
+    def reset_after_fork(self):
+        """
+        Drop subscribers inherited from the parent process; their connections belong to it.
+        """
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._closed = False
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'clients': len(self._subscribers),
+                'max_clients': self.max_clients,
+                'published': self._published,
+                'dropped': self._dropped,
+                'last_event_id': self._next_id - 1,
+            }
+
+
+def _frame(event_id, event, data):
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _drain(messages):
+    try:
+        while True:
+            messages.get_nowait()
+    except queue.Empty:
+        pass
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small thread-safe read-through cache with per-entry expiry and an LRU size bound.
+
+    Values are loaded on a miss by the caller-supplied loader. Write paths call
+    invalidate() so readers never see data older than the last write in this process.
+    With a SingleFlight, concurrent misses for the same key share one loader call.
+
+    Data that changes with a version (e.g. the data version) is stored under a plain
+    key with version=: each key holds one slot, only hit for the same version and
+    replaced by a newer one, so superseded versions do not pile up in memory.
+    """
+
+    def __init__(self, ttl=30.0, max_entries=256, flights=None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.flights = flights
+        self._lock = threading.RLock()
+        self._entries = OrderedDict()  # key -> (value, expires_at, version)
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    def get_or_load(self, key, loader, ttl=None, version=None):
+        """
+        Return the cached value for key (and version), calling loader() to populate it
+        on a miss. Exceptions from the loader propagate (to every coalesced caller) and
+        nothing is cached.
+        """
+        with self._lock:
+            entry = self._live_entry(key, version)
+            if entry is not None:
+                return entry[0]
+            generation = self._generation
+
+        def load():
+            value = loader()
+            with self._lock:
+                # Skip the store if a write invalidated the cache while we were loading,
+                # otherwise a slow reader could re-insert pre-write data
+                if generation == self._generation:
+                    self.put(key, value, ttl, version)
+            return value
+
+        if self.flights is None:
+            return load()
+        # Only loads started after the same invalidation are shared, so no caller
+        # gets data from before a write it may already have seen
+        value, _ = self.flights.do((key, generation, version), load)
+        return value
+
+    def get(self, key, default=None, version=None):
+        with self._lock:
+            entry = self._live_entry(key, version)
+            return default if entry is None else entry[0]
+
+    def _live_entry(self, key, version):
+        # Caller holds the lock; counts the lookup
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic() and entry[2] == version:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+        self._misses += 1
+        return None
+
+    def put(self, key, value, ttl=None, version=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            # A slow reader must not replace a newer version with its older one
+            if entry is not None and version is not None and entry[2] is not None and entry[2] > version:
+                return
+            expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (value, expires_at, version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys):
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': round(self._hits / lookups, 4) if lookups else 0.0,
+                'invalidations': self._invalidations,
+            }
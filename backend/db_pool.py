@@ -0,0 +1,385 @@
+import threading
+import time
+from time import perf_counter
+from collections import OrderedDict, deque
+
+import mysql.connector
+
+# Driver errors after which a connection can no longer be trusted
+_CONNECTION_ERRORS = (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError)
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a raw DB-API connection checked out of a ConnectionPool.
+    Calling close() hands the connection back to the pool instead of closing it,
+    so existing `with closing(get_db_connection())` blocks keep working unchanged.
+    Once closed, the wrapper refuses further use: the raw connection may already
+    belong to another caller.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self.broken = False
+
+    def _checked_out(self):
+        if self._raw is None:
+            raise mysql.connector.errors.ProgrammingError(msg='Connection was already returned to the pool')
+        return self._raw
+
+    def __getattr__(self, name):
+        return getattr(self._checked_out(), name)
+
+    def cursor(self, *args, prepared=False, **kwargs):
+        raw = self._checked_out()
+        if prepared and self._pool.prepare:
+            return PreparedCursor(self, self._pool._statements_for(raw), kwargs.get('dictionary', False))
+        return PooledCursor(self, raw.cursor(*args, **kwargs))
+
+    def close(self):
+        if self._raw is None:
+            return
+        raw, self._raw = self._raw, None
+        self._pool._release(raw, discard=self.broken)
+
+
+class PooledCursor:
+    """
+    Cursor wrapper that flags its connection as broken when the driver reports a
+    lost or unusable connection, so the pool recycles it instead of reusing it.
+    """
+
+    def __init__(self, conn, raw):
+        self._conn = conn
+        self._raw = raw
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._raw.close()
+
+    def execute(self, operation, *args, **kwargs):
+        return self._run(self._raw.execute, operation, args, kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._run(self._raw.executemany, operation, args, kwargs)
+
+    def _run(self, method, operation, args, kwargs):
+        on_query = self._conn._pool.on_query
+        started = perf_counter()
+        try:
+            return method(operation, *args, **kwargs)
+        except _CONNECTION_ERRORS:
+            self._conn.broken = True
+            raise
+        finally:
+            if on_query is not None:
+                on_query(operation, perf_counter() - started)
+
+
+class PreparedCursor(PooledCursor):
+    """
+    Cursor over server-side prepared statements that outlive it. Each distinct SQL
+    string is prepared once per connection, on its first execution, and afterwards
+    only re-executed with new parameters, so the server no longer parses and plans
+    it on every call. Leaving the cursor keeps the statements; they are released
+    with the connection.
+    """
+
+    def __init__(self, conn, statements, dictionary=False):
+        super().__init__(conn, None)
+        self._statements = statements
+        self._dictionary = dictionary
+
+    def __exit__(self, exc_type, exc, tb):
+        self._drain()
+
+    def close(self):
+        self._drain()
+
+    def _drain(self):
+        # A statement left with unread rows would block the connection's next query
+        if self._raw is not None and getattr(self._conn._raw, 'unread_result', False):
+            self._raw.fetchall()
+
+    def prepare(self, operation):
+        """
+        Prepare a statement ahead of its first use. The driver only prepares a statement
+        with placeholders when it is executed without parameters; one without
+        placeholders is executed, and its rows discarded.
+        """
+        self._run_prepared('execute', operation, (), {})
+        self._drain()
+
+    def execute(self, operation, *args, **kwargs):
+        return self._run_prepared('execute', operation, args, kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._run_prepared('executemany', operation, args, kwargs)
+
+    def _run_prepared(self, method, operation, args, kwargs):
+        self._drain()
+        pool = self._conn._pool
+        key = (operation, self._dictionary)
+        statement = self._statements.get(key)
+        prepared = statement is None
+        if prepared:
+            statement = (operation, self._conn._checked_out().cursor(prepared=True, dictionary=self._dictionary))
+        else:
+            self._statements.move_to_end(key)
+        # The driver only reuses a statement for the very string object it was prepared from
+        operation, self._raw = statement
+        try:
+            result = self._run(getattr(self._raw, method), operation, args, kwargs)
+        except Exception:
+            if prepared:
+                ConnectionPool._close_quietly(self._raw)
+            raise
+        if prepared:
+            self._statements[key] = statement
+            while len(self._statements) > pool.max_statements:
+                _, (_, evicted) = self._statements.popitem(last=False)
+                ConnectionPool._close_quietly(evicted)
+            with pool._lock:
+                pool._prepares += 1
+        return result
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe pool of database connections.
+
+    - size: maximum number of connections open at once (in use + idle)
+    - timeout: seconds a caller waits for a free connection before PoolError
+    - max_idle: idle connections older than this (seconds) are closed instead of reused
+    - ping_after: connections idle longer than this (seconds) are health-checked on checkout
+
+    The factory and ping callables make the pool independent of the driver, so it can be
+    exercised against a local MySQL or an SQLite stand-in. If given, on_query(sql, seconds)
+    is called after every statement executed through a pooled cursor.
+
+    Cursors opened with prepared=True run server-side prepared statements kept per
+    connection (up to max_statements each, least recently used closed first); with
+    prepare=False they fall back to plain text cursors.
+    """
+
+    def __init__(self, factory, size=10, timeout=5.0, max_idle=300.0, ping_after=30.0, ping=None,
+                 on_query=None, prepare=True, max_statements=64):
+        self._factory = factory
+        self._ping = ping or _default_ping
+        self.on_query = on_query
+        self.prepare = prepare
+        self.max_statements = max_statements
+        self.size = size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.ping_after = ping_after
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = deque()  # (raw connection, time returned to pool)
+        self._open = 0
+        self._statements = {}  # id(raw connection) -> OrderedDict((sql, dictionary) -> (sql, prepared cursor))
+
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._prepares = 0
+
+    def connection(self):
+        """
+        Check out a connection, waiting up to `timeout` seconds if the pool is exhausted.
+        """
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+
+        with self._available:
+            while True:
+                self._evict_idle()
+                if self._idle:
+                    raw, returned_at = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    raw, returned_at = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise mysql.connector.errors.PoolError(
+                        f"Timed out after {self.timeout}s waiting for a database connection"
+                    )
+                waited = True
+                self._available.wait(remaining)
+
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+                self._wait_time += time.monotonic() - started
+
+        # Connect / health-check outside the lock so slow handshakes don't block other callers
+        try:
+            if raw is not None and time.monotonic() - returned_at > self.ping_after:
+                if not self._healthy(raw):
+                    self._close_quietly(raw)
+                    with self._lock:
+                        self._discarded += 1
+                        self._statements.pop(id(raw), None)
+                    raw = None
+            if raw is None:
+                raw = self._factory()
+                with self._lock:
+                    self._created += 1
+        except Exception:
+            with self._available:
+                self._open -= 1
+                self._available.notify()
+            raise
+
+        return PooledConnection(self, raw)
+
+    def _statements_for(self, raw):
+        with self._lock:
+            return self._statements.setdefault(id(raw), OrderedDict())
+
+    def _release(self, raw, discard=False):
+        if not discard:
+            try:
+                # Never hand out a connection mid-transaction or holding an old snapshot
+                if raw.in_transaction:
+                    raw.rollback()
+            except Exception:
+                discard = True
+
+        if discard:
+            self._close_quietly(raw)
+
+        with self._available:
+            if discard:
+                self._open -= 1
+                self._discarded += 1
+                self._statements.pop(id(raw), None)
+            else:
+                self._idle.append((raw, time.monotonic()))
+            self._available.notify()
+
+    def _evict_idle(self):
+        # Oldest connections sit at the left of the deque; caller holds the lock
+        now = time.monotonic()
+        while self._idle and now - self._idle[0][1] > self.max_idle:
+            raw, _ = self._idle.popleft()
+            self._open -= 1
+            self._discarded += 1
+            self._statements.pop(id(raw), None)
+            self._close_quietly(raw)
+
+    def _healthy(self, raw):
+        try:
+            self._ping(raw)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        """
+        Close every idle connection. Connections currently checked out return to the pool as usual.
+        """
+        with self._available:
+            while self._idle:
+                raw, _ = self._idle.popleft()
+                self._open -= 1
+                self._statements.pop(id(raw), None)
+                self._close_quietly(raw)
+            self._available.notify_all()
+
+    def reset_after_fork(self):
+        """
+        Forget connections inherited from the parent process. They share sockets with the
+        parent, so they are dropped without sending a disconnect, and counters start over.
+        """
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle = deque()
+        self._open = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._statements = {}
+        self._prepares = 0
+
+    def warm(self, count=None, setup=None):
+        """
+        Open up to `count` new connections (default: the pool size) ahead of traffic and
+        run setup(connection) on each, e.g. to prepare statements, before adding it to the
+        idle connections. They are opened one at a time, only while the pool has room, so
+        warming never waits for a connection or holds more than one that requests could
+        use. Returns the number of connections opened.
+        """
+        opened = 0
+        for _ in range(self.size if count is None else min(self.size, count)):
+            with self._available:
+                if self._open >= self.size:
+                    break
+                self._open += 1
+            try:
+                raw = self._factory()
+            except Exception:
+                with self._available:
+                    self._open -= 1
+                    self._available.notify()
+                raise
+            with self._lock:
+                self._created += 1
+            conn = PooledConnection(self, raw)
+            try:
+                if setup is not None:
+                    setup(conn)
+            finally:
+                conn.close()
+            opened += 1
+        return opened
+
+    def stats(self):
+        with self._lock:
+            idle = len(self._idle)
+            return {
+                'size': self.size,
+                'open': self._open,
+                'idle': idle,
+                'in_use': self._open - idle,
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'wait_time_seconds': round(self._wait_time, 6),
+                'timeouts': self._timeouts,
+                'created': self._created,
+                'discarded': self._discarded,
+                'prepared_statements': sum(len(statements) for statements in self._statements.values()),
+                'prepares': self._prepares,
+            }
+
+
+def _default_ping(raw):
+    # mysql.connector raises InterfaceError when the server has gone away
+    raw.ping(reconnect=False)
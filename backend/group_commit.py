@@ -0,0 +1,190 @@
+import queue
+import threading
+import time
+from contextlib import closing
+
+import mysql.connector
+
+
+class _Pending:
+    __slots__ = ('params', 'done', 'error', 'taken', 'abandoned')
+
+    def __init__(self, params):
+        self.params = params
+        self.done = threading.Event()
+        self.error = None
+        # taken: picked up for a flush; abandoned: the submitter timed out
+        self.taken = False
+        self.abandoned = False
+
+
+class GroupCommitWriter:
+    """
+    Write-behind queue that turns concurrent single-row INSERTs into group commits.
+
+    submit() enqueues one row and blocks until it is durable. A background thread
+    collects the rows that arrive within `window` seconds of the first one (at most
+    `max_batch`), writes them with one multi-row INSERT and commits once, so a burst
+    of submissions costs one fsync instead of one each. If the batch violates a
+    constraint, it is rolled back and retried row by row, and only the offending
+    rows fail, with the driver's own IntegrityError.
+
+    If submit() times out before its row is picked up for a flush, the row is
+    dropped from the queue and never written. If it was already being written, the
+    outcome is unknown to the caller; should it commit after all, on_late_commit is
+    called with its params (from the writer thread) so the caller can catch up.
+
+    The thread is started on first use, so each forked worker gets its own.
+    """
+
+    def __init__(self, get_connection, insert_query, window=0.005, max_batch=100, timeout=5.0,
+                 on_late_commit=None):
+        self._get_connection = get_connection
+        self._insert_query = insert_query
+        self._on_late_commit = on_late_commit
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._init_state()
+
+    def _init_state(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._thread = None
+        self._closed = False
+        self._batches = 0
+        self._rows = 0
+        self._largest_batch = 0
+        self._retried_batches = 0
+        self._failed_rows = 0
+        self._dropped_rows = 0
+        self._late_rows = 0
+
+    def submit(self, params):
+        """
+        Insert one row as part of the next group commit. Returns once it is committed;
+        raises the mysql.connector error for this row otherwise.
+        """
+        pending = _Pending(params)
+        with self._lock:
+            if self._closed:
+                raise mysql.connector.errors.OperationalError(msg='Score writer is shut down')
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='group-commit-writer', daemon=True)
+                self._thread.start()
+            self._queue.put(pending)
+
+        if not pending.done.wait(self.timeout):
+            with self._lock:
+                # Checked again under the lock: the flush may have finished meanwhile
+                if not pending.done.is_set():
+                    pending.abandoned = True
+                    if not pending.taken:
+                        self._dropped_rows += 1
+                        raise mysql.connector.errors.OperationalError(msg='Timed out waiting for the group commit')
+                    raise mysql.connector.errors.OperationalError(
+                        msg='Timed out waiting for the group commit; the row may still be committed'
+                    )
+        if pending.error is not None:
+            raise pending.error
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+            if stopping:
+                return
+
+    def _flush(self, batch):
+        with self._lock:
+            # Rows whose submitter gave up before the flush are not written at all
+            batch = [pending for pending in batch if not pending.abandoned]
+            for pending in batch:
+                pending.taken = True
+        if not batch:
+            return
+
+        retried = False
+        try:
+            with closing(self._get_connection()) as conn:
+                with conn.cursor() as cursor:
+                    try:
+                        conn.start_transaction()
+                        cursor.executemany(self._insert_query, [pending.params for pending in batch])
+                        conn.commit()
+                    except mysql.connector.IntegrityError:
+                        conn.rollback()
+                        # Some row conflicts (e.g. a duplicate submission): retry one by one
+                        # so only the conflicting submissions fail
+                        retried = True
+                        for pending in batch:
+                            try:
+                                cursor.execute(self._insert_query, pending.params)
+                            except mysql.connector.IntegrityError as err:
+                                pending.error = err
+        except Exception as err:
+            for pending in batch:
+                if pending.error is None:
+                    pending.error = err
+        finally:
+            with self._lock:
+                self._batches += 1
+                self._rows += len(batch)
+                self._largest_batch = max(self._largest_batch, len(batch))
+                self._retried_batches += retried
+                self._failed_rows += sum(1 for pending in batch if pending.error is not None)
+                late = [pending for pending in batch if pending.abandoned and pending.error is None]
+                self._late_rows += len(late)
+                for pending in batch:
+                    pending.done.set()
+            if self._on_late_commit is not None:
+                for pending in late:
+                    self._on_late_commit(pending.params)
+
+    def close(self, timeout=5.0):
+        """
+        Flush what is queued and stop the writer thread.
+        """
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def reset_after_fork(self):
+        """
+        The writer thread does not survive fork(); start over with an empty queue.
+        """
+        self._init_state()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'queued': self._queue.qsize(),
+                'batches': self._batches,
+                'rows': self._rows,
+                'rows_per_batch': round(self._rows / self._batches, 2) if self._batches else 0.0,
+                'largest_batch': self._largest_batch,
+                'retried_batches': self._retried_batches,
+                'failed_rows': self._failed_rows,
+                'dropped_rows': self._dropped_rows,
+                'late_rows': self._late_rows,
+            }
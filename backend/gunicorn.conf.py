@@ -0,0 +1,66 @@
+# Production server settings for `gunicorn -c gunicorn.conf.py wsgi:app`.
+# Every setting can be overridden through the environment of the container.
+import os
+import signal
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+
+# Worker processes and threads per worker. Live update streams (/stream) hold a
+# thread each for as long as the client is connected, so size threads for them.
+# Async worker classes such as gevent are not an alternative as things stand:
+# mysql-connector's C extension blocks their event loop, so they would also need
+# the pure-Python driver (use_pure=True in connect_db).
+workers = int(os.environ.get('WEB_CONCURRENCY', '1'))
+threads = int(os.environ.get('GUNICORN_THREADS', '32'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+
+# A live stream holds its thread for as long as the client stays connected. Unless
+# STREAM_MAX_CLIENTS is set, streams may take at most half of a worker's threads, so
+# regular requests (including the polling fallback) always find one; further screens
+# get a 503 from /stream and poll. gunicorn runs a sync worker with several threads as
+# gthread, and a single-threaded one serves no streams. Async worker classes keep the
+# app's default.
+if worker_class in ('sync', 'gthread'):
+    os.environ.setdefault('STREAM_MAX_CLIENTS', str(threads // 2))
+
+# Seconds workers get to finish in-flight requests after SIGTERM before being killed
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+
+# Seconds a new worker waits for its warm-up (connections, prepared statements, caches)
+# before accepting requests; warm-up carries on in the background after that, and
+# /ready answers 503 until it is done
+warm_up_wait = float(os.environ.get('WARM_UP_WAIT', '20'))
+
+# Recycle workers periodically to bound memory growth; jitter avoids restarting all at once
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '0'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '0'))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_worker_init(worker):
+    # Live streams never finish by themselves; end them as soon as the worker is asked
+    # to stop so graceful shutdown only waits for regular requests
+    import main
+
+    previous_handler = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        main.broadcaster.close()
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
+
+    if not main.start_warm_up(wait=warm_up_wait):
+        worker.log.warning("Worker %s is taking traffic before its warm-up finished", worker.pid)
+
+
+def worker_exit(server, worker):
+    import main
+
+    main.shutdown_process_state()
@@ -0,0 +1,413 @@
+"""
+Keep the in-memory state of several backend processes coherent.
+
+Every backend process (gunicorn worker or container) caches the live state and the
+roster and maintains the leaderboard and vote tracker incrementally from its own
+writes. When there is more than one process, each write is also published on an
+invalidation channel and applied by every other process, so their caches and live
+state follow without going back to the database on every read.
+
+Two channel backends are provided:
+    LocalChannel   delivers to the other channels of the same LocalHub, i.e. within
+                   one process; used for tests and single-process deployments
+    SocketChannel  connects to a relay (run `python invalidation.py --port 7700`)
+                   that forwards every message line to every other connected node
+
+Messages can be lost (the relay restarts, a node is briefly disconnected), so the
+StalenessGuard bounds how long a node can stay stale by checking a database
+watermark at a fixed interval.
+"""
+import argparse
+import json
+import logging
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+logger = logging.getLogger('scoreboard.invalidation')
+
+
+class Channel:
+    """
+    Publish/subscribe channel between backend processes. publish() sends a message
+    to every other node; start(handler) calls handler(kind, data) for each message
+    received from another node, from a background thread. A node that may have
+    missed messages receives kind 'resync' and should drop its in-memory state.
+    """
+
+    def __init__(self):
+        self._handler = None
+        self._stats_lock = threading.Lock()
+        self._published = 0
+        self._received = 0
+        self._dropped = 0
+
+    def start(self, handler):
+        self._handler = handler
+
+    def publish(self, kind, data):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def reset_after_fork(self):
+        """
+        Connections and threads do not survive fork(); the child starts over.
+        """
+        self._handler = None
+        self._stats_lock = threading.Lock()
+
+    def _count(self, counter):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _deliver(self, kind, data):
+        handler = self._handler
+        if handler is None:
+            return
+        self._count('_received')
+        try:
+            handler(kind, data)
+        except Exception as e:
+            logger.exception("Failed to apply %s message: %s", kind, e)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'published': self._published,
+                'received': self._received,
+                'dropped': self._dropped,
+            }
+
+
+class LocalHub:
+    """
+    Connects the LocalChannels created with it, like a relay inside one process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.channels = []
+
+    def attach(self, channel):
+        with self._lock:
+            self.channels.append(channel)
+
+    def others(self, channel):
+        with self._lock:
+            return [other for other in self.channels if other is not channel]
+
+
+class LocalChannel(Channel):
+    """
+    In-process channel: messages are delivered synchronously to the other
+    channels of the same hub. With its own hub it has no peers and publishing
+    is a no-op, which is what a single backend process needs.
+    """
+
+    def __init__(self, hub=None):
+        super().__init__()
+        self.hub = hub or LocalHub()
+        self.hub.attach(self)
+
+    def publish(self, kind, data):
+        self._count('_published')
+        # Round trip through JSON so the receiver sees exactly what a socket would carry
+        kind, data = _decode(_encode(kind, data))
+        for other in self.hub.others(self):
+            other._deliver(kind, data)
+
+
+class SocketChannel(Channel):
+    """
+    Channel through a relay server reached over TCP. Messages are newline-delimited
+    JSON. A background thread reads from the relay and reconnects with a fixed delay
+    when the connection drops; every reconnect is reported to the handler as a
+    'resync', since messages may have been missed meanwhile. Publishing never blocks
+    a request for longer than `send_timeout`: while disconnected, messages are
+    dropped and counted.
+    """
+
+    def __init__(self, host, port, reconnect_delay=1.0, send_timeout=1.0):
+        super().__init__()
+        self.host = host
+        self.port = port
+        self.reconnect_delay = reconnect_delay
+        self.send_timeout = send_timeout
+        self._init_connection()
+
+    def _init_connection(self):
+        self._lock = threading.Lock()
+        self._sock = None
+        self._thread = None
+        self._closed = False
+        self._connects = 0
+
+    def start(self, handler):
+        super().start(handler)
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name='invalidation-channel', daemon=True)
+                self._thread.start()
+
+    def publish(self, kind, data):
+        self._count('_published')
+        line = _encode(kind, data)
+        with self._lock:
+            sock = self._sock
+            if sock is not None:
+                try:
+                    sock.sendall(line)
+                    return
+                except OSError as err:
+                    logger.warning("Invalidation relay send failed: %s", err)
+        self._count('_dropped')
+
+    def _run(self):
+        while not self._closed:
+            try:
+                sock = socket.create_connection((self.host, self.port), timeout=self.send_timeout)
+            except OSError as err:
+                logger.warning("Invalidation relay %s:%s unreachable: %s", self.host, self.port, err)
+                time.sleep(self.reconnect_delay)
+                continue
+
+            with self._lock:
+                self._sock = sock
+                self._connects += 1
+                reconnected = self._connects > 1
+            if reconnected:
+                self._deliver('resync', {})
+
+            try:
+                self._read(sock)
+            except (OSError, ValueError) as err:
+                if not self._closed:
+                    logger.warning("Invalidation relay connection lost: %s", err)
+            finally:
+                with self._lock:
+                    self._sock = None
+                sock.close()
+            if not self._closed:
+                time.sleep(self.reconnect_delay)
+
+    def _read(self, sock):
+        buffer = b''
+        while not self._closed:
+            try:
+                chunk = sock.recv(65536)
+            except socket.timeout:
+                continue
+            if not chunk:
+                raise ConnectionError('relay closed the connection')
+            buffer += chunk
+            *lines, buffer = buffer.split(b'\n')
+            for line in lines:
+                if line:
+                    self._deliver(*_decode(line))
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def reset_after_fork(self):
+        super().reset_after_fork()
+        self._init_connection()
+
+    def stats(self):
+        stats = super().stats()
+        with self._lock:
+            stats['connected'] = self._sock is not None
+            stats['reconnects'] = max(self._connects - 1, 0)
+        return stats
+
+
+def _encode(kind, data):
+    return (json.dumps({'kind': kind, 'data': data}, default=str) + '\n').encode()
+
+
+def _decode(line):
+    message = json.loads(line)
+    return message['kind'], message['data']
+
+
+class StalenessGuard:
+    """
+    Upper bound on how long a node stays stale when invalidation messages are lost.
+
+    Every `interval` seconds read_watermark() returns (event id, live-state version,
+    number of scores in the event) from the database, and the guard compares it with
+    the changes this node has applied, its own writes and received messages alike.
+    If the node has still not caught up with a watermark one interval after reading
+    it, it missed something: on_stale() drops the node's in-memory state and the
+    guard starts counting again from the current watermark. Every committed change
+    is therefore reflected on every node within about two intervals.
+    """
+
+    def __init__(self, read_watermark, on_stale, interval=1.0):
+        self._read_watermark = read_watermark
+        self._on_stale = on_stale
+        self.interval = interval
+        self._init_state()
+
+    def _init_state(self):
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = threading.Event()
+        self._applied = None  # (event id, version, scores) this node has applied
+        self._pending = None  # watermark the node must have caught up with at the next check
+        self._checks = 0
+        self._resyncs = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None and self.interval > 0:
+                self._thread = threading.Thread(target=self._run, name='staleness-guard', daemon=True)
+                self._thread.start()
+
+    def live_state_changed(self, event_id):
+        """
+        Record one applied live-state write (event status or current performer).
+        """
+        with self._lock:
+            if self._applied is None:
+                return
+            applied_event, version, scores = self._applied
+            self._applied = (event_id, version + 1, scores if event_id == applied_event else 0)
+
+    def score_added(self, event_id):
+        with self._lock:
+            if self._applied is not None and self._applied[0] == event_id:
+                applied_event, version, scores = self._applied
+                self._applied = (applied_event, version, scores + 1)
+
+    def rebaseline(self):
+        """
+        Forget the applied count, e.g. after the node dropped its state for another reason.
+        """
+        with self._lock:
+            self._applied = None
+            self._pending = None
+
+    def check(self):
+        watermark = tuple(self._read_watermark())
+        with self._lock:
+            self._checks += 1
+            stale = (
+                self._applied is not None and self._pending is not None
+                and not _caught_up(self._applied, self._pending)
+            )
+            if self._applied is None or stale:
+                self._applied = watermark
+                self._pending = None
+            else:
+                self._pending = watermark
+            if stale:
+                self._resyncs += 1
+        if stale:
+            logger.warning("Missed invalidations detected, dropping in-memory state")
+            self._on_stale()
+        return not stale
+
+    def _run(self):
+        while not self._closed.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.warning("Staleness check failed: %s", e)
+
+    def close(self):
+        self._closed.set()
+
+    def reset_after_fork(self):
+        self._init_state()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'interval_seconds': self.interval,
+                'checks': self._checks,
+                'resyncs': self._resyncs,
+            }
+
+
+def _caught_up(applied, watermark):
+    applied_event, applied_version, applied_scores = applied
+    event_id, version, scores = watermark
+    if applied_event != event_id:
+        return applied_event > event_id
+    return applied_version >= version and applied_scores >= scores
+
+
+class _RelayHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.add_client(self.connection)
+        try:
+            for line in self.rfile:
+                self.server.forward(self.connection, line)
+        except OSError:
+            pass
+        finally:
+            self.server.remove_client(self.connection)
+
+
+class RelayServer(socketserver.ThreadingTCPServer):
+    """
+    Forwards every line received from one node to all other connected nodes.
+    """
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, _RelayHandler)
+        self._lock = threading.Lock()
+        self._clients = {}  # connection -> lock serializing writes to it
+
+    def add_client(self, connection):
+        with self._lock:
+            self._clients[connection] = threading.Lock()
+
+    def remove_client(self, connection):
+        with self._lock:
+            self._clients.pop(connection, None)
+
+    def forward(self, sender, line):
+        if not line.endswith(b'\n'):
+            line += b'\n'
+        with self._lock:
+            clients = [(client, lock) for client, lock in self._clients.items() if client is not sender]
+        for client, lock in clients:
+            try:
+                with lock:
+                    client.sendall(line)
+            except OSError:
+                # The client's own handler notices the broken connection and removes it
+                pass
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='Relay invalidation messages between backend nodes.')
+    parser.add_argument('--host', default='0.0.0.0', help='address to listen on')
+    parser.add_argument('--port', type=int, default=7700, help='port to listen on')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    with RelayServer((args.host, args.port)) as server:
+        print(f"Relaying invalidations on {args.host}:{args.port}")
+        server.serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,187 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+CRITERIA = ('presentation', 'stage_presence', 'choreography', 'timing', 'performance')
+
+
+class Leaderboard:
+    """
+    Materialized /final-scores result, kept up to date as scores are inserted.
+
+    Each performer entry holds its judge breakdown (ordered by judge_id) and its
+    weighted total. Rank order lives in a sorted list of (-total_score, performer_id)
+    keys, so reading the leaderboard is O(result) and a new score only re-positions
+    a single performer. The ordering and the summation order match the original
+    full-join computation exactly: totals are summed in judge_id order and ties keep
+    ascending performer_id order.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._entries = {}  # performer_id -> entry dict
+        self._judge_ids = {}  # performer_id -> sorted judge ids, parallel to judge_scores
+        self._raw_totals = {}  # performer_id -> unweighted score sums, parallel to judge_scores
+        self._ranking = []  # sorted (-total_score, performer_id)
+
+    def ensure_loaded(self, loader):
+        """
+        Rebuild from the database on first use (cold start) or after invalidate().
+        loader() must return rows shaped like the /final-scores query.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._rebuild(loader())
+
+    def _rebuild(self, rows):
+        self._entries = {}
+        self._judge_ids = {}
+        self._raw_totals = {}
+        self._ranking = []
+        for row in rows:
+            self._apply(row)
+        self._loaded = True
+
+    def add_score(self, row):
+        """
+        Apply one newly inserted score. Ignored until the leaderboard has been loaded,
+        since the next load will read the row from the database anyway.
+        """
+        with self._lock:
+            if self._loaded:
+                self._apply(row)
+
+    def has_score(self, performer_id, judge_id):
+        """
+        Whether the judge has scored the performer, or None if the leaderboard is not loaded.
+        """
+        with self._lock:
+            if not self._loaded:
+                return None
+            judge_ids = self._judge_ids.get(performer_id, [])
+            position = bisect_left(judge_ids, judge_id)
+            return position < len(judge_ids) and judge_ids[position] == judge_id
+
+    def reset(self):
+        """
+        Empty the leaderboard, e.g. after all scores were cleared.
+        """
+        with self._lock:
+            self._entries = {}
+            self._judge_ids = {}
+            self._raw_totals = {}
+            self._ranking = []
+            self._loaded = True
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def ranked(self):
+        """
+        Return the leaderboard in rank order, in the /final-scores response shape.
+        """
+        return self.page()[0]
+
+    def page(self, limit=None, after=None):
+        """
+        Return (entries, next_after) for up to `limit` entries in rank order, starting
+        after the (total_score, performer_id) position `after`. next_after is the
+        position of the last returned entry, or None when no entries follow.
+        Positions are rank keys rather than offsets, so a page boundary stays put
+        when performers above it move.
+        """
+        with self._lock:
+            start = 0
+            if after is not None:
+                total_score, performer_id = after
+                start = bisect_right(self._ranking, (-total_score, performer_id))
+            end = len(self._ranking) if limit is None else min(start + limit, len(self._ranking))
+            keys = self._ranking[start:end]
+            entries = [self._entry(performer_id) for _, performer_id in keys]
+            next_after = None
+            if keys and end < len(self._ranking):
+                negative_total, performer_id = keys[-1]
+                next_after = (-negative_total, performer_id)
+            return entries, next_after
+
+    def rows(self):
+        """
+        Every score as a row shaped like the /final-scores query, in performer and judge id order.
+        """
+        with self._lock:
+            return [
+                {'performer_id': performer_id, 'performer_name': self._entries[performer_id]['performer_name'], **score}
+                for performer_id in sorted(self._entries)
+                for score in self._entries[performer_id]['judge_scores']
+            ]
+
+    def score_matrix(self, performer_ids, judge_ids):
+        """
+        Dense performer x judge matrix of unweighted score totals (the /current-scores
+        total_score), in the given row and column order; None where a judge has not
+        scored a performer.
+        """
+        columns = {judge_id: column for column, judge_id in enumerate(judge_ids)}
+        with self._lock:
+            matrix = []
+            for performer_id in performer_ids:
+                row = [None] * len(judge_ids)
+                for judge_id, total in zip(self._judge_ids.get(performer_id, ()), self._raw_totals.get(performer_id, ())):
+                    column = columns.get(judge_id)
+                    if column is not None:
+                        row[column] = total
+                matrix.append(row)
+            return matrix
+
+    def _entry(self, performer_id):
+        entry = self._entries[performer_id]
+        return {
+            'performer_name': entry['performer_name'],
+            'total_score': entry['total_score'],
+            'judge_scores': list(entry['judge_scores'])
+        }
+
+    def _apply(self, row):
+        performer_id = row['performer_id']
+        entry = self._entries.get(performer_id)
+        if entry is None:
+            entry = {'performer_name': row['performer_name'], 'total_score': 0, 'judge_scores': []}
+            self._entries[performer_id] = entry
+            self._judge_ids[performer_id] = []
+            self._raw_totals[performer_id] = []
+        else:
+            self._ranking.pop(bisect_left(self._ranking, (-entry['total_score'], performer_id)))
+
+        # Calculate individual judge score with weight
+        score_sum = sum(row[criterion] for criterion in CRITERIA)
+        weighted_score = score_sum * row['weight']
+        judge_score = {
+            'judge_id': row['judge_id'],
+            'judge_name': row['judge_name'],
+            'presentation': row['presentation'],
+            'stage_presence': row['stage_presence'],
+            'choreography': row['choreography'],
+            'timing': row['timing'],
+            'performance': row['performance'],
+            'weight': row['weight'],
+            'weighted_score': weighted_score
+        }
+
+        judge_ids = self._judge_ids[performer_id]
+        position = bisect_left(judge_ids, row['judge_id'])
+        if position < len(judge_ids) and judge_ids[position] == row['judge_id']:
+            # A (performer, judge) pair is unique; re-applying the same score is a no-op
+            entry['judge_scores'][position] = judge_score
+            self._raw_totals[performer_id][position] = score_sum
+        else:
+            judge_ids.insert(position, row['judge_id'])
+            entry['judge_scores'].insert(position, judge_score)
+            self._raw_totals[performer_id].insert(position, score_sum)
+
+        # Re-sum in judge_id order so floating point totals match a full recompute
+        total_score = 0
+        for score in entry['judge_scores']:
+            total_score += score['weighted_score']
+        entry['total_score'] = total_score
+        insort(self._ranking, (-total_score, performer_id))
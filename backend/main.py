@@ -1,10 +1,60 @@
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, Response, stream_with_context, g, has_request_context
 from flask_cors import CORS
 import mysql.connector
+import mysql.connector.errorcode
 from contextlib import closing
+from functools import partial, wraps
+import itertools
+import json
+import logging
 import os
+import secrets
+import threading
+import time
+import archive_events
+from auth import JudgeTokens, check_password
+from db_pool import ConnectionPool
+import metrics
+from cache import TTLCache
+from singleflight import FlightTimeout, SingleFlight
+from broadcaster import Broadcaster
+from leaderboard import Leaderboard, CRITERIA
+from voting import VoteTracker
+from versioning import DataVersion, ChangeLog, busy_response, conditional
+from streaming import json_object_stream, cursor_chunks
+from group_commit import GroupCommitWriter
+from invalidation import LocalChannel, SocketChannel, StalenessGuard
+import scoring
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=['ETag', 'X-Data-Version', 'X-Last-Write'])
+
+logging.basicConfig(
+    level=os.environ.get('LOG_LEVEL', 'INFO'),
+    format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+)
+logger = logging.getLogger('scoreboard')
+slow_request_logger = logging.getLogger('scoreboard.slow_requests')
+
+# Requests slower than this are logged with their timing breakdown
+slow_request_ms = float(os.environ.get('SLOW_REQUEST_MS', '500'))
+
+# Instrumentation exposed on /metrics in the Prometheus text format
+metrics_registry = metrics.Registry()
+request_duration = metrics_registry.register(metrics.Histogram(
+    'scoreboard_http_request_duration_seconds', 'Time to handle a request, by route.',
+    ('method', 'route', 'status')
+))
+request_db_queries = metrics_registry.register(metrics.Counter(
+    'scoreboard_http_request_db_queries_total', 'SQL statements executed while handling requests, by route.',
+    ('method', 'route')
+))
+query_duration = metrics_registry.register(metrics.Histogram(
+    'scoreboard_db_query_duration_seconds', 'Time to execute a SQL statement, by statement.',
+    ('statement',)
+))
+connection_acquire_duration = metrics_registry.register(metrics.Histogram(
+    'scoreboard_db_connection_acquire_seconds', 'Time to check out a pooled database connection.'
+))
 
 # Generic database connection method
 db_host = os.environ.get('DB_HOST', 'localhost')
@@ -12,43 +62,380 @@ db_name = os.environ.get('DB_NAME', 'sjsu')
 db_user = os.environ.get('DB_USER', 'root')
 db_password = os.environ.get('DB_PASSWORD', '')
 
-def get_db_connection():
-    conn = mysql.connector.connect(
-        host=db_host,
+# Connection pool settings
+db_pool_size = int(os.environ.get('DB_POOL_SIZE', '10'))
+db_pool_timeout = float(os.environ.get('DB_POOL_TIMEOUT', '5'))
+db_pool_max_idle = float(os.environ.get('DB_POOL_MAX_IDLE', '300'))
+db_pool_ping_after = float(os.environ.get('DB_POOL_PING_AFTER', '30'))
+# Run the fixed hot-path statements as server-side prepared statements, parsed once per connection
+db_prepared_statements = os.environ.get('DB_PREPARED_STATEMENTS', '1') == '1'
+
+# Read replicas as a comma-separated host[:port] list. GET requests read from them;
+# writes, and reads that must see the client's own recent write, go to the primary.
+db_replica_hosts = [host.strip() for host in os.environ.get('DB_REPLICA_HOSTS', '').split(',') if host.strip()]
+# Upper bound on replica lag in seconds, used for read-your-writes
+db_replica_max_lag = float(os.environ.get('DB_REPLICA_MAX_LAG', '2'))
+
+def connect_db(host=None, port=None):
+    # Autocommit: single-statement writes finish in one round trip and pooled
+    # readers never hold a stale snapshot. Multi-statement writes use start_transaction().
+    options = {'port': port} if port else {}
+    return mysql.connector.connect(
+        host=host or db_host,
         database=db_name, 
         user=db_user,
-        password=db_password
+        password=db_password,
+        autocommit=True,
+        **options
+    )
+
+def record_query(sql, seconds):
+    query_duration.observe(seconds, (metrics.statement_name(sql),))
+    if has_request_context():
+        g.db_queries = g.get('db_queries', 0) + 1
+        g.db_time = g.get('db_time', 0.0) + seconds
+
+def create_db_pool(factory, size=db_pool_size, ping=None):
+    return ConnectionPool(
+        factory,
+        size=size,
+        timeout=db_pool_timeout,
+        max_idle=db_pool_max_idle,
+        ping_after=db_pool_ping_after,
+        ping=ping,
+        on_query=record_query,
+        prepare=db_prepared_statements
     )
+
+def create_replica_pools():
+    pools = []
+    for replica in db_replica_hosts:
+        host, _, port = replica.partition(':')
+        pools.append(create_db_pool(partial(connect_db, host, int(port) if port else None)))
+    return pools
+
+db_pool = create_db_pool(connect_db)
+replica_pools = create_replica_pools()
+_replica_turn = itertools.count()
+
+def checkout(pool):
+    started = time.perf_counter()
+    conn = pool.connection()
+    elapsed = time.perf_counter() - started
+    connection_acquire_duration.observe(elapsed)
+    if has_request_context():
+        g.db_acquire_time = g.get('db_acquire_time', 0.0) + elapsed
     return conn
 
+def get_db_connection():
+    """
+    Check out a pooled connection to the primary. Closing it returns it to the pool.
+    """
+    return checkout(db_pool)
+
+def read_your_writes():
+    """
+    Whether the client wrote recently enough that a replica (or another backend's
+    cache) may not reflect it yet. Write responses carry an X-Last-Write timestamp;
+    clients echo it in the X-Last-Write request header on reads that must see the write.
+    """
+    if not has_request_context():
+        return False
+    try:
+        last_write = int(request.headers.get('X-Last-Write', ''))
+    except ValueError:
+        return False
+    return time.time() * 1000 - last_write < db_replica_max_lag * 1000
+
+# Monotonic time of the last write this process made or applied from another backend.
+# For db_replica_max_lag seconds afterwards reads stay on the primary: a lagging
+# replica's answer would otherwise be cached under the post-write data version.
+_last_local_write = float('-inf')
+
+def note_local_write():
+    global _last_local_write
+    _last_local_write = time.monotonic()
+
+def replicas_may_lag():
+    return time.monotonic() - _last_local_write < db_replica_max_lag
+
+def get_read_connection():
+    """
+    Connection for reads that tolerate replica lag: a replica (round robin) while
+    serving a GET request, the primary for writes, read-your-writes requests, reads
+    soon after a write reached this process, or when no replica is configured or reachable.
+    """
+    if (not replica_pools or not has_request_context()
+            or request.method not in ('GET', 'HEAD') or read_your_writes() or replicas_may_lag()):
+        return get_db_connection()
+    pool = replica_pools[next(_replica_turn) % len(replica_pools)]
+    try:
+        return checkout(pool)
+    except mysql.connector.Error as err:
+        logger.warning("Replica unavailable, reading from the primary: %s", err)
+        return get_db_connection()
+
+# In-process read-through cache for rarely changing data.
+# Keys are invalidated by the write endpoints that change them.
+CACHE_KEY_LIVE_STATE = 'live_state'
+CACHE_KEY_PERFORMERS = 'performers'
+CACHE_KEY_JUDGES = 'judges'
+CACHE_KEY_SCORE_ARRAYS = 'score_arrays'
+
+# Concurrent identical reads (e.g. every client polling at the same moment) share
+# one in-flight cache load and one rendered response (see singleflight.py)
+coalesce_reads = os.environ.get('COALESCE_READS', '1') == '1'
+coalesce_timeout = float(os.environ.get('COALESCE_TIMEOUT', '5'))
+cache_flights = SingleFlight(coalesce_timeout) if coalesce_reads else None
+response_flights = SingleFlight(coalesce_timeout) if coalesce_reads else None
+
+cache = TTLCache(
+    ttl=float(os.environ.get('CACHE_TTL', '30')),
+    max_entries=int(os.environ.get('CACHE_MAX_ENTRIES', '256')),
+    flights=cache_flights
+)
+
+# Live update fan-out for the /stream endpoint. Write endpoints publish after commit.
+broadcaster = Broadcaster(
+    max_clients=int(os.environ.get('STREAM_MAX_CLIENTS', '1000')),
+    keepalive=float(os.environ.get('STREAM_KEEPALIVE', '15'))
+)
+
+# Materialized /final-scores ranking, updated on every score insert
+leaderboard = Leaderboard()
+
+# Which judges have scored the current performer, for /canVote
+vote_tracker = VoteTracker()
+
+metrics_registry.register(metrics.Gauge(
+    'scoreboard_db_pool', 'Connection pool state and counters.', ('stat',),
+    lambda: {(name,): value for name, value in db_pool.stats().items()}
+))
+metrics_registry.register(metrics.Gauge(
+    'scoreboard_db_replica_pool', 'Read replica connection pool state and counters.', ('replica', 'stat'),
+    lambda: {
+        (replica, name): value
+        for replica, pool in zip(db_replica_hosts, replica_pools)
+        for name, value in pool.stats().items()
+    }
+))
+metrics_registry.register(metrics.Gauge(
+    'scoreboard_cache', 'Read cache counters.', ('stat',),
+    lambda: {(name,): value for name, value in cache.stats().items()}
+))
+metrics_registry.register(metrics.Gauge(
+    'scoreboard_stream', 'Live update stream counters.', ('stat',),
+    lambda: {(name,): value for name, value in broadcaster.stats().items()}
+))
+metrics_registry.register(metrics.Gauge(
+    'scoreboard_score_writer', 'Group commit writer counters (SCORE_WRITE_MODE=group).', ('stat',),
+    lambda: {(name,): value for name, value in score_writer.stats().items()} if score_writer else {}
+))
+metrics_registry.register(metrics.Gauge(
+    'scoreboard_coalescing', 'Coalesced cache loads and response renders (COALESCE_READS).', ('layer', 'stat'),
+    lambda: {
+        (layer, name): value
+        for layer, flights in (('cache', cache_flights), ('response', response_flights)) if flights
+        for name, value in flights.stats().items()
+    }
+))
+
+# Data version bumped by every write; read endpoints use it for ETags and
+# to serve cached serialized responses until the next write
+data_version = DataVersion()
+score_changes = ChangeLog(data_version, max_entries=int(os.environ.get('SCORE_CHANGE_LOG_SIZE', '10000')))
+response_cache = TTLCache(ttl=float(os.environ.get('RESPONSE_CACHE_TTL', '300')), max_entries=512)
+
+# Rows read from the database / leaderboard per chunk of a ?stream=1 response
+stream_chunk_size = int(os.environ.get('STREAM_CHUNK_SIZE', '500'))
+# A streamed /current-scores holds its pooled connection until the client has read the
+# last byte, so slow or stalled clients could take the whole pool. At most this many
+# run at once (default: half the pool); further ?stream=1 requests get a 503.
+stream_max_listings = int(os.environ.get('STREAM_MAX_LISTINGS', str(db_pool_size // 2)))
+stream_listings = threading.BoundedSemaphore(max(stream_max_listings, 1))
+
+# Judge session tokens issued by /judge/login. Every backend process must share the
+# secret to accept each other's tokens; without one, a random per-process key is used.
+judge_token_secret = os.environ.get('JUDGE_TOKEN_SECRET')
+if not judge_token_secret:
+    logger.warning("JUDGE_TOKEN_SECRET is not set; judge tokens are only valid on this backend process")
+    judge_token_secret = secrets.token_hex(32)
+judge_tokens = JudgeTokens(judge_token_secret, max_age=int(os.environ.get('JUDGE_TOKEN_TTL', '43200')))
+
+def judge_required(view):
+    """
+    Require the session token from /judge/login as 'Authorization: Bearer <token>'.
+    It is verified in memory; the judge's claims (judge_id, weight) are in g.judge.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        claims = judge_tokens.verify(token) if scheme.lower() == 'bearer' and token else None
+        if claims is None:
+            return jsonify({'error': 'Judge login required'}), 401
+        g.judge = claims
+        return view(*args, **kwargs)
+    return wrapper
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.get('request_started')
+    if started is None:
+        return response
+    elapsed = time.perf_counter() - started
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    db_queries = g.get('db_queries', 0)
+
+    request_duration.observe(elapsed, (request.method, route, str(response.status_code)))
+    if db_queries:
+        request_db_queries.inc((request.method, route), db_queries)
+
+    if elapsed * 1000 >= slow_request_ms:
+        slow_request_logger.warning(json.dumps({
+            'event': 'slow_request',
+            'method': request.method,
+            'route': route,
+            'path': request.full_path.rstrip('?'),
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 3),
+            'db_queries': db_queries,
+            'db_time_ms': round(g.get('db_time', 0.0) * 1000, 3),
+            'db_acquire_ms': round(g.get('db_acquire_time', 0.0) * 1000, 3)
+        }))
+    return response
+
+@app.before_request
+def note_write_request():
+    # Set again when the write finishes; covers reads served while it is in progress
+    if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        note_local_write()
+
+@app.after_request
+def stamp_last_write(response):
+    # Lets the client ask for read-your-writes on its next reads (see read_your_writes)
+    if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+        note_local_write()
+        if response.status_code < 400:
+            response.headers['X-Last-Write'] = str(int(time.time() * 1000))
+    return response
+
+def unexpected_error(e):
+    """
+    Response for an exception a view did not handle itself. A coalesced read that gave
+    up waiting for the in-flight one is a 503 the client can retry, not a 500.
+    """
+    if isinstance(e, FlightTimeout):
+        return handle_coalesce_timeout(e)
+    logger.exception("Unexpected error: %s", e)
+    return jsonify({'error': 'An unexpected error occurred'}), 500
+
+@app.errorhandler(FlightTimeout)
+def handle_coalesce_timeout(e):
+    logger.warning("Coalesced read timed out: %s", e)
+    return busy_response('Timed out waiting for an identical request')
+
 @app.route('/')
 def hello_world():
     return 'Hello, World!'
 
+@app.route('/pool-stats', methods=['GET'])
+def get_pool_stats():
+    """
+    Endpoint to expose connection pool metrics for sizing the pool.
+    """
+    stats = db_pool.stats()
+    if replica_pools:
+        stats['replicas'] = {replica: pool.stats() for replica, pool in zip(db_replica_hosts, replica_pools)}
+    return jsonify(stats), 200
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """
+    Endpoint exposing request, query, connection pool, cache and stream metrics
+    in the Prometheus text exposition format.
+    """
+    return Response(metrics_registry.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """
+    Endpoint to expose read cache hit/miss counters.
+    """
+    return jsonify(cache.stats()), 200
+
+LIVE_STATE_QUERY = """
+    SELECT event_id, has_started, current_performer_id, version
+    FROM live_state
+    WHERE id = 1
+"""
+
+def load_live_state():
+    """
+    Read the singleton live-state record: the active event (the latest one; scores are
+    scoped to it), whether it is running, the current performer and the state version.
+    Always from the primary: every write is scoped by it, so a lagging replica could
+    send scores to an event that has already finished.
+    """
+    with closing(get_db_connection()) as conn:
+        with conn.cursor(prepared=True) as cursor:
+            cursor.execute(LIVE_STATE_QUERY)
+            result = cursor.fetchone()
+            if not result:
+                return {'event_id': None, 'is_ongoing': False, 'performer_id': None, 'version': 0}
+            event_id, has_started, performer_id, version = result
+            return {
+                'event_id': event_id,
+                'is_ongoing': bool(has_started),
+                'performer_id': performer_id,
+                'version': version
+            }
+
+def get_live_state():
+    if read_your_writes():
+        # The shared cache may predate this client's write (made on another backend)
+        return load_live_state()
+    return cache.get_or_load(CACHE_KEY_LIVE_STATE, load_live_state)
+
+def current_event_id():
+    return get_live_state()['event_id']
+
+# event_status and current_performer are kept as an audit log of every change
+history_log = os.environ.get('HISTORY_LOG', '1') == '1'
+# Audit rows of events older than this many events are compacted away when an event starts
+history_keep_events = int(os.environ.get('HISTORY_KEEP_EVENTS', '10'))
+
+def compact_history():
+    try:
+        with closing(get_db_connection()) as conn:
+            removed = archive_events.compact_history(conn, history_keep_events)
+        if removed:
+            logger.info("Compacted %d audit rows of past events", removed)
+    except mysql.connector.Error as err:
+        logger.error("Database error: %s", err)
+
 @app.route('/event-status', methods=['GET'])
+@conditional(data_version, response_cache, flights=response_flights)
 def get_event_status():
     """
     Endpoint to get the latest event status.
     """
     try:
-        with closing(get_db_connection()) as conn:
-            with conn.cursor() as cursor:
-                query = """
-                    SELECT has_started
-                    FROM event_status
-                    ORDER BY event_datetime DESC
-                    LIMIT 1
-                """
-                cursor.execute(query)
-                result = cursor.fetchone()
-                is_ongoing = result[0] if result else False
+        event = get_live_state()
     except mysql.connector.Error as err:
         # Log the error
-        print(f"Error: {err}")
-        is_ongoing = False
+        logger.error("Database error: %s", err)
+        # Fallback answer; must not be cached or tagged with the data version
+        response = jsonify({'is_ongoing': False})
+        response.cache_control.no_store = True
+        return response
 
     response = {
-        'is_ongoing': is_ongoing
+        'is_ongoing': event['is_ongoing'],
+        'event_id': event['event_id']
     }
     return jsonify(response)
 
@@ -56,240 +443,643 @@ def get_event_status():
 def change_event_status():
     """
     Endpoint to toggle the event status.
-    When starting the event, it also clears all existing scores.
+    Starting the event allocates a new event id, so the new event begins with no scores
+    and no current performer while earlier events' rows stay untouched for archiving.
     """
     try:
         with closing(get_db_connection()) as conn:
             with conn.cursor() as cursor:
-                # Start a transaction
-                conn.start_transaction()
-
-                # Get the latest event status
-                query = """
-                    SELECT has_started
-                    FROM event_status
-                    ORDER BY event_datetime DESC
-                    LIMIT 1
-                """
-                cursor.execute(query)
-                result = cursor.fetchone()
-                current_status = result[0] if result else False
-
-                # Toggle the status
-                new_status = not current_status
-
-                # Insert the new status
-                insert_query = """
-                    INSERT INTO event_status (has_started, event_datetime)
-                    VALUES (%s, NOW())
-                """
-                cursor.execute(insert_query, (new_status,))
-
-                # If the event is starting, clear the scores table
-                if new_status:
-                    delete_scores_query = "DELETE FROM scores"
-                    cursor.execute(delete_scores_query)
-
-                # Commit the transaction
-                conn.commit()
+                try:
+                    # Start a transaction
+                    conn.start_transaction()
+
+                    # Lock the live state and read the active event and its status
+                    cursor.execute("SELECT event_id, has_started FROM live_state WHERE id = 1 FOR UPDATE")
+                    event_id, current_status = cursor.fetchone()
+
+                    # Toggle the status
+                    new_status = not current_status
+
+                    if new_status:
+                        # Starting: allocate a new event instead of clearing the scores table
+                        cursor.execute("INSERT INTO event (started_at) VALUES (NOW())")
+                        event_id = cursor.lastrowid
+                        cursor.execute("""
+                            UPDATE live_state
+                            SET event_id = %s, has_started = TRUE, current_performer_id = NULL, version = version + 1
+                            WHERE id = 1
+                        """, (event_id,))
+                    else:
+                        cursor.execute("UPDATE event SET ended_at = NOW() WHERE id = %s", (event_id,))
+                        cursor.execute(
+                            "UPDATE live_state SET has_started = FALSE, version = version + 1 WHERE id = 1"
+                        )
+
+                    if history_log:
+                        insert_query = """
+                            INSERT INTO event_status (event_id, has_started, event_datetime)
+                            VALUES (%s, %s, NOW())
+                        """
+                        cursor.execute(insert_query, (event_id, new_status))
+
+                    # Commit the transaction
+                    conn.commit()
+                except mysql.connector.Error:
+                    # Rollback in case of error, while the connection is still ours
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
+
+                apply_event_status(new_status, event_id)
+                invalidation_channel.publish('event_status', {'is_ongoing': new_status, 'event_id': event_id})
 
                 response = {
-                    'new_status': new_status
+                    'new_status': new_status,
+                    'event_id': event_id
                 }
+
+        if new_status and history_log:
+            # Off the request path; the audit tables only matter for reporting
+            threading.Thread(target=compact_history, daemon=True).start()
+    except mysql.connector.errors.PoolError as err:
+        logger.error("Database error: %s", err)
+        return jsonify({'error': 'Database busy, try again shortly'}), 503
     except mysql.connector.Error as err:
-        # Rollback in case of error
-        if conn.in_transaction:
-            conn.rollback()
         # Log the error
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
         response = {
             'error': 'Failed to change event status'
         }
 
     return jsonify(response)
 
-@app.route('/scores', methods=['POST'])
-def submit_scores():
+def apply_event_status(new_status, event_id):
     """
-    Endpoint to submit scores for a performer by a judge.
+    Apply a committed event status change to this process's caches, live state and
+    live clients. Runs for this node's own writes and for those of other nodes.
     """
+    if new_status:
+        leaderboard.reset()
+        vote_tracker.reset()
+        score_changes.reset()
+    cache.invalidate(CACHE_KEY_LIVE_STATE)
+    staleness_guard.live_state_changed(event_id)
+    data_version.bump()
+    broadcaster.publish('event_status', {'is_ongoing': new_status, 'event_id': event_id})
+    if new_status:
+        broadcaster.publish('current_performer', {'performer': None})
+
+DUPLICATE_SCORES_ERROR = 'Scores already submitted for this performer by this judge'
+
+INSERT_SCORES_QUERY = """
+    INSERT INTO scores (event_id, judge_id, performer_id, presentation, stage_presence, choreography, timing, performance)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# SCORE_WRITE_MODE=group queues single submissions for a background writer that
+# commits everything arriving within one window together (see group_commit.py)
+score_write_mode = os.environ.get('SCORE_WRITE_MODE', 'direct')
+
+def record_late_score(params):
+    """
+    Apply a group-committed row whose submitter had already timed out (and answered
+    500), so this process and the others still see it.
+    """
+    event_id, judge_id, performer_id, *scores_list = params
+    note_local_write()
     try:
-        data = request.get_json()
+        if event_id == current_event_id():
+            record_score(judge_id, performer_id, scores_list, event_id)
+        publish_score(judge_id, performer_id, scores_list, event_id)
+    except Exception as e:
+        logger.exception("Failed to apply a late group commit: %s", e)
+        drop_local_state()
+
+score_writer = GroupCommitWriter(
+    get_db_connection,
+    INSERT_SCORES_QUERY,
+    window=float(os.environ.get('SCORE_GROUP_COMMIT_WINDOW_MS', '5')) / 1000,
+    max_batch=int(os.environ.get('SCORE_GROUP_COMMIT_MAX_BATCH', '100')),
+    timeout=float(os.environ.get('SCORE_GROUP_COMMIT_TIMEOUT', '5')),
+    on_late_commit=record_late_score
+) if score_write_mode == 'group' else None
+
+def insert_score(params):
+    """
+    Durably insert one score row, directly or as part of a group commit.
+    Raises mysql.connector.IntegrityError for a duplicate submission either way.
+    """
+    if score_writer is not None:
+        score_writer.submit(params)
+        return
+    with closing(get_db_connection()) as conn:
+        with conn.cursor(prepared=True) as cursor:
+            cursor.execute(INSERT_SCORES_QUERY, params)
+
+def validate_submission(data):
+    """
+    Validate one score submission against the cached roster without touching the database
+    (unless the roster has to be refreshed for an unknown id).
+    Returns (judge_id, performer_id, scores_list), or an (error message, status code) pair.
+    """
+    if not isinstance(data, dict):
+        return None, ('Invalid input', 400)
 
-        # Extract data from the JSON body
-        judge_id = data.get('judge_id')
-        performer_id = data.get('performer_id')
-        scores = data.get('scores', {})
+    # Extract data from the JSON body
+    judge_id = data.get('judge_id')
+    performer_id = data.get('performer_id')
+    scores = data.get('scores', {})
 
-        # Validate the input
-        if not judge_id or not performer_id or not scores:
-            return jsonify({'error': 'Invalid input'}), 400
+    # Validate the input
+    if not judge_id or not performer_id or not scores or not isinstance(scores, dict):
+        return None, ('Invalid input', 400)
 
-        # Validate that judge_id and performer_id are integers
-        try:
-            judge_id = int(judge_id)
-            performer_id = int(performer_id)
-        except ValueError:
-            return jsonify({'error': 'judge_id and performer_id must be integers'}), 400
+    # Validate that judge_id and performer_id are integers
+    try:
+        judge_id = int(judge_id)
+        performer_id = int(performer_id)
+    except (TypeError, ValueError):
+        return None, ('judge_id and performer_id must be integers', 400)
+
+    # Check if the judge and performer exist
+    if not find_judge(judge_id, refresh=True):
+        return None, ('Judge not found', 404)
+    if not find_performer(performer_id, refresh=True):
+        return None, ('Performer not found', 404)
+
+    # Ensure all scores are present and valid
+    scores_list = [scores.get(criterion) for criterion in CRITERIA]
+    if not all(scores_list):
+        return None, ('All scores must be provided', 400)
+
+    # Validate that scores are integers between 1 and 5
+    try:
+        scores_list = [int(score) for score in scores_list]
+    except (TypeError, ValueError):
+        return None, ('Scores must be integers', 400)
 
-        # Check if the judge and performer exist
-        with closing(get_db_connection()) as conn:
-            with conn.cursor(dictionary=True) as cursor:
-                # Check judge existence
-                cursor.execute("SELECT judge_id FROM judge WHERE judge_id = %s", (judge_id,))
-                if not cursor.fetchone():
-                    return jsonify({'error': 'Judge not found'}), 404
-
-                # Check performer existence
-                cursor.execute("SELECT id FROM performer WHERE id = %s", (performer_id,))
-                if not cursor.fetchone():
-                    return jsonify({'error': 'Performer not found'}), 404
-
-                # Check for duplicate submissions
-                cursor.execute("""
-                    SELECT score_id FROM scores WHERE judge_id = %s AND performer_id = %s
-                """, (judge_id, performer_id))
-                if cursor.fetchone():
-                    return jsonify({'error': 'Scores already submitted for this performer by this judge'}), 400
-
-        # Extract individual scores
-        presentation = scores.get('presentation')
-        stage_presence = scores.get('stage_presence')
-        choreography = scores.get('choreography')
-        timing = scores.get('timing')
-        performance = scores.get('performance')
-
-        # Ensure all scores are present and valid
-        if not all([presentation, stage_presence, choreography, timing, performance]):
-            return jsonify({'error': 'All scores must be provided'}), 400
-
-        # Validate that scores are integers between 1 and 5
-        try:
-            presentation = int(presentation)
-            stage_presence = int(stage_presence)
-            choreography = int(choreography)
-            timing = int(timing)
-            performance = int(performance)
-        except ValueError:
-            return jsonify({'error': 'Scores must be integers'}), 400
+    for score in scores_list:
+        if score < 1 or score > 5:
+            return None, ('Scores must be between 1 and 5', 400)
+
+    return (judge_id, performer_id, scores_list), None
+
+OTHER_JUDGE_ERROR = 'Judges can only submit their own scores'
+
+def with_session_judge(data):
+    # judge_id in the body is optional; it defaults to the logged-in judge
+    if isinstance(data, dict) and 'judge_id' not in data:
+        return {**data, 'judge_id': g.judge['judge_id']}
+    return data
 
-        scores_list = [presentation, stage_presence, choreography, timing, performance]
-        for score in scores_list:
-            if score < 1 or score > 5:
-                return jsonify({'error': 'Scores must be between 1 and 5'}), 400
+def is_duplicate_entry(err):
+    return err.errno == mysql.connector.errorcode.ER_DUP_ENTRY
+
+@app.route('/scores', methods=['POST'])
+@judge_required
+def submit_scores():
+    """
+    Endpoint to submit scores for a performer by the logged-in judge.
+    Validation runs in memory against the cached roster; the single INSERT is
+    autocommitted (or group committed with SCORE_WRITE_MODE=group) and the unique
+    (event_id, judge_id, performer_id) constraint rejects duplicates.
+    """
+    try:
+        submission, error = validate_submission(with_session_judge(request.get_json()))
+        if error:
+            message, status = error
+            return jsonify({'error': message}), status
+        judge_id, performer_id, scores_list = submission
+        if judge_id != g.judge['judge_id']:
+            return jsonify({'error': OTHER_JUDGE_ERROR}), 403
+        event_id = current_event_id()
 
         # Insert the scores into the database
-        with closing(get_db_connection()) as conn:
-            with conn.cursor() as cursor:
-                insert_query = """
-                    INSERT INTO scores (judge_id, performer_id, presentation, stage_presence, choreography, timing, performance)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """
-                cursor.execute(insert_query, (
-                    judge_id, performer_id, presentation,
-                    stage_presence, choreography, timing, performance
-                ))
-                conn.commit()
+        try:
+            insert_score((event_id, judge_id, performer_id, *scores_list))
+        except mysql.connector.IntegrityError as err:
+            if is_duplicate_entry(err):
+                return jsonify({'error': DUPLICATE_SCORES_ERROR}), 400
+            raise
+
+        record_score(judge_id, performer_id, scores_list, event_id)
+        publish_score(judge_id, performer_id, scores_list, event_id)
 
         return jsonify({'message': 'Scores submitted successfully'}), 201
 
     except mysql.connector.Error as err:
         # Log the error
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
+        return jsonify({'error': 'Failed to submit scores'}), 500
+    except Exception as e:
+        return unexpected_error(e)
+
+@app.route('/scores/batch', methods=['POST'])
+@judge_required
+def submit_scores_batch():
+    """
+    Endpoint for tablets syncing many of the logged-in judge's submissions at once:
+    {'submissions': [{'judge_id', 'performer_id', 'scores'}, ...]}.
+    Every valid, not yet recorded submission is inserted in one multi-row INSERT
+    inside a single transaction. Returns a per-submission status list, so a tablet
+    can safely resend a batch that was partially recorded before.
+    """
+    try:
+        data = request.get_json()
+        submissions = data.get('submissions') if isinstance(data, dict) else None
+        if not isinstance(submissions, list) or not submissions:
+            return jsonify({'error': 'Invalid input'}), 400
+
+        leaderboard.ensure_loaded(load_final_score_rows)
+
+        results = []
+        to_insert = []
+        seen = set()
+        for index, item in enumerate(submissions):
+            submission, error = validate_submission(with_session_judge(item))
+            if not error and submission[0] != g.judge['judge_id']:
+                error = (OTHER_JUDGE_ERROR, 403)
+            if not error:
+                judge_id, performer_id, _ = submission
+                pair = (judge_id, performer_id)
+                if pair in seen or leaderboard.has_score(performer_id, judge_id):
+                    error = (DUPLICATE_SCORES_ERROR, 400)
+                seen.add(pair)
+            if error:
+                message, status = error
+                results.append({'index': index, 'status': status, 'error': message})
+            else:
+                results.append({'index': index, 'status': 201})
+                to_insert.append(submission)
+
+        if to_insert:
+            event_id = current_event_id()
+            with closing(get_db_connection()) as conn:
+                with conn.cursor() as cursor:
+                    try:
+                        conn.start_transaction()
+                        cursor.executemany(INSERT_SCORES_QUERY, [
+                            (event_id, judge_id, performer_id, *scores_list)
+                            for judge_id, performer_id, scores_list in to_insert
+                        ])
+                        conn.commit()
+                    except mysql.connector.IntegrityError as err:
+                        conn.rollback()
+                        if is_duplicate_entry(err):
+                            # Lost a race with another submission; nothing from this batch was stored
+                            return jsonify({'error': DUPLICATE_SCORES_ERROR}), 400
+                        raise
+
+            for judge_id, performer_id, scores_list in to_insert:
+                record_score(judge_id, performer_id, scores_list, event_id)
+                publish_score(judge_id, performer_id, scores_list, event_id)
+
+        return jsonify({'inserted': len(to_insert), 'results': results}), 200
+
+    except mysql.connector.Error as err:
+        # Log the error
+        logger.error("Database error: %s", err)
         return jsonify({'error': 'Failed to submit scores'}), 500
     except Exception as e:
-        # Handle other exceptions
-        print(f"Unexpected error: {e}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+        return unexpected_error(e)
+
+def record_score(judge_id, performer_id, scores_list, event_id):
+    """
+    Apply a newly committed score to the in-memory leaderboard and push it to live clients
+    in the same shape as a /current-scores row.
+    """
+    staleness_guard.score_added(event_id)
+    vote_tracker.record(performer_id, judge_id)
+
+    try:
+        performer = find_performer(performer_id)
+        judge = find_judge(judge_id)
+    except mysql.connector.Error as err:
+        logger.error("Database error: %s", err)
+        performer = judge = None
+
+    if not performer or not judge:
+        # Roster unavailable or stale: fall back to rebuilding / refetching
+        leaderboard.invalidate()
+        score_changes.reset()
+        broadcaster.publish('resync', {})
+        return
+
+    presentation, stage_presence, choreography, timing, performance = scores_list
+    leaderboard.add_score({
+        'performer_id': performer_id,
+        'performer_name': performer['name'],
+        'judge_id': judge_id,
+        'judge_name': judge['name'],
+        'presentation': presentation,
+        'stage_presence': stage_presence,
+        'choreography': choreography,
+        'timing': timing,
+        'performance': performance,
+        'weight': judge['weight']
+    })
+    score_row = {
+        'performer_id': performer_id,
+        'performer_name': performer['name'],
+        'judge_id': judge_id,
+        'judge_name': judge['name'],
+        'total_score': sum(scores_list)
+    }
+    score_changes.append(score_row)
+    broadcaster.publish('score', score_row)
+
+def publish_score(judge_id, performer_id, scores_list, event_id):
+    invalidation_channel.publish('score', {
+        'event_id': event_id,
+        'judge_id': judge_id,
+        'performer_id': performer_id,
+        'scores': list(scores_list)
+    })
+
+# Channel on which every write is published to the other backend processes (see
+# invalidation.py). 'local' is enough for a single process; with several workers or
+# containers use 'socket' and run the relay at INVALIDATION_RELAY.
+invalidation_mode = os.environ.get('INVALIDATION_CHANNEL', 'local')
+if invalidation_mode == 'socket':
+    relay_host, _, relay_port = os.environ.get('INVALIDATION_RELAY', 'localhost:7700').partition(':')
+    invalidation_channel = SocketChannel(relay_host, int(relay_port or 7700))
+else:
+    invalidation_channel = LocalChannel()
+
+STATE_WATERMARK_QUERY = """
+    SELECT l.event_id, l.version, (SELECT COUNT(*) FROM scores s WHERE s.event_id = l.event_id)
+    FROM live_state l
+    WHERE l.id = 1
+"""
+
+def read_state_watermark():
+    with closing(get_db_connection()) as conn:
+        with conn.cursor(prepared=True) as cursor:
+            cursor.execute(STATE_WATERMARK_QUERY)
+            return cursor.fetchone()
+
+def drop_local_state():
+    """
+    Forget everything this process has cached or maintained incrementally, so it is
+    reloaded from the database on next use, and tell live clients to refetch.
+    """
+    note_local_write()
+    cache.clear()
+    leaderboard.invalidate()
+    vote_tracker.invalidate()
+    score_changes.reset()
+    broadcaster.publish('resync', {})
+
+def apply_remote_change(kind, data):
+    """
+    Apply a write made by another backend process, received on the invalidation channel.
+    """
+    note_local_write()
+    if kind == 'score':
+        # A late message from before an event change must not leak into the new event
+        if data['event_id'] == current_event_id():
+            record_score(data['judge_id'], data['performer_id'], data['scores'], data['event_id'])
+    elif kind == 'event_status':
+        apply_event_status(data['is_ongoing'], data['event_id'])
+    elif kind == 'current_performer':
+        apply_current_performer(data['performer'], data['event_id'])
+    elif kind == 'resync':
+        drop_local_state()
+        staleness_guard.rebaseline()
+
+# Bounds staleness when messages are lost: every STATE_SYNC_INTERVAL seconds the
+# database watermark is compared with the changes this process has applied (0 = off)
+staleness_guard = StalenessGuard(
+    read_state_watermark,
+    drop_local_state,
+    interval=float(os.environ.get('STATE_SYNC_INTERVAL', '1' if invalidation_mode == 'socket' else '0'))
+)
+
+metrics_registry.register(metrics.Gauge(
+    'scoreboard_invalidation', 'Invalidation channel and staleness guard counters.', ('stat',),
+    lambda: {
+        (name,): value
+        for name, value in {**invalidation_channel.stats(), **staleness_guard.stats()}.items()
+    }
+))
+
+_state_sync_started = False
+
+@app.before_request
+def start_state_sync():
+    # Started on first use so that every forked worker runs its own threads
+    global _state_sync_started
+    if not _state_sync_started:
+        _state_sync_started = True
+        invalidation_channel.start(apply_remote_change)
+        staleness_guard.start()
+
+@app.route('/stream', methods=['GET'])
+def stream_updates():
+    """
+    Server-Sent Events stream of live updates (score, current_performer, event_status, resync).
+    Clients fall back to polling the regular endpoints when it is unavailable.
+    """
+    last_event_id = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+    subscription = broadcaster.subscribe(last_event_id)
+    if subscription is None:
+        return jsonify({'error': 'Too many live clients, use polling'}), 503
+
+    response = Response(
+        stream_with_context(broadcaster.stream(subscription)),
+        mimetype='text/event-stream'
+    )
+    # The generator's own cleanup never runs if the body is not iterated (e.g. HEAD)
+    response.call_on_close(partial(broadcaster.unsubscribe, subscription))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/stream-stats', methods=['GET'])
+def get_stream_stats():
+    """
+    Endpoint to expose live stream client and event counters.
+    """
+    return jsonify(broadcaster.stats()), 200
+
+# Detailed scores for each performer with judge information
+FINAL_SCORES_QUERY = """
+    SELECT 
+        p.id AS performer_id,
+        p.name AS performer_name,
+        j.judge_id,
+        j.name AS judge_name,
+        s.presentation,
+        s.stage_presence,
+        s.choreography,
+        s.timing,
+        s.performance,
+        j.weight
+    FROM scores s
+    JOIN performer p ON s.performer_id = p.id
+    JOIN judge j ON s.judge_id = j.judge_id
+    WHERE s.event_id = %s
+    ORDER BY p.id, j.judge_id
+"""
+
+def load_final_score_rows():
+    event_id = current_event_id()
+    # From the primary: the leaderboard is built once and then maintained incrementally,
+    # so a row missing from a lagging replica would stay missing
+    with closing(get_db_connection()) as conn:
+        with conn.cursor(dictionary=True, prepared=True) as cursor:
+            cursor.execute(FINAL_SCORES_QUERY, (event_id,))
+            return cursor.fetchall()
+
+def parse_page_args(parse_after):
+    """
+    Read the ?limit=, ?after= and ?stream= parameters shared by the score listings.
+    `after` is the opaque cursor returned as 'next' by the previous page.
+    Returns ((limit, after, stream), None), or (None, error message) for a 400 response.
+    """
+    limit = request.args.get('limit')
+    after = request.args.get('after')
+    stream = request.args.get('stream', '').lower() in ('1', 'true')
+
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return None, 'limit must be a positive integer'
+        if limit < 1:
+            return None, 'limit must be a positive integer'
+    if after is not None:
+        try:
+            after = parse_after(after)
+        except ValueError:
+            return None, 'after must be a cursor returned as next by a previous page'
+    return (limit, after, stream), None
+
+def streamed_json(body):
+    return Response(stream_with_context(body), mimetype='application/json')
+
+def parse_rank_position(value):
+    total_score, performer_id = value.rsplit(':', 1)
+    return float(total_score), int(performer_id)
+
+def format_rank_position(position):
+    return None if position is None else f"{position[0]!r}:{position[1]}"
+
+def leaderboard_chunks(limit, after, page):
+    """
+    Walk the leaderboard a chunk at a time, taking its lock only per chunk.
+    Leaves the cursor for the following page in page['next'].
+    """
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = stream_chunk_size if remaining is None else min(stream_chunk_size, remaining)
+        entries, after = leaderboard.page(size, after)
+        page['next'] = after
+        yield entries
+        if after is None:
+            return
+        if remaining is not None:
+            remaining -= len(entries)
+
+def parse_scoring_args():
+    """
+    Read the ?method=, ?criteria_weights= and ?tiebreak= parameters of /final-scores,
+    e.g. ?method=trimmed_mean&criteria_weights=choreography:2,timing:0.5&tiebreak=performance.
+    Returns ((method, criterion weights, tiebreak criteria), None), or (None, error message).
+    """
+    method = request.args.get('method', 'weighted')
+    if method not in scoring.METHODS:
+        return None, f"method must be one of: {', '.join(scoring.METHODS)}"
+
+    criterion_weights = {}
+    for item in filter(None, request.args.get('criteria_weights', '').split(',')):
+        criterion, _, weight = item.partition(':')
+        if criterion not in CRITERIA:
+            return None, f"Unknown criterion '{criterion}'"
+        try:
+            criterion_weights[criterion] = float(weight)
+        except ValueError:
+            return None, 'criteria_weights must be a list of criterion:weight pairs'
+
+    tiebreak = [criterion for criterion in request.args.get('tiebreak', '').split(',') if criterion]
+    for criterion in tiebreak:
+        if criterion not in CRITERIA:
+            return None, f"Unknown criterion '{criterion}'"
+    return (method, criterion_weights, tiebreak), None
+
+def load_score_arrays():
+    leaderboard.ensure_loaded(load_final_score_rows)
+    return scoring.ScoreArrays.from_rows(leaderboard.rows())
 
 @app.route('/final-scores', methods=['GET'])
+@conditional(data_version, response_cache, compress=True, flights=response_flights)
 def get_final_scores():
     """
-    Endpoint to compute and return detailed scores for all performers.
+    Endpoint to return detailed scores for all performers, ranked by weighted total.
+    Served from the incrementally maintained leaderboard, which is rebuilt from the
+    database on first use.
+    With ?limit=, one page is returned along with the 'next' cursor to pass as ?after=
+    (null on the last page). With ?stream=1 the JSON is written incrementally.
+    ?method=, ?criteria_weights= and ?tiebreak= rank by another aggregation (see
+    scoring.py); those rankings are computed per data version and not paginated.
     """
-    try:
-        with closing(get_db_connection()) as conn:
-            with conn.cursor(dictionary=True) as cursor:
-                # Query to retrieve detailed scores for each performer with judge information
-                query = """
-                    SELECT 
-                        p.id AS performer_id,
-                        p.name AS performer_name,
-                        j.judge_id,
-                        j.name AS judge_name,
-                        s.presentation,
-                        s.stage_presence,
-                        s.choreography,
-                        s.timing,
-                        s.performance,
-                        j.weight
-                    FROM scores s
-                    JOIN performer p ON s.performer_id = p.id
-                    JOIN judge j ON s.judge_id = j.judge_id
-                    ORDER BY p.id, j.judge_id
-                """
-                cursor.execute(query)
-                results = cursor.fetchall()
-
-                # Organize data by performer
-                performers = {}
-                for row in results:
-                    performer_id = row['performer_id']
-                    if performer_id not in performers:
-                        performers[performer_id] = {
-                            'performer_name': row['performer_name'],
-                            'total_score': 0,
-                            'judge_scores': []
-                        }
-
-                    # Calculate individual judge score with weight
-                    score_sum = (
-                        row['presentation'] +
-                        row['stage_presence'] +
-                        row['choreography'] +
-                        row['timing'] +
-                        row['performance']
-                    )
-                    weighted_score = score_sum * row['weight']
-                    performers[performer_id]['total_score'] += weighted_score
-
-                    # Append judge's individual scores
-                    performers[performer_id]['judge_scores'].append({
-                        'judge_id': row['judge_id'],
-                        'judge_name': row['judge_name'],
-                        'presentation': row['presentation'],
-                        'stage_presence': row['stage_presence'],
-                        'choreography': row['choreography'],
-                        'timing': row['timing'],
-                        'performance': row['performance'],
-                        'weight': row['weight'],
-                        'weighted_score': weighted_score
-                    })
-
-                # Convert performers dict to a list and sort by total_score descending
-                final_scores = sorted(
-                    performers.values(),
-                    key=lambda x: x['total_score'],
-                    reverse=True
-                )
+    page_args, error = parse_page_args(parse_rank_position)
+    if error:
+        return jsonify({'error': error}), 400
+    limit, after, stream = page_args
+    paginated = limit is not None or after is not None
+
+    scoring_args, error = parse_scoring_args()
+    if error:
+        return jsonify({'error': error}), 400
+    method, criterion_weights, tiebreak = scoring_args
+    if method != 'weighted' or criterion_weights or tiebreak:
+        if paginated or stream:
+            return jsonify({'error': 'limit, after and stream only apply to the default ranking'}), 400
+        try:
+            arrays = cache.get_or_load(CACHE_KEY_SCORE_ARRAYS, load_score_arrays, version=data_version.current())
+            order, totals = scoring.rank(arrays, method, criterion_weights, tiebreak)
+            return jsonify({'scores': arrays.entries(order, totals), 'method': method}), 200
+        except mysql.connector.Error as err:
+            logger.error("Database error: %s", err)
+            return jsonify({'error': 'Failed to retrieve final scores'}), 500
+        except Exception as e:
+            return unexpected_error(e)
 
+    try:
+        leaderboard.ensure_loaded(load_final_score_rows)
+        if stream:
+            page = {'next': None}
+            return streamed_json(json_object_stream(
+                app.json.dumps, 'scores', leaderboard_chunks(limit, after, page),
+                lambda: {'next': format_rank_position(page['next'])} if paginated else {}
+            ))
+        final_scores, next_after = leaderboard.page(limit, after)
     except mysql.connector.Error as err:
         # Log the error
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
         return jsonify({'error': 'Failed to retrieve final scores'}), 500
     except Exception as e:
-        print(f"Unexpected error: {e}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+        return unexpected_error(e)
+
+    response = {'scores': final_scores}
+    if paginated:
+        response['next'] = format_rank_position(next_after)
+    return jsonify(response), 200
 
-    return jsonify({'scores': final_scores}), 200
+JUDGE_LOGIN_QUERY = "SELECT judge_id, name, email, password, weight FROM judge WHERE email = %s"
 
 @app.route('/judge/login', methods=['POST'])
 def judge_login():
     """
     Endpoint to authenticate a judge based on email and password.
+    Returns the judge and a signed session token to send as 'Authorization: Bearer <token>'
+    to the judge endpoints. A legacy plaintext password is replaced by its hash on success.
     """
     try:
         data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Email and password are required'}), 400
 
         # Extract email and password from the JSON body
         email = data.get('email')
@@ -298,34 +1088,81 @@ def judge_login():
         # Validate the input
         if not email or not password:
             return jsonify({'error': 'Email and password are required'}), 400
+        if not isinstance(email, str) or not isinstance(password, str):
+            return jsonify({'error': 'Email and password must be strings'}), 400
 
         with closing(get_db_connection()) as conn:
-            with conn.cursor(dictionary=True) as cursor:
+            with conn.cursor(dictionary=True, prepared=True) as cursor:
                 # Query to retrieve the judge with the given email
-                query = "SELECT judge_id, name, email, password, weight FROM judge WHERE email = %s"
-                cursor.execute(query, (email,))
+                cursor.execute(JUDGE_LOGIN_QUERY, (email,))
                 judge = cursor.fetchone()
 
-                if not judge:
-                    return jsonify({'error': 'Invalid email or password'}), 401
-
-                # Compare the password (assuming passwords are stored hashed)
-                if judge['password'] != password:
-                    return jsonify({'error': 'Invalid email or password'}), 401
+        # Compare the password against its slow hash (a dummy one for unknown emails)
+        # after the connection is back in the pool, since hashing takes a while
+        matches, new_hash = check_password(judge['password'] if judge else None, password)
+        if not matches:
+            return jsonify({'error': 'Invalid email or password'}), 401
+        if new_hash:
+            with closing(get_db_connection()) as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "UPDATE judge SET password = %s WHERE judge_id = %s",
+                        (new_hash, judge['judge_id'])
+                    )
 
-                # Remove password before sending response
-                judge.pop('password', None)
+        # Remove password before sending response
+        judge.pop('password', None)
 
-                return jsonify({'judge': judge}), 200
+        return jsonify({
+            'judge': judge,
+            'token': judge_tokens.issue(judge),
+            'expires_in': judge_tokens.max_age
+        }), 200
 
     except mysql.connector.Error as err:
         # Log the error
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
         return jsonify({'error': 'Failed to authenticate'}), 500
     except Exception as e:
-        # Handle other exceptions
-        print(f"Unexpected error: {e}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+        return unexpected_error(e)
+
+PERFORMERS_QUERY = "SELECT id, name FROM performer"
+JUDGES_QUERY = "SELECT judge_id, name, weight FROM judge"
+
+def load_performers():
+    with closing(get_read_connection()) as conn:
+        with conn.cursor(dictionary=True, prepared=True) as cursor:
+            cursor.execute(PERFORMERS_QUERY)
+            return cursor.fetchall()
+
+def load_judges():
+    with closing(get_read_connection()) as conn:
+        with conn.cursor(dictionary=True, prepared=True) as cursor:
+            cursor.execute(JUDGES_QUERY)
+            return cursor.fetchall()
+
+def find_performer(performer_id, refresh=False):
+    """
+    Look up a performer in the cached roster. With refresh=True an unknown id reloads
+    the roster once, so performers added after the cache was filled are found.
+    """
+    performers = cache.get_or_load(CACHE_KEY_PERFORMERS, load_performers)
+    performer = next((p for p in performers if p['id'] == int(performer_id)), None)
+    if performer is None and refresh:
+        cache.invalidate(CACHE_KEY_PERFORMERS)
+        return find_performer(performer_id)
+    return performer
+
+def find_judge(judge_id, refresh=False):
+    """
+    Look up a judge in the cached roster, reloading it once for an unknown id if refresh=True.
+    """
+    judges = cache.get_or_load(CACHE_KEY_JUDGES, load_judges)
+    judge = next((j for j in judges if j['judge_id'] == int(judge_id)), None)
+    if judge is None and refresh:
+        cache.invalidate(CACHE_KEY_JUDGES)
+        return find_judge(judge_id)
+    return judge
 
 @app.route('/performers', methods=['GET'])
 def get_performers():
@@ -333,25 +1170,22 @@ def get_performers():
     Endpoint to retrieve the list of all performer names.
     """
     try:
-        with closing(get_db_connection()) as conn:
-            with conn.cursor(dictionary=True) as cursor:
-                query = "SELECT id, name FROM performer"
-                cursor.execute(query)
-                performers = cursor.fetchall()
+        performers = cache.get_or_load(CACHE_KEY_PERFORMERS, load_performers)
         return jsonify({'performers': performers}), 200
     except mysql.connector.Error as err:
         # Log the error
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
         return jsonify({'error': 'Failed to retrieve performers'}), 500
     except Exception as e:
-        # Handle other exceptions
-        print(f"Unexpected error: {e}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+        return unexpected_error(e)
 
 @app.route('/set-current-performer', methods=['POST'])
+@judge_required
 def set_current_performer():
     """
     Endpoint to update the current performer.
+    The live-state record is updated in place; with HISTORY_LOG the change is also
+    appended to the current_performer audit table in the same transaction.
     """
     try:
         data = request.get_json()
@@ -360,53 +1194,68 @@ def set_current_performer():
         if not performer_id:
             return jsonify({'error': 'Performer ID is required'}), 400
 
+        try:
+            performer_id = int(performer_id)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'Performer ID must be an integer'}), 400
+
+        # Verify that the performer exists
+        performer = find_performer(performer_id, refresh=True)
+        if not performer:
+            return jsonify({'error': 'Performer not found'}), 404
+
+        event_id = current_event_id()
         with closing(get_db_connection()) as conn:
             with conn.cursor() as cursor:
-                # Verify that the performer exists
-                select_query = "SELECT id FROM performer WHERE id = %s"
-                cursor.execute(select_query, (performer_id,))
-                result = cursor.fetchone()
-
-                if not result:
-                    return jsonify({'error': 'Performer not found'}), 404
-
-                # Insert into current_performer table
-                insert_query = """
-                    INSERT INTO current_performer (performer_id)
-                    VALUES (%s)
+                update_query = """
+                    UPDATE live_state
+                    SET current_performer_id = %s, version = version + 1
+                    WHERE id = 1
                 """
-                cursor.execute(insert_query, (performer_id,))
-                conn.commit()
+                if history_log:
+                    conn.start_transaction()
+                    cursor.execute(update_query, (performer_id,))
+                    insert_query = """
+                        INSERT INTO current_performer (event_id, performer_id)
+                        VALUES (%s, %s)
+                    """
+                    cursor.execute(insert_query, (event_id, performer_id))
+                    conn.commit()
+                else:
+                    cursor.execute(update_query, (performer_id,))
+
+        apply_current_performer(performer, event_id)
+        invalidation_channel.publish('current_performer', {'performer': performer, 'event_id': event_id})
 
         return jsonify({'message': 'Current performer updated successfully'}), 200
 
     except mysql.connector.Error as err:
         # Log the error
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
         return jsonify({'error': 'Failed to update current performer'}), 500
     except Exception as e:
-        # Handle other exceptions
-        print(f"Unexpected error: {e}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+        return unexpected_error(e)
+
+def apply_current_performer(performer, event_id):
+    """
+    Apply a committed current performer change to this process's caches, vote
+    tracker and live clients. Runs for this node's own writes and for those of other nodes.
+    """
+    cache.invalidate(CACHE_KEY_LIVE_STATE)
+    vote_tracker.set_performer(performer['id'])
+    staleness_guard.live_state_changed(event_id)
+    data_version.bump()
+    broadcaster.publish('current_performer', {'performer': performer})
 
 @app.route('/current-performer', methods=['GET'])
+@conditional(data_version, response_cache, bypass=read_your_writes, flights=response_flights)
 def get_current_performer():
     """
-    Endpoint to retrieve the current performer based on the latest entry.
+    Endpoint to retrieve the current performer from the live-state record.
     """
     try:
-        with closing(get_db_connection()) as conn:
-            with conn.cursor(dictionary=True) as cursor:
-                # Query to get the latest performer
-                query = """
-                    SELECT p.id, p.name
-                    FROM current_performer cp
-                    JOIN performer p ON cp.performer_id = p.id
-                    ORDER BY cp.entry_timestamp DESC
-                    LIMIT 1
-                """
-                cursor.execute(query)
-                performer = cursor.fetchone()
+        performer_id = get_live_state()['performer_id']
+        performer = find_performer(performer_id) if performer_id is not None else None
 
         if performer:
             return jsonify({'performer': performer}), 200
@@ -414,64 +1263,98 @@ def get_current_performer():
             return jsonify({'performer': None}), 200
 
     except mysql.connector.Error as err:
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
         return jsonify({'error': 'Failed to retrieve current performer'}), 500
     except Exception as e:
-        print(f"Unexpected error: {e}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+        return unexpected_error(e)
+
+VOTE_STATE_QUERY = "SELECT judge_id FROM scores WHERE event_id = %s AND performer_id = %s"
+
+def load_vote_state():
+    state = get_live_state()
+    judge_ids = [judge['judge_id'] for judge in cache.get_or_load(CACHE_KEY_JUDGES, load_judges)]
+    event_id, performer_id = state['event_id'], state['performer_id']
+    if performer_id is None:
+        return None, judge_ids, []
+
+    # From the primary, like the leaderboard: the tracker is maintained incrementally
+    with closing(get_db_connection()) as conn:
+        with conn.cursor(dictionary=True, prepared=True) as cursor:
+            cursor.execute(VOTE_STATE_QUERY, (event_id, performer_id))
+            submitted_ids = [row['judge_id'] for row in cursor.fetchall()]
+            return performer_id, judge_ids, submitted_ids
+
+def ensure_vote_tracker(judge_id=None):
+    """
+    Load the vote tracker, reloading it if judge_id is a judge added since it was built.
+    Returns the tracker, or None if the judge does not exist. Under read-your-writes
+    the answer comes from a tracker built from the primary just for this request, since
+    this process's tracker may not have seen a write made through another backend.
+    """
+    tracker = VoteTracker() if read_your_writes() else vote_tracker
+    tracker.ensure_loaded(load_vote_state)
+    if judge_id is None or tracker.knows_judge(judge_id):
+        return tracker
+    if not find_judge(judge_id, refresh=True):
+        return None
+    tracker.invalidate()
+    tracker.ensure_loaded(load_vote_state)
+    return tracker if tracker.knows_judge(judge_id) else None
 
 @app.route('/canVote/<int:judge_id>', methods=['GET'])
+@judge_required
 def can_vote(judge_id):
     """
     Endpoint to determine if a judge can vote based on whether all judges with lower IDs have already voted.
+    Answered from the in-memory vote tracker, which is rebuilt from the scores table on first use.
     Returns:
         JSON object {'canVote': Boolean}
     """
+    if judge_id != g.judge['judge_id']:
+        return jsonify({'error': 'Judges can only check their own eligibility'}), 403
+
     try:
-        with closing(get_db_connection()) as conn:
-            with conn.cursor(dictionary=True) as cursor:
-                # Check if the judge exists
-                cursor.execute("SELECT judge_id FROM judge WHERE judge_id = %s", (judge_id,))
-                judge = cursor.fetchone()
-                if not judge:
-                    return jsonify({'error': 'Judge not found'}), 404
-
-                # Get the current performer
-                cursor.execute("""
-                    SELECT performer_id FROM current_performer
-                    ORDER BY entry_timestamp DESC
-                    LIMIT 1
-                """)
-                current_performer = cursor.fetchone()
-                if not current_performer:
-                    return jsonify({'error': 'Current performer not set'}), 400
-                performer_id = current_performer['performer_id']
-
-                # Check for judges with judge_id less than the current judge_id
-                # who have not yet submitted scores for the current performer
-                cursor.execute("""
-                    SELECT COUNT(*) AS num_pending_judges
-                    FROM judge j
-                    WHERE j.judge_id < %s AND NOT EXISTS (
-                        SELECT 1 FROM scores s
-                        WHERE s.judge_id = j.judge_id AND s.performer_id = %s
-                    )
-                """, (judge_id, performer_id))
-                result = cursor.fetchone()
-                num_pending_judges = result['num_pending_judges']
+        # Check if the judge exists
+        tracker = ensure_vote_tracker(judge_id)
+        if tracker is None:
+            return jsonify({'error': 'Judge not found'}), 404
 
-                can_vote_value = (num_pending_judges == 0)
+        if tracker.performer_id is None:
+            return jsonify({'error': 'Current performer not set'}), 400
 
-        return jsonify({'canVote': can_vote_value}), 200
+        return jsonify({'canVote': tracker.can_vote(judge_id)}), 200
 
     except mysql.connector.Error as err:
         # Log the error
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
         return jsonify({'error': 'Failed to determine voting eligibility'}), 500
     except Exception as e:
-        # Handle other exceptions
-        print(f"Unexpected error: {e}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+        return unexpected_error(e)
+
+@app.route('/canVote', methods=['GET'])
+def can_vote_all():
+    """
+    Endpoint to determine voting eligibility for every judge at once.
+    Returns:
+        JSON object {'performer_id': Integer, 'canVote': {judge_id: Boolean}}
+    """
+    try:
+        tracker = ensure_vote_tracker()
+
+        if tracker.performer_id is None:
+            return jsonify({'error': 'Current performer not set'}), 400
+
+        return jsonify({
+            'performer_id': tracker.performer_id,
+            'canVote': tracker.can_vote_all()
+        }), 200
+
+    except mysql.connector.Error as err:
+        # Log the error
+        logger.error("Database error: %s", err)
+        return jsonify({'error': 'Failed to determine voting eligibility'}), 500
+    except Exception as e:
+        return unexpected_error(e)
 
 @app.route('/performers-and-judges', methods=['GET'])
 def get_performers_and_judges():
@@ -479,57 +1362,335 @@ def get_performers_and_judges():
     Endpoint to retrieve the list of all performers and judges.
     """
     try:
-        with closing(get_db_connection()) as conn:
-            with conn.cursor(dictionary=True) as cursor:
-                # Fetch performers
-                cursor.execute("SELECT id, name FROM performer")
-                performers = cursor.fetchall()
-
-                # Fetch judges
-                cursor.execute("SELECT judge_id, name FROM judge")
-                judges = cursor.fetchall()
+        performers = cache.get_or_load(CACHE_KEY_PERFORMERS, load_performers)
+        judges = [
+            {'judge_id': judge['judge_id'], 'name': judge['name']}
+            for judge in cache.get_or_load(CACHE_KEY_JUDGES, load_judges)
+        ]
 
         return jsonify({'performers': performers, 'judges': judges}), 200
     except mysql.connector.Error as err:
         # Log the error
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
         return jsonify({'error': 'Failed to retrieve performers and judges'}), 500
     except Exception as e:
-        # Handle other exceptions
-        print(f"Unexpected error: {e}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+        return unexpected_error(e)
+
+CURRENT_SCORES_QUERY = """
+    SELECT
+        s.score_id,
+        s.performer_id,
+        p.name AS performer_name,
+        s.judge_id,
+        j.name AS judge_name,
+        (s.presentation + s.stage_presence + s.choreography + s.timing + s.performance) AS total_score
+    FROM scores s
+    JOIN performer p ON s.performer_id = p.id
+    JOIN judge j ON s.judge_id = j.judge_id
+    WHERE s.event_id = %s AND s.score_id > %s
+    ORDER BY s.score_id
+"""
+CURRENT_SCORES_PAGE_QUERY = CURRENT_SCORES_QUERY + " LIMIT %s"
+
+def current_score_chunks(cursor, limit, page):
+    """
+    Read /current-scores rows in chunks, dropping the score_id keyset column.
+    The query reads one row past `limit` to tell whether another page follows;
+    if one does, page['next'] is set to the last returned score_id.
+    """
+    returned = 0
+    for rows in cursor_chunks(cursor, stream_chunk_size):
+        more = limit is not None and returned + len(rows) > limit
+        if more:
+            rows = rows[:limit - returned]
+        for row in rows:
+            page['last'] = row.pop('score_id')
+        returned += len(rows)
+        if more:
+            page['next'] = page['last']
+        yield rows
+
+def stream_current_scores(cursor, limit, page, trailer, listing):
+    """
+    Generator body of a streamed /current-scores response. Sets listing['finished']
+    once every row was read; see close_streamed_listing for the connection.
+    """
+    try:
+        yield from json_object_stream(app.json.dumps, 'scores', current_score_chunks(cursor, limit, page), trailer)
+        listing['finished'] = True
+    except mysql.connector.Error as err:
+        logger.error("Database error: %s", err)
+        raise
+
+def close_streamed_listing(conn, cursor, listing, slot):
+    """
+    Return a streamed listing's connection to the pool and free its slot. Runs when
+    the server closes the response, also if the body was never iterated (HEAD) or
+    the client went away mid-stream.
+    """
+    try:
+        if listing['finished']:
+            cursor.close()
+        else:
+            # Unread rows make the connection unusable
+            conn.broken = True
+        conn.close()
+    finally:
+        slot.release()
+
+def current_score_matrix():
+    """
+    /current-scores?format=matrix: roster ids once plus a dense performer x judge
+    matrix of score totals, built from the in-memory leaderboard and cached roster.
+    """
+    leaderboard.ensure_loaded(load_final_score_rows)
+    performer_ids = sorted(performer['id'] for performer in cache.get_or_load(CACHE_KEY_PERFORMERS, load_performers))
+    judge_ids = sorted(judge['judge_id'] for judge in cache.get_or_load(CACHE_KEY_JUDGES, load_judges))
+    return {
+        'performer_ids': performer_ids,
+        'judge_ids': judge_ids,
+        'scores': leaderboard.score_matrix(performer_ids, judge_ids)
+    }
 
 @app.route('/current-scores', methods=['GET'])
+@conditional(data_version, response_cache, compress=True, flights=response_flights)
 def get_current_scores():
     """
     Endpoint to retrieve the combined scores for all performer-judge combinations.
+    With ?since=<version>, where version comes from an earlier response ('version' or
+    X-Data-Version), only rows written after it are returned ('full': false); if the
+    server can no longer tell, e.g. because another backend process issued the
+    version, the full list is returned ('full': true) and the client should replace
+    what it has.
+    With ?limit=, rows come in submission order one page at a time along with the
+    'next' cursor to pass as ?after= (null on the last page). With ?stream=1 rows are
+    read from a server-side cursor and the JSON is written incrementally.
+    With ?format=matrix the scores come as a dense performer x judge matrix instead
+    (see current_score_matrix); the other options do not apply to it.
     """
-    try:
-        with closing(get_db_connection()) as conn:
-            with conn.cursor(dictionary=True) as cursor:
-                query = """
-                    SELECT
-                        s.performer_id,
-                        p.name AS performer_name,
-                        s.judge_id,
-                        j.name AS judge_name,
-                        (s.presentation + s.stage_presence + s.choreography + s.timing + s.performance) AS total_score
-                    FROM scores s
-                    JOIN performer p ON s.performer_id = p.id
-                    JOIN judge j ON s.judge_id = j.judge_id
-                """
-                cursor.execute(query)
-                scores = cursor.fetchall()
+    response_format = request.args.get('format', 'rows')
+    if response_format == 'matrix':
+        try:
+            return jsonify(current_score_matrix()), 200
+        except mysql.connector.Error as err:
+            logger.error("Database error: %s", err)
+            return jsonify({'error': 'Failed to retrieve current scores'}), 500
+        except Exception as e:
+            return unexpected_error(e)
+    if response_format != 'rows':
+        return jsonify({'error': 'format must be rows or matrix'}), 400
+
+    page_args, error = parse_page_args(int)
+    if error:
+        return jsonify({'error': error}), 400
+    limit, after, stream = page_args
+    paginated = limit is not None or after is not None
+
+    since = request.args.get('since')
+    if since is not None:
+        try:
+            since_version = data_version.parse(since)
+        except ValueError:
+            return jsonify({'error': 'since must be a version returned by this endpoint'}), 400
+        # A version from another backend process says nothing about this one's changes
+        changes = score_changes.since(since_version) if since_version is not None else None
+        if changes is not None:
+            scores, version = changes
+            return jsonify({'scores': scores, 'version': data_version.token(version), 'full': False}), 200
 
-        return jsonify({'scores': scores}), 200
+    try:
+        version = data_version.current()
+        event_id = current_event_id()
+        query, params = CURRENT_SCORES_QUERY, [event_id, after or 0]
+        if limit is not None:
+            query = CURRENT_SCORES_PAGE_QUERY
+            params.append(limit + 1)
+
+        page = {'last': None, 'next': None}
+
+        def trailer():
+            fields = {}
+            if paginated:
+                fields['next'] = page['next']
+            if since is not None:
+                fields.update(version=data_version.token(version), full=True)
+            return fields
+
+        if stream:
+            slot = stream_listings
+            if stream_max_listings < 1 or not slot.acquire(blocking=False):
+                return jsonify({'error': 'Too many streamed listings in progress, retry without stream=1'}), 503
+            try:
+                conn = get_read_connection()
+                try:
+                    cursor = conn.cursor(dictionary=True)
+                    cursor.execute(query, params)
+                except Exception:
+                    conn.close()
+                    raise
+            except Exception:
+                slot.release()
+                raise
+            listing = {'finished': False}
+            response = streamed_json(stream_current_scores(cursor, limit, page, trailer, listing))
+            response.call_on_close(partial(close_streamed_listing, conn, cursor, listing, slot))
+            return response
+
+        with closing(get_read_connection()) as conn:
+            with conn.cursor(dictionary=True, prepared=True) as cursor:
+                cursor.execute(query, params)
+                scores = [row for rows in current_score_chunks(cursor, limit, page) for row in rows]
+
+        return jsonify({'scores': scores, **trailer()}), 200
     except mysql.connector.Error as err:
         # Log the error
-        print(f"Error: {err}")
+        logger.error("Database error: %s", err)
         return jsonify({'error': 'Failed to retrieve current scores'}), 500
     except Exception as e:
-        # Handle other exceptions
-        print(f"Unexpected error: {e}")
-        return jsonify({'error': 'An unexpected error occurred'}), 500
+        return unexpected_error(e)
+
+# Statements prepared on every warmed connection, as (sql, dictionary cursor). Statements
+# without placeholders are executed to prepare them, so only cheap ones are listed.
+# Reads that may go to a replica are prepared there too; the rest only on the primary.
+REPLICA_STATEMENTS = (
+    (PERFORMERS_QUERY, True),
+    (JUDGES_QUERY, True),
+    (CURRENT_SCORES_QUERY, True),
+    (CURRENT_SCORES_PAGE_QUERY, True),
+)
+PRIMARY_STATEMENTS = REPLICA_STATEMENTS + (
+    (LIVE_STATE_QUERY, False),
+    (INSERT_SCORES_QUERY, False),
+    (VOTE_STATE_QUERY, True),
+    (FINAL_SCORES_QUERY, True),
+    (JUDGE_LOGIN_QUERY, True),
+    (STATE_WATERMARK_QUERY, False),
+)
+
+# Connections per pool opened and prepared by warm_up() (default: the pool size)
+db_pool_warm = int(os.environ.get('DB_POOL_WARM', str(db_pool_size)))
+# Seconds between warm-up attempts while the database is unreachable
+warm_up_retry = float(os.environ.get('WARM_UP_RETRY', '2'))
+
+warm_up_done = threading.Event()
+warm_up_stats = {'attempts': 0, 'seconds': None, 'connections': 0, 'error': None}
+
+def prepare_statements(statements):
+    def setup(conn):
+        for sql, dictionary in statements:
+            with conn.cursor(dictionary=dictionary, prepared=True) as cursor:
+                cursor.prepare(sql)
+    return setup if db_prepared_statements else None
+
+def warm_up():
+    """
+    Bring this process to steady state before it takes traffic: open the pooled
+    connections, prepare the hot statements on each of them, and load the live state,
+    roster, leaderboard and vote tracker. Raises mysql.connector.Error on failure.
+    """
+    started = time.perf_counter()
+    connections = db_pool.warm(db_pool_warm, prepare_statements(PRIMARY_STATEMENTS))
+    for replica, pool in zip(db_replica_hosts, replica_pools):
+        try:
+            connections += pool.warm(db_pool_warm, prepare_statements(REPLICA_STATEMENTS))
+        except mysql.connector.Error as err:
+            # Reads fall back to the primary while a replica is down
+            logger.warning("Could not warm up replica %s: %s", replica, err)
+    get_live_state()
+    cache.get_or_load(CACHE_KEY_PERFORMERS, load_performers)
+    cache.get_or_load(CACHE_KEY_JUDGES, load_judges)
+    leaderboard.ensure_loaded(load_final_score_rows)
+    vote_tracker.ensure_loaded(load_vote_state)
+    warm_up_stats.update(seconds=round(time.perf_counter() - started, 3), connections=connections, error=None)
+    logger.info("Warmed up in %.3fs with %d connections", warm_up_stats['seconds'], connections)
+
+def run_warm_up():
+    while True:
+        warm_up_stats['attempts'] += 1
+        try:
+            warm_up()
+            warm_up_done.set()
+            return
+        except mysql.connector.Error as err:
+            warm_up_stats['error'] = str(err)
+            logger.error("Warm-up failed, retrying in %ss: %s", warm_up_retry, err)
+        time.sleep(warm_up_retry)
+
+def start_warm_up(wait=0):
+    """
+    Warm up in a background thread, retrying until the database is reachable, and
+    wait up to `wait` seconds for it to finish. Returns whether it finished.
+    """
+    threading.Thread(target=run_warm_up, name='warm-up', daemon=True).start()
+    return warm_up_done.wait(wait)
+
+@app.route('/ready', methods=['GET'])
+def readiness():
+    """
+    Endpoint for readiness checks: 200 once this process has warmed up (see warm_up),
+    503 while it is still warming up or cannot reach the database.
+    """
+    ready = warm_up_done.is_set()
+    return jsonify({'ready': ready, **warm_up_stats}), 200 if ready else 503
+
+def reset_process_state():
+    """
+    Give a freshly forked worker its own connections, caches and live state
+    instead of sharing the ones it inherited from the parent process.
+    """
+    global _state_sync_started, stream_listings, _last_local_write
+    db_pool.reset_after_fork()
+    for pool in replica_pools:
+        pool.reset_after_fork()
+    broadcaster.reset_after_fork()
+    data_version.reset_after_fork()
+    if score_writer is not None:
+        score_writer.reset_after_fork()
+    invalidation_channel.reset_after_fork()
+    staleness_guard.reset_after_fork()
+    _state_sync_started = False
+    _last_local_write = float('-inf')
+    stream_listings = threading.BoundedSemaphore(max(stream_max_listings, 1))
+    for flights in (cache_flights, response_flights):
+        if flights is not None:
+            flights.reset_after_fork()
+    cache.clear()
+    response_cache.clear()
+    leaderboard.invalidate()
+    vote_tracker.invalidate()
+    score_changes.reset()
+    # Warm-up is per process (see gunicorn.conf.py)
+    warm_up_done.clear()
+
+def shutdown_process_state():
+    """
+    Release per-process resources on graceful shutdown: end live streams so their
+    requests complete, flush queued score writes, then close idle database connections.
+    """
+    broadcaster.close()
+    invalidation_channel.close()
+    staleness_guard.close()
+    if score_writer is not None:
+        score_writer.close()
+    db_pool.close_all()
+    for pool in replica_pools:
+        pool.close_all()
+
+_fork_handler_registered = False
+
+def create_app():
+    """
+    Application factory for production servers (see wsgi.py and gunicorn.conf.py).
+    All state lives in this module, so the factory makes sure each forked worker
+    starts with its own copy of it.
+    """
+    global _fork_handler_registered
+    if not _fork_handler_registered:
+        os.register_at_fork(after_in_child=reset_process_state)
+        _fork_handler_registered = True
+    return app
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Development server only; production runs through gunicorn (see serve.sh)
+    start_warm_up()
+    app.run(debug=os.environ.get('FLASK_DEBUG', '1') == '1', host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file
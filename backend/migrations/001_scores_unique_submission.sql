@@ -0,0 +1,13 @@
+-- One score submission per judge and performer, enforced by the database so
+-- submit_scores can rely on a single INSERT instead of a racy SELECT-then-INSERT.
+-- That check-then-insert may already have let duplicates in: keep the earliest
+-- submission (lowest score_id) of each judge and performer and delete the rest.
+DELETE newer
+FROM scores newer
+JOIN scores older
+    ON older.judge_id = newer.judge_id
+    AND older.performer_id = newer.performer_id
+    AND older.score_id < newer.score_id;
+
+ALTER TABLE scores
+    ADD CONSTRAINT uq_scores_judge_performer UNIQUE (judge_id, performer_id);
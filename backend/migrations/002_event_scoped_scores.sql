@@ -0,0 +1,33 @@
+-- Key scores, event status and current performer by event, so starting an event
+-- allocates a new event id instead of running DELETE FROM scores. Old events stay
+-- queryable until archive_events.py moves them out of the hot tables.
+CREATE TABLE event (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    started_at DATETIME NULL,
+    ended_at DATETIME NULL
+);
+
+-- Everything recorded so far belongs to the first event
+INSERT INTO event (id, started_at) VALUES (1, NOW());
+
+ALTER TABLE event_status
+    ADD COLUMN event_id INT NOT NULL DEFAULT 1,
+    ADD INDEX idx_event_status_event (event_id, event_datetime);
+ALTER TABLE event_status ALTER COLUMN event_id DROP DEFAULT;
+
+ALTER TABLE current_performer
+    ADD COLUMN event_id INT NOT NULL DEFAULT 1,
+    ADD INDEX idx_current_performer_event (event_id, entry_timestamp);
+ALTER TABLE current_performer ALTER COLUMN event_id DROP DEFAULT;
+
+-- A judge scores a performer once per event. The judge_id index keeps the
+-- judge foreign key covered once the old unique key is dropped.
+ALTER TABLE scores
+    ADD COLUMN event_id INT NOT NULL DEFAULT 1,
+    ADD INDEX idx_scores_judge (judge_id),
+    ADD CONSTRAINT uq_scores_event_judge_performer UNIQUE (event_id, judge_id, performer_id),
+    DROP INDEX uq_scores_judge_performer;
+ALTER TABLE scores ALTER COLUMN event_id DROP DEFAULT;
+
+-- Same shape as scores, for rows of finished events (see archive_events.py)
+CREATE TABLE scores_archive LIKE scores;
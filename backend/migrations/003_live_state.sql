@@ -0,0 +1,28 @@
+-- Singleton live-state record: the active event, whether it is running and the
+-- current performer, updated atomically by the write endpoints and read by primary
+-- key. event_status and current_performer become an optional audit log (HISTORY_LOG)
+-- compacted by archive_events.py.
+CREATE TABLE live_state (
+    id TINYINT PRIMARY KEY,
+    event_id INT NOT NULL,
+    has_started BOOLEAN NOT NULL DEFAULT FALSE,
+    current_performer_id INT NULL,
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT chk_live_state_singleton CHECK (id = 1)
+);
+
+-- Seed it from the latest rows of the history tables
+INSERT INTO live_state (id, event_id, has_started, current_performer_id)
+SELECT
+    1,
+    e.id,
+    COALESCE((SELECT es.has_started FROM event_status es
+              WHERE es.event_id = e.id
+              ORDER BY es.event_datetime DESC LIMIT 1), FALSE),
+    (SELECT cp.performer_id FROM current_performer cp
+     WHERE cp.event_id = e.id
+     ORDER BY cp.entry_timestamp DESC LIMIT 1)
+FROM event e
+ORDER BY e.id DESC
+LIMIT 1;
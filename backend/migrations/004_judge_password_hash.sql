@@ -0,0 +1,5 @@
+-- Judge passwords are stored as werkzeug password hashes (about 160 characters for
+-- scrypt). Existing plaintext passwords keep working and are replaced by their
+-- hash on each judge's next successful login (see auth.py).
+ALTER TABLE judge
+    MODIFY password VARCHAR(255) NOT NULL;
@@ -0,0 +1,155 @@
+"""
+Vectorized ranking of an event's scores under different aggregation methods.
+
+Scores are held as a dense performers x judges x criteria array (NaN where a judge
+has not scored a performer), so each method is a handful of whole-array operations
+however many performers and judges there are.
+
+Methods:
+    weighted      sum over judges of judge weight x criteria total; the default
+                  /final-scores ranking, with bit-identical totals
+    trimmed_mean  mean of the judges' criteria totals after dropping the highest and
+                  the lowest one (when at least three judges scored the performer)
+    zscore        each judge's criteria totals are standardized over the performers
+                  that judge scored and then averaged with the judge weights, so
+                  strict and lenient judges count the same
+
+Criteria totals apply per-criterion weights (1 each by default). Ties in the total
+are broken by the summed raw scores of the given criteria, then by performer id.
+"""
+import numpy as np
+
+from leaderboard import CRITERIA
+
+METHODS = ('weighted', 'trimmed_mean', 'zscore')
+
+
+class ScoreArrays:
+    """
+    An event's scores in array form. Rows are performers and columns judges, both
+    in ascending id order; scores[p, j, c] is criterion c, or NaN if not scored.
+    """
+
+    def __init__(self, performer_ids, performer_names, judge_ids, judge_names, weights, scores):
+        self.performer_ids = performer_ids
+        self.performer_names = performer_names
+        self.judge_ids = judge_ids
+        self.judge_names = judge_names
+        self.weights = weights
+        self.scores = scores
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Build from rows shaped like the /final-scores query (one per score).
+        """
+        rows = list(rows)
+
+        def column(key, dtype):
+            return np.fromiter((row[key] for row in rows), dtype=dtype, count=len(rows))
+
+        performer_ids, performer_first, performer_index = np.unique(
+            column('performer_id', np.int64), return_index=True, return_inverse=True
+        )
+        judge_ids, judge_first, judge_index = np.unique(
+            column('judge_id', np.int64), return_index=True, return_inverse=True
+        )
+        performer_names = [rows[i]['performer_name'] for i in performer_first]
+        judge_names = [rows[i]['judge_name'] for i in judge_first]
+        weights = column('weight', float)[judge_first]
+
+        scores = np.full((len(performer_ids), len(judge_ids), len(CRITERIA)), np.nan)
+        for c, criterion in enumerate(CRITERIA):
+            scores[performer_index, judge_index, c] = column(criterion, float)
+        return cls(performer_ids, performer_names, judge_ids, judge_names, weights, scores)
+
+    def judge_totals(self, criterion_weights=None):
+        """
+        performers x judges criteria totals, NaN where not scored.
+        """
+        if criterion_weights is None:
+            return self.scores.sum(axis=2)
+        return (self.scores * criterion_weights).sum(axis=2)
+
+    def entries(self, order, totals):
+        """
+        Ranked entries in the /final-scores response shape, with the given totals.
+        """
+        entries = []
+        for p in order:
+            judge_scores = []
+            for j in np.flatnonzero(~np.isnan(self.scores[p, :, 0])):
+                values = [int(value) for value in self.scores[p, j]]
+                weight = float(self.weights[j])
+                judge_scores.append({
+                    'judge_id': int(self.judge_ids[j]),
+                    'judge_name': self.judge_names[j],
+                    **dict(zip(CRITERIA, values)),
+                    'weight': weight,
+                    'weighted_score': sum(values) * weight
+                })
+            entries.append({
+                'performer_name': self.performer_names[p],
+                'total_score': float(totals[p]),
+                'judge_scores': judge_scores
+            })
+        return entries
+
+
+def weighted(arrays, criterion_weights=None):
+    weighted_totals = arrays.judge_totals(criterion_weights) * arrays.weights
+    totals = np.zeros(len(arrays.performer_ids))
+    # Accumulate judge by judge in judge_id order, like the leaderboard, so the
+    # floating point totals are identical (adding 0.0 for a missing score is exact)
+    for column in range(len(arrays.judge_ids)):
+        totals += np.nan_to_num(weighted_totals[:, column])
+    return totals
+
+
+def trimmed_mean(arrays, criterion_weights=None):
+    judge_totals = arrays.judge_totals(criterion_weights)
+    counts = (~np.isnan(judge_totals)).sum(axis=1)
+    sums = np.nansum(judge_totals, axis=1)
+    trimmed = sums - np.nanmax(judge_totals, axis=1) - np.nanmin(judge_totals, axis=1)
+    return np.where(counts >= 3, trimmed / np.maximum(counts - 2, 1), sums / np.maximum(counts, 1))
+
+
+def zscore(arrays, criterion_weights=None):
+    judge_totals = arrays.judge_totals(criterion_weights)
+    scored = ~np.isnan(judge_totals)
+    means = np.nanmean(judge_totals, axis=0)
+    deviations = np.nanstd(judge_totals, axis=0)
+    # A judge who gave everyone the same total carries no ranking information
+    normalized = np.where(deviations > 0, (judge_totals - means) / np.where(deviations > 0, deviations, 1), 0.0)
+    judge_weights = np.where(scored, arrays.weights, 0.0)
+    weight_sums = judge_weights.sum(axis=1)
+    return np.where(
+        weight_sums > 0,
+        np.where(scored, normalized, 0.0).dot(arrays.weights) / np.where(weight_sums > 0, weight_sums, 1),
+        0.0
+    )
+
+
+_AGGREGATIONS = {'weighted': weighted, 'trimmed_mean': trimmed_mean, 'zscore': zscore}
+
+
+def rank(arrays, method='weighted', criterion_weights=None, tiebreak=()):
+    """
+    Return (order, totals): performer row indices in rank order (highest total first)
+    and the total of every performer under `method`. criterion_weights maps criterion
+    names to weights (missing ones count 1); tiebreak lists criteria whose summed raw
+    scores, highest first, decide between equal totals before the performer id does.
+    """
+    if not len(arrays.performer_ids):
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+    weights_array = None
+    if criterion_weights:
+        weights_array = np.array([float(criterion_weights.get(criterion, 1)) for criterion in CRITERIA])
+    totals = _AGGREGATIONS[method](arrays, weights_array)
+
+    # np.lexsort sorts by the last key first
+    keys = [arrays.performer_ids]
+    for criterion in reversed(tiebreak):
+        keys.append(-np.nansum(arrays.scores[:, :, CRITERIA.index(criterion)], axis=1))
+    keys.append(-totals)
+    return np.lexsort(keys), totals
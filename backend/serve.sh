@@ -0,0 +1,18 @@
+#!/bin/sh
+# Container entry point. SERVER_MODE selects how the backend is served:
+#   production  (default) gunicorn with the settings in gunicorn.conf.py
+#   development           Flask's built-in server (python main.py)
+set -e
+
+case "${SERVER_MODE:-production}" in
+    production)
+        exec gunicorn -c gunicorn.conf.py wsgi:app
+        ;;
+    development)
+        exec python main.py
+        ;;
+    *)
+        echo "Unknown SERVER_MODE '${SERVER_MODE}', expected 'production' or 'development'" >&2
+        exit 1
+        ;;
+esac
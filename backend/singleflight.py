@@ -0,0 +1,91 @@
+import threading
+
+
+class FlightTimeout(TimeoutError):
+    """
+    A waiter gave up on the in-flight call it was sharing.
+    """
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it is in
+    flight wait for it and receive the same result, or the same exception. A waiter
+    gives up after `timeout` seconds with FlightTimeout (a TimeoutError) instead of piling onto a
+    stalled call. Nothing is remembered once the call completes: caching is up to
+    the caller.
+    """
+
+    def __init__(self, timeout=5.0):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._executions = 0
+        self._shared = 0
+        self._timeouts = 0
+        self._errors = 0
+
+    def do(self, key, function, timeout=None):
+        """
+        Return (result, shared): the result of function() for this key, and whether
+        it came from another caller's execution.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executions += 1
+            else:
+                call.waiters += 1
+
+        if not leader:
+            if not call.done.wait(self.timeout if timeout is None else timeout):
+                with self._lock:
+                    self._timeouts += 1
+                raise FlightTimeout(f'Timed out waiting for the in-flight call for {key!r}')
+            with self._lock:
+                self._shared += 1
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = function()
+        except BaseException as err:
+            call.error = err
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def reset_after_fork(self):
+        # Calls in flight belong to the parent's threads
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executions': self._executions,
+                'shared': self._shared,
+                'timeouts': self._timeouts,
+                'errors': self._errors,
+            }
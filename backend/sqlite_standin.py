@@ -0,0 +1,286 @@
+"""
+SQLite stand-in for the MySQL database, used by the benchmark harness.
+
+It accepts the MySQL-flavoured SQL issued by main.py (%s placeholders, NOW()),
+mimics the parts of the mysql.connector connection/cursor API the backend uses,
+raises mysql.connector errors so the handlers' error paths behave the same, and
+counts executed statements per thread so callers can attribute queries to requests,
+and counts commits across all connections.
+"""
+import itertools
+import random
+import re
+import sqlite3
+import threading
+
+import mysql.connector
+
+_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS performer (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS judge (
+        judge_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL UNIQUE,
+        password TEXT NOT NULL,
+        weight REAL NOT NULL DEFAULT 1
+    );
+    CREATE TABLE IF NOT EXISTS event (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started_at TEXT,
+        ended_at TEXT
+    );
+    CREATE TABLE IF NOT EXISTS scores (
+        score_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id INTEGER NOT NULL,
+        judge_id INTEGER NOT NULL REFERENCES judge(judge_id),
+        performer_id INTEGER NOT NULL REFERENCES performer(id),
+        presentation INTEGER NOT NULL,
+        stage_presence INTEGER NOT NULL,
+        choreography INTEGER NOT NULL,
+        timing INTEGER NOT NULL,
+        performance INTEGER NOT NULL,
+        CONSTRAINT uq_scores_event_judge_performer UNIQUE (event_id, judge_id, performer_id)
+    );
+    CREATE TABLE IF NOT EXISTS scores_archive (
+        score_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id INTEGER NOT NULL,
+        judge_id INTEGER NOT NULL REFERENCES judge(judge_id),
+        performer_id INTEGER NOT NULL REFERENCES performer(id),
+        presentation INTEGER NOT NULL,
+        stage_presence INTEGER NOT NULL,
+        choreography INTEGER NOT NULL,
+        timing INTEGER NOT NULL,
+        performance INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS event_status (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id INTEGER NOT NULL,
+        has_started INTEGER NOT NULL,
+        event_datetime TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_event_status_event ON event_status (event_id, event_datetime);
+    CREATE TABLE IF NOT EXISTS current_performer (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        event_id INTEGER NOT NULL,
+        performer_id INTEGER NOT NULL REFERENCES performer(id),
+        entry_timestamp TEXT NOT NULL DEFAULT ({_NOW_SQL})
+    );
+    CREATE INDEX IF NOT EXISTS idx_current_performer_event ON current_performer (event_id, entry_timestamp);
+    CREATE TABLE IF NOT EXISTS live_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        event_id INTEGER NOT NULL,
+        has_started INTEGER NOT NULL DEFAULT 0,
+        current_performer_id INTEGER,
+        version INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT
+    );
+"""
+
+_local = threading.local()
+_commits_lock = threading.Lock()
+_commits = 0
+
+
+def query_count():
+    """
+    Number of statements executed by the calling thread so far.
+    """
+    return getattr(_local, 'queries', 0)
+
+
+def _count_query():
+    _local.queries = query_count() + 1
+
+
+def commit_count():
+    """
+    Number of commits on all connections so far, explicit or autocommitted.
+    """
+    return _commits
+
+
+def _count_commit():
+    global _commits
+    with _commits_lock:
+        _commits += 1
+
+
+def _translate(sql):
+    sql = sql.replace('%s', '?')
+    # SQLite locks the whole database for a write transaction; row locks are implicit
+    sql = re.sub(r'\bFOR UPDATE\b', '', sql)
+    return re.sub(r'\bNOW\(\)', _NOW_SQL, sql)
+
+
+def _translate_error(err):
+    message = str(err)
+    if isinstance(err, sqlite3.IntegrityError):
+        errno = 1062 if 'UNIQUE' in message else 1452
+        return mysql.connector.errors.IntegrityError(msg=message, errno=errno)
+    if isinstance(err, sqlite3.OperationalError):
+        return mysql.connector.errors.DatabaseError(msg=message)
+    return mysql.connector.errors.Error(msg=message)
+
+
+class StandinCursor:
+    def __init__(self, conn, dictionary=False, prepared=False):
+        self._conn = conn
+        self._cursor = conn._db.cursor()
+        self._dictionary = dictionary
+        self._prepared = prepared
+        self._buffered = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __iter__(self):
+        row = self.fetchone()
+        while row is not None:
+            yield row
+            row = self.fetchone()
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return {d[0]: value for d, value in zip(self._cursor.description, row)}
+
+    def _autocommitted(self, sql, statements):
+        # A write outside an explicit transaction commits on its own
+        if not self._conn._db.in_transaction and not sql.lstrip().upper().startswith('SELECT'):
+            for _ in range(statements):
+                _count_commit()
+
+    def execute(self, sql, params=None):
+        _count_query()
+        if self._prepared and params is None and '%s' in sql:
+            # Like a prepared mysql.connector cursor: no parameters only prepares
+            return
+        self._buffered = None
+        try:
+            self._cursor.execute(_translate(sql), tuple(params or ()))
+            if self._prepared and self._cursor.description:
+                # Prepared cursors are kept open across checkouts; a pending sqlite
+                # statement would hold its read lock meanwhile
+                self._buffered = iter(self._cursor.fetchall())
+        except sqlite3.Error as err:
+            raise _translate_error(err) from err
+        self._autocommitted(sql, 1)
+
+    def executemany(self, sql, seq_params):
+        _count_query()
+        seq_params = [tuple(p) for p in seq_params]
+        self._buffered = None
+        try:
+            self._cursor.executemany(_translate(sql), seq_params)
+        except sqlite3.Error as err:
+            raise _translate_error(err) from err
+        self._autocommitted(sql, len(seq_params))
+
+    def fetchone(self):
+        if self._buffered is not None:
+            return self._row(next(self._buffered, None))
+        return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size=1):
+        if self._buffered is not None:
+            return [self._row(row) for row in itertools.islice(self._buffered, size)]
+        return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        if self._buffered is not None:
+            return [self._row(row) for row in self._buffered]
+        return [self._row(row) for row in self._cursor.fetchall()]
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class StandinConnection:
+    def __init__(self, path, autocommit=False):
+        # Autocommit at the sqlite level; transactions are opened explicitly
+        # by start_transaction() or implicitly by the first write, like InnoDB.
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA foreign_keys=ON')
+        self.autocommit = autocommit
+
+    @property
+    def in_transaction(self):
+        return self._db.in_transaction
+
+    def cursor(self, dictionary=False, prepared=False, **kwargs):
+        if not self.autocommit and not self._db.in_transaction:
+            self._db.execute('BEGIN')
+        return StandinCursor(self, dictionary=dictionary, prepared=prepared)
+
+    def start_transaction(self):
+        if not self._db.in_transaction:
+            self._db.execute('BEGIN')
+
+    def commit(self):
+        _count_query()
+        if self._db.in_transaction:
+            self._db.execute('COMMIT')
+            _count_commit()
+
+    def rollback(self):
+        if self._db.in_transaction:
+            self._db.execute('ROLLBACK')
+
+    def ping(self, reconnect=False, **kwargs):
+        self._db.execute('SELECT 1')
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        self._db.close()
+
+
+def connect(path, autocommit=False):
+    return StandinConnection(path, autocommit=autocommit)
+
+
+def create_database(path, performers=20, judges=5, seed=0):
+    """
+    Create the schema at path and seed it with a deterministic roster.
+    """
+    rng = random.Random(seed)
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    # Like migrations 002 and 003, there is always an event to record scores against
+    db.execute("INSERT INTO event (id) VALUES (1)")
+    db.execute("INSERT INTO live_state (id, event_id) VALUES (1, 1)")
+    db.executemany(
+        "INSERT INTO performer (id, name) VALUES (?, ?)",
+        [(i, f"Performer {i}") for i in range(1, performers + 1)]
+    )
+    db.executemany(
+        "INSERT INTO judge (judge_id, name, email, password, weight) VALUES (?, ?, ?, ?, ?)",
+        [
+            (i, f"Judge {i}", f"judge{i}@sjsu.edu", f"password{i}", rng.choice([0.5, 1.0, 1.5, 2.0]))
+            for i in range(1, judges + 1)
+        ]
+    )
+    db.commit()
+    db.close()
@@ -0,0 +1,39 @@
+"""
+Incremental JSON responses for result sets that grow with the size of an event.
+
+The response is written as a generator of JSON fragments, one chunk of rows at a
+time, so neither the full row list nor the full response body is ever held in memory.
+"""
+
+
+def json_object_stream(dumps, items_key, chunks, trailer=None):
+    """
+    Yield the JSON object {items_key: [rows...], **trailer()} piece by piece.
+
+    chunks yields lists of rows. trailer, if given, is called after the last chunk
+    and returns the remaining top-level fields, so it can depend on what was
+    streamed (e.g. the cursor for the next page).
+    """
+    yield '{' + dumps(items_key) + ': ['
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        body = ', '.join(dumps(row) for row in chunk)
+        yield body if first else ', ' + body
+        first = False
+    yield ']'
+    for key, value in (trailer() if trailer else {}).items():
+        yield ', ' + dumps(key) + ': ' + dumps(value)
+    yield '}'
+
+
+def cursor_chunks(cursor, size):
+    """
+    Read a server-side (unbuffered) cursor in chunks of at most `size` rows.
+    """
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield rows
@@ -0,0 +1,120 @@
+"""
+Shared fixtures: the backend runs in-process against a fresh SQLite stand-in
+database per test (see sqlite_standin.py), like the benchmark does.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('JUDGE_TOKEN_SECRET', 'test-secret')
+
+import pytest
+
+import sqlite_standin
+from leaderboard import CRITERIA
+
+# A valid set of criteria for score submissions
+SCORES = {'presentation': 3, 'stage_presence': 4, 'choreography': 5, 'timing': 2, 'performance': 1}
+
+
+@pytest.fixture
+def database(tmp_path):
+    """
+    Path of a new database with 4 performers and 3 judges in event 1.
+    """
+    path = str(tmp_path / 'scoreboard.db')
+    sqlite_standin.create_database(path, performers=4, judges=3)
+    return path
+
+
+def standin_pool(backend, path, size=4):
+    return backend.create_db_pool(
+        lambda: sqlite_standin.connect(path, autocommit=True),
+        size=size,
+        ping=lambda conn: conn.ping()
+    )
+
+
+@pytest.fixture
+def backend(database, monkeypatch):
+    """
+    The main module with fresh process state and its pool pointed at `database`.
+    Audit compaction, which runs in a background thread after an event starts, is
+    stubbed out so it cannot outlive the test.
+    """
+    import main
+    monkeypatch.setattr(main, 'compact_history', lambda: None)
+    main.reset_process_state()
+    main.db_pool = standin_pool(main, database)
+    yield main
+    main.db_pool.close_all()
+
+
+@pytest.fixture
+def client(backend):
+    return backend.app.test_client()
+
+
+@pytest.fixture
+def judge_headers(backend):
+    """
+    judge_headers(judge_id): the Authorization header a logged-in judge sends.
+    """
+    def headers(judge_id):
+        token = backend.judge_tokens.issue({'judge_id': judge_id, 'weight': 1.0})
+        return {'Authorization': f'Bearer {token}'}
+    return headers
+
+
+def original_final_scores(rows):
+    """
+    The /final-scores computation the leaderboard replaced: a loop over all score rows
+    ordered by performer and judge id, then a stable sort by total.
+    """
+    performers = {}
+    for row in sorted(rows, key=lambda row: (row['performer_id'], row['judge_id'])):
+        performer_id = row['performer_id']
+        if performer_id not in performers:
+            performers[performer_id] = {
+                'performer_name': row['performer_name'],
+                'total_score': 0,
+                'judge_scores': []
+            }
+        score_sum = (
+            row['presentation'] +
+            row['stage_presence'] +
+            row['choreography'] +
+            row['timing'] +
+            row['performance']
+        )
+        weighted_score = score_sum * row['weight']
+        performers[performer_id]['total_score'] += weighted_score
+        performers[performer_id]['judge_scores'].append({
+            'judge_id': row['judge_id'],
+            'judge_name': row['judge_name'],
+            'presentation': row['presentation'],
+            'stage_presence': row['stage_presence'],
+            'choreography': row['choreography'],
+            'timing': row['timing'],
+            'performance': row['performance'],
+            'weight': row['weight'],
+            'weighted_score': weighted_score
+        })
+    return sorted(performers.values(), key=lambda x: x['total_score'], reverse=True)
+
+
+def random_rows(rng, performers, judges, weights, low=1, high=5, skip=0.2):
+    judge_weights = {judge_id: rng.choice(weights) for judge_id in range(1, judges + 1)}
+    return [
+        {
+            'performer_id': performer_id,
+            'performer_name': f'Performer {performer_id}',
+            'judge_id': judge_id,
+            'judge_name': f'Judge {judge_id}',
+            **{criterion: rng.randint(low, high) for criterion in CRITERIA},
+            'weight': judge_weights[judge_id],
+        }
+        for performer_id in range(1, performers + 1)
+        for judge_id in range(1, judges + 1)
+        if rng.random() >= skip
+    ]
@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+import auth
+from auth import JudgeTokens, hash_password
+from conftest import SCORES
+
+
+def stored_password(database, judge_id):
+    with sqlite3.connect(database) as db:
+        return db.execute('SELECT password FROM judge WHERE judge_id = ?', (judge_id,)).fetchone()[0]
+
+
+def login(client, email, password):
+    return client.post('/judge/login', json={'email': email, 'password': password})
+
+
+def test_login_with_hashed_password(client, database):
+    with sqlite3.connect(database) as db:
+        db.execute('UPDATE judge SET password = ? WHERE judge_id = 1', (hash_password('secret'),))
+    response = login(client, 'judge1@sjsu.edu', 'secret')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['judge']['judge_id'] == 1 and 'password' not in body['judge']
+    assert login(client, 'judge1@sjsu.edu', 'wrong').status_code == 401
+
+
+def test_legacy_plaintext_password_is_rehashed(backend, client, database):
+    assert stored_password(database, 2) == 'password2'
+    assert login(client, 'judge2@sjsu.edu', 'password2').status_code == 200
+    assert auth.is_password_hash(stored_password(database, 2))
+    assert login(client, 'judge2@sjsu.edu', 'password2').status_code == 200
+    assert login(client, 'judge2@sjsu.edu', 'password1').status_code == 401
+    assert backend.db_pool.stats()['in_use'] == 0
+
+
+def test_unknown_email_checks_a_dummy_hash(client, monkeypatch):
+    checked = []
+    original = auth.check_password_hash
+
+    def check_password_hash(stored, password):
+        checked.append(password)
+        return original(stored, password)
+    monkeypatch.setattr(auth, 'check_password_hash', check_password_hash)
+    assert login(client, 'nobody@sjsu.edu', 'guess').status_code == 401
+    assert checked == ['guess']
+
+
+def test_password_is_checked_without_holding_a_connection(backend, client, monkeypatch):
+    in_use = []
+    original = auth.check_password
+
+    def check_password(stored, password):
+        in_use.append(backend.db_pool.stats()['in_use'])
+        return original(stored, password)
+    monkeypatch.setattr(backend, 'check_password', check_password)
+    assert login(client, 'judge1@sjsu.edu', 'password1').status_code == 200
+    assert in_use == [0]
+
+
+@pytest.mark.parametrize('body', [
+    {'email': 'judge1@sjsu.edu', 'password': 123},
+    {'email': ['judge1@sjsu.edu'], 'password': 'password1'},
+    {'email': 'judge1@sjsu.edu'},
+    ['judge1@sjsu.edu', 'password1'],
+])
+def test_malformed_login_is_rejected(client, body):
+    assert client.post('/judge/login', json=body).status_code == 400
+
+
+def test_judge_endpoints_need_a_valid_token(backend, client, judge_headers):
+    client.post('/change-event')
+    client.post('/set-current-performer', json={'performer_id': 1}, headers=judge_headers(1))
+    assert client.get('/canVote/1').status_code == 401
+    assert client.get('/canVote/1', headers={'Authorization': 'Bearer not-a-token'}).status_code == 401
+    forged = JudgeTokens('another-secret').issue({'judge_id': 1, 'weight': 1.0})
+    assert client.get('/canVote/1', headers={'Authorization': f'Bearer {forged}'}).status_code == 401
+    token = judge_headers(1)['Authorization'].split()[1]
+    assert client.get('/canVote/1', headers={'Authorization': f'Basic {token}'}).status_code == 401
+    assert client.get('/canVote/1', headers=judge_headers(1)).status_code == 200
+
+
+def test_expired_token_is_rejected(backend, client, monkeypatch):
+    token = backend.judge_tokens.issue({'judge_id': 1, 'weight': 1.0})
+    monkeypatch.setattr(backend.judge_tokens, 'max_age', -1)
+    assert client.get('/canVote/1', headers={'Authorization': f'Bearer {token}'}).status_code == 401
+
+
+def test_judges_act_only_for_themselves(client, judge_headers):
+    client.post('/change-event')
+    client.post('/set-current-performer', json={'performer_id': 1}, headers=judge_headers(1))
+    assert client.get('/canVote/2', headers=judge_headers(1)).status_code == 403
+    body = {'judge_id': 2, 'performer_id': 1, 'scores': SCORES}
+    assert client.post('/scores', json=body, headers=judge_headers(1)).status_code == 403
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from broadcaster import Broadcaster
+
+
+def frames(broadcaster, subscription, count):
+    stream = broadcaster.stream(subscription)
+    assert next(stream) == "retry: 3000\n\n"
+    return [next(stream) for _ in range(count)]
+
+
+def parse(frame):
+    fields = dict(line.split(': ', 1) for line in frame.strip().split('\n'))
+    return fields.get('id'), fields['event'], json.loads(fields['data'])
+
+
+def test_published_events_reach_every_subscriber():
+    broadcaster = Broadcaster()
+    first, second = broadcaster.subscribe(), broadcaster.subscribe()
+    broadcaster.publish('score', {'performer_id': 1})
+    for subscription in (first, second):
+        assert [parse(frame) for frame in frames(broadcaster, subscription, 1)] == [
+            (f'{broadcaster.epoch}-1', 'score', {'performer_id': 1})
+        ]
+
+
+def test_reconnect_replays_missed_events():
+    broadcaster = Broadcaster()
+    for performer_id in (1, 2, 3):
+        broadcaster.publish('score', {'performer_id': performer_id})
+    subscription = broadcaster.subscribe(last_event_id=f'{broadcaster.epoch}-1')
+    assert [parse(frame)[0] for frame in frames(broadcaster, subscription, 2)] == [
+        f'{broadcaster.epoch}-2', f'{broadcaster.epoch}-3'
+    ]
+
+
+@pytest.mark.parametrize('last_event_id', ['{epoch}-50', 'other-1', '1', 'garbage'])
+def test_unknown_last_event_id_gets_resync(last_event_id):
+    broadcaster = Broadcaster()
+    broadcaster.publish('score', {})
+    broadcaster.publish('score', {})
+    subscription = broadcaster.subscribe(last_event_id=last_event_id.format(epoch=broadcaster.epoch))
+    assert parse(frames(broadcaster, subscription, 1)[0])[1] == 'resync'
+
+
+def test_event_ids_from_another_process_get_resync():
+    # Each process numbers its own events: the same count means different events
+    first, second = Broadcaster(), Broadcaster()
+    for broadcaster in (first, second):
+        broadcaster.publish('score', {})
+    first.publish('score', {})
+    subscription = first.subscribe(last_event_id=f'{second.epoch}-1')
+    assert parse(frames(first, subscription, 1)[0])[1] == 'resync'
+
+
+def test_slow_client_gets_resync_instead_of_blocking():
+    broadcaster = Broadcaster(max_queue=2)
+    subscription = broadcaster.subscribe()
+    for _ in range(5):
+        broadcaster.publish('score', {})
+    assert parse(frames(broadcaster, subscription, 1)[0])[1] == 'resync'
+    assert broadcaster.stats()['dropped'] == 3
+
+
+def test_client_limit():
+    broadcaster = Broadcaster(max_clients=1)
+    assert broadcaster.subscribe() is not None
+    assert broadcaster.subscribe() is None
+
+
+def test_close_ends_streams():
+    broadcaster = Broadcaster()
+    subscription = broadcaster.subscribe()
+    stream = broadcaster.stream(subscription)
+    next(stream)
+    broadcaster.close()
+    assert list(stream) == []
+    assert broadcaster.stats()['clients'] == 0
+
+
+def test_event_status_change_is_streamed(backend, client):
+    response = client.get('/stream', buffered=False)
+    chunks = iter(response.response)
+    assert next(chunks) == b"retry: 3000\n\n"
+    client.post('/change-event')
+    _, event, data = parse(next(chunks).decode())
+    response.close()
+    assert event == 'event_status'
+    assert data['is_ongoing'] is True
+
+
+def test_stream_refuses_clients_over_the_limit(backend, client, monkeypatch):
+    monkeypatch.setattr(backend.broadcaster, 'max_clients', 0)
+    response = client.get('/stream')
+    assert response.status_code == 503
+
+
+def test_closed_stream_responses_unsubscribe(backend, client, monkeypatch):
+    monkeypatch.setattr(backend.broadcaster, 'max_clients', 2)
+    for _ in range(3):
+        client.head('/stream').close()
+    assert backend.broadcaster.stats()['clients'] == 0
+
+    live = client.get('/stream', buffered=False)
+    assert next(live.response).startswith(b'retry:')
+    assert backend.broadcaster.stats()['clients'] == 1
+    live.close()
+    assert backend.broadcaster.stats()['clients'] == 0
+    assert client.head('/stream').status_code == 200
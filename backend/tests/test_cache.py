@@ -0,0 +1,103 @@
+import pytest
+
+import cache as cache_module
+import sqlite_standin
+from cache import TTLCache
+from conftest import SCORES
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = TTLCache(ttl=30)
+    loads = []
+    assert cache.get_or_load('roster', lambda: loads.append(1) or len(loads)) == 1
+    clock[0] += 29
+    assert cache.get_or_load('roster', lambda: loads.append(1) or len(loads)) == 1
+    clock[0] += 2
+    assert cache.get('roster') is None
+    assert cache.get_or_load('roster', lambda: loads.append(1) or len(loads)) == 2
+    cache.put('short', 'x', ttl=1)
+    clock[0] += 2
+    assert cache.get('short', 'gone') == 'gone'
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.stats()['entries'] == 2
+
+
+def test_hits_misses_and_invalidations_are_counted():
+    cache = TTLCache()
+    cache.get_or_load('a', lambda: 1)
+    cache.get_or_load('a', lambda: 2)
+    cache.invalidate('a')
+    assert cache.get_or_load('a', lambda: 3) == 3
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['invalidations']) == (1, 2, 1)
+    assert stats['hit_ratio'] == round(1 / 3, 4)
+
+
+def test_load_overtaken_by_a_write_is_not_cached():
+    cache = TTLCache()
+
+    def load_then_write():
+        cache.invalidate('a')
+        return 'before the write'
+    assert cache.get_or_load('a', load_then_write) == 'before the write'
+    assert cache.get('a') is None
+
+
+def test_reads_are_cached_until_a_write(backend, client):
+    assert client.get('/event-status').get_json()['is_ongoing'] is False
+    client.get('/performers')
+    backend.response_cache.clear()
+    queries = sqlite_standin.query_count()
+    assert client.get('/event-status').get_json()['is_ongoing'] is False
+    assert client.get('/performers').status_code == 200
+    assert sqlite_standin.query_count() == queries
+    assert client.get('/cache-stats').get_json()['hits'] >= 2
+
+    client.post('/change-event')
+    assert client.get('/event-status').get_json()['is_ongoing'] is True
+
+
+def test_versioned_key_keeps_one_slot():
+    cache = TTLCache()
+    cache.put('arrays', 'v1', version=1)
+    assert cache.get('arrays', version=1) == 'v1'
+    assert cache.get('arrays', version=2) is None
+    assert cache.get_or_load('arrays', lambda: 'v2', version=2) == 'v2'
+    assert cache.get('arrays', version=1) is None
+    assert cache.stats()['entries'] == 1
+
+
+def test_older_version_does_not_replace_a_newer_one():
+    cache = TTLCache()
+    cache.put('arrays', 'v2', version=2)
+    cache.put('arrays', 'v1', version=1)
+    assert cache.get('arrays', version=2) == 'v2'
+
+
+def test_superseded_versions_are_not_kept(backend, client, judge_headers):
+    client.post('/change-event')
+    client.post('/set-current-performer', json={'performer_id': 1}, headers=judge_headers(1))
+    sizes = []
+    for judge_id in (1, 2, 3):
+        body = {'judge_id': judge_id, 'performer_id': 1, 'scores': SCORES}
+        assert client.post('/scores', json=body, headers=judge_headers(judge_id)).status_code == 201
+        for path in ('/final-scores?method=zscore', '/current-scores', '/final-scores'):
+            assert client.get(path, headers={'Accept-Encoding': 'gzip'}).status_code == 200
+        sizes.append((backend.cache.stats()['entries'], backend.response_cache.stats()['entries']))
+    assert sizes[0] == sizes[1] == sizes[2]
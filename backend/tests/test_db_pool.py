@@ -0,0 +1,244 @@
+import sqlite3
+
+import mysql.connector
+import pytest
+
+import db_pool
+from db_pool import ConnectionPool
+
+
+class FakeCursor:
+    def __init__(self, conn, prepared=False):
+        self.conn = conn
+        self.prepared = prepared
+        self.executed = []
+        self.closed = False
+
+    def execute(self, operation, *args):
+        if self.conn.fail_with is not None:
+            raise self.conn.fail_with
+        self.executed.append(operation)
+        if operation.startswith('SELECT'):
+            self.conn.unread_result = True
+        else:
+            self.conn.in_transaction = True
+
+    def fetchall(self):
+        self.conn.unread_result = False
+        return []
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self):
+        self.in_transaction = False
+        self.unread_result = False
+        self.rolled_back = False
+        self.closed = False
+        self.fail_with = None
+        self.cursors = []
+
+    def cursor(self, *args, prepared=False, **kwargs):
+        self.cursors.append(FakeCursor(self, prepared))
+        return self.cursors[-1]
+
+    def rollback(self):
+        self.in_transaction = False
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(db_pool.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def fake_pool(**options):
+    created = []
+
+    def factory():
+        created.append(FakeConnection())
+        return created[-1]
+    return ConnectionPool(factory, **options), created
+
+
+def test_checkout_times_out_when_exhausted():
+    pool, _ = fake_pool(size=1, timeout=0.01)
+    held = pool.connection()
+    with pytest.raises(mysql.connector.errors.PoolError):
+        pool.connection()
+    assert pool.stats()['timeouts'] == 1
+    held.close()
+    pool.connection().close()
+
+
+def test_idle_connections_are_evicted(clock):
+    pool, created = fake_pool(max_idle=60)
+    pool.connection().close()
+    clock[0] += 61
+    pool.connection().close()
+    assert len(created) == 2 and created[0].closed
+    assert pool.stats()['discarded'] == 1
+
+
+def test_unhealthy_connection_is_replaced_after_ping(clock):
+    pings = []
+
+    def ping(raw):
+        pings.append(raw)
+        if raw.fail_with is not None:
+            raise raw.fail_with
+
+    pool, created = fake_pool(ping_after=30, ping=ping)
+    pool.connection().close()
+    clock[0] += 10
+    pool.connection().close()
+    assert pings == []
+
+    clock[0] += 31
+    created[0].fail_with = mysql.connector.errors.InterfaceError(msg='gone away')
+    conn = pool.connection()
+    assert pings == [created[0]] and created[0].closed
+    assert conn._raw is created[1]
+    conn.close()
+
+
+def test_broken_connection_is_discarded():
+    pool, created = fake_pool()
+    conn = pool.connection()
+    created[0].fail_with = mysql.connector.errors.OperationalError(msg='lost connection')
+    with pytest.raises(mysql.connector.errors.OperationalError):
+        conn.cursor().execute('SELECT 1')
+    conn.close()
+    assert created[0].closed
+    assert pool.stats()['open'] == 0
+    assert pool.connection()._raw is created[1]
+
+
+def test_open_transaction_is_rolled_back_on_release():
+    pool, created = fake_pool()
+    conn = pool.connection()
+    conn.cursor().execute('UPDATE x SET y = 1')
+    conn.close()
+    assert created[0].rolled_back and not created[0].in_transaction
+
+
+def test_closed_wrapper_cannot_reach_the_pooled_connection():
+    pool, created = fake_pool(size=1)
+    conn = pool.connection()
+    conn.close()
+    other = pool.connection()
+    other.cursor().execute('UPDATE x SET y = 1')
+    with pytest.raises(mysql.connector.errors.ProgrammingError):
+        conn.rollback()
+    with pytest.raises(mysql.connector.errors.ProgrammingError):
+        conn.cursor()
+    assert created[0].in_transaction
+    conn.close()
+    assert pool.stats()['in_use'] == 1
+
+
+def test_warm_opens_connections_one_at_a_time():
+    pool, created = fake_pool(size=3)
+    in_use = []
+    assert pool.warm(setup=lambda conn: in_use.append(pool.stats()['in_use'])) == 3
+    assert in_use == [1, 1, 1]
+    assert len(created) == 3
+    assert pool.stats()['idle'] == 3
+
+
+def test_warm_leaves_busy_connections_to_requests():
+    pool, created = fake_pool(size=2, timeout=0.01)
+    held = pool.connection()
+    assert pool.warm() == 1
+    assert pool.stats()['timeouts'] == 0
+    held.close()
+    assert pool.warm() == 0
+    assert len(created) == 2
+
+
+def prepared_queries(conn, *queries):
+    for sql in queries:
+        with conn.cursor(prepared=True) as cursor:
+            cursor.execute(sql)
+            cursor.fetchall()
+
+
+def test_prepared_statement_is_reused_across_checkouts():
+    pool, created = fake_pool(size=1)
+    for _ in range(3):
+        conn = pool.connection()
+        prepared_queries(conn, 'SELECT a')
+        conn.close()
+    assert len(created[0].cursors) == 1
+    assert created[0].cursors[0].prepared
+    assert created[0].cursors[0].executed == ['SELECT a'] * 3
+    assert pool.stats()['prepares'] == 1 and pool.stats()['prepared_statements'] == 1
+
+
+def test_least_recently_used_statement_is_closed():
+    pool, created = fake_pool(size=1, max_statements=2)
+    conn = pool.connection()
+    prepared_queries(conn, 'SELECT a', 'SELECT b', 'SELECT a', 'SELECT c')
+    a, b, c = created[0].cursors
+    assert b.closed and not a.closed and not c.closed
+    assert pool.stats()['prepared_statements'] == 2
+
+    prepared_queries(conn, 'SELECT b')
+    assert len(created[0].cursors) == 4 and a.closed
+    assert pool.stats()['prepares'] == 4
+    conn.close()
+
+
+def test_unread_rows_are_drained_before_the_next_statement():
+    pool, created = fake_pool(size=1)
+    conn = pool.connection()
+    cursor = conn.cursor(prepared=True)
+    cursor.execute('SELECT a')
+    cursor.execute('SELECT b')
+    assert created[0].unread_result
+    cursor.close()
+    assert not created[0].unread_result
+    # Leaving the cursor keeps its statements for the connection's next user
+    assert not any(raw.closed for raw in created[0].cursors)
+    conn.close()
+
+
+def test_discarded_connection_forgets_its_statements():
+    pool, created = fake_pool(size=1)
+    conn = pool.connection()
+    prepared_queries(conn, 'SELECT a')
+    conn.broken = True
+    conn.close()
+    assert pool.stats()['prepared_statements'] == 0
+    conn = pool.connection()
+    prepared_queries(conn, 'SELECT a')
+    assert created[1].cursors[0].executed == ['SELECT a']
+    conn.close()
+
+
+def test_change_event_returns_503_when_the_pool_is_exhausted(backend, client, monkeypatch):
+    monkeypatch.setattr(backend.db_pool, 'timeout', 0.01)
+    held = [backend.db_pool.connection() for _ in range(backend.db_pool.size)]
+    response = client.post('/change-event')
+    assert response.status_code == 503
+    assert 'error' in response.get_json()
+    for conn in held:
+        conn.close()
+    assert client.post('/change-event').get_json()['new_status'] is True
+
+
+def test_failed_change_event_is_rolled_back(backend, client, database):
+    with sqlite3.connect(database) as db:
+        db.execute('DROP TABLE event_status')
+    assert 'error' in client.post('/change-event').get_json()
+    with sqlite3.connect(database) as db:
+        assert db.execute('SELECT event_id, has_started FROM live_state').fetchall() == [(1, 0)]
+        assert db.execute('SELECT COUNT(*) FROM event').fetchone() == (1,)
+    assert backend.db_pool.stats()['in_use'] == 0
@@ -0,0 +1,50 @@
+import sqlite3
+
+from conftest import SCORES
+
+
+def submit(client, judge_headers, judge_id, performer_id):
+    return client.post(
+        '/scores', json={'judge_id': judge_id, 'performer_id': performer_id, 'scores': SCORES},
+        headers=judge_headers(judge_id)
+    )
+
+
+def start_event(client, judge_headers, performer_id=1):
+    assert client.post('/change-event').get_json()['new_status'] is True
+    client.post('/set-current-performer', json={'performer_id': performer_id}, headers=judge_headers(1))
+    return client.get('/event-status').get_json()['event_id']
+
+
+def stored_scores(database):
+    with sqlite3.connect(database) as db:
+        return db.execute('SELECT event_id, judge_id, performer_id FROM scores ORDER BY score_id').fetchall()
+
+
+def test_starting_an_event_allocates_a_new_id(client, judge_headers, database):
+    first = start_event(client, judge_headers)
+    client.post('/change-event')
+    second = start_event(client, judge_headers)
+    assert second > first
+    with sqlite3.connect(database) as db:
+        assert [row[0] for row in db.execute('SELECT id FROM event ORDER BY id')][-2:] == [first, second]
+
+
+def test_reads_are_scoped_to_the_active_event(client, judge_headers, database):
+    first = start_event(client, judge_headers)
+    assert submit(client, judge_headers, 1, 1).status_code == 201
+    assert submit(client, judge_headers, 2, 1).status_code == 201
+    client.post('/change-event')
+    second = start_event(client, judge_headers, performer_id=2)
+
+    assert client.get('/current-scores').get_json()['scores'] == []
+    assert client.get('/final-scores').get_json()['scores'] == []
+    assert client.get('/current-performer').get_json()['performer']['id'] == 2
+
+    # The same judge scores the same performer again in the new event
+    client.post('/set-current-performer', json={'performer_id': 1}, headers=judge_headers(1))
+    assert submit(client, judge_headers, 1, 1).status_code == 201
+    assert [row['judge_id'] for row in client.get('/current-scores').get_json()['scores']] == [1]
+
+    # Earlier events keep their rows until they are archived
+    assert stored_scores(database) == [(first, 1, 1), (first, 2, 1), (second, 1, 1)]
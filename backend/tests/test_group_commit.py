@@ -0,0 +1,98 @@
+import threading
+
+import mysql.connector
+import pytest
+
+from conftest import SCORES
+from group_commit import GroupCommitWriter
+
+
+class FakeConnection:
+    def __init__(self, written, gate=None):
+        self.written = written
+        self.gate = gate
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def start_transaction(self):
+        pass
+
+    def executemany(self, query, rows):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.written.extend(rows)
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_row_dropped_when_submitter_times_out_before_the_flush():
+    written = []
+    writer = GroupCommitWriter(lambda: FakeConnection(written), 'INSERT', window=0.3, timeout=0.05)
+    with pytest.raises(mysql.connector.errors.OperationalError):
+        writer.submit((1,))
+    writer.close()
+    assert written == []
+    assert writer.stats()['dropped_rows'] == 1
+
+
+def test_row_committed_after_the_timeout_is_reported():
+    written, late = [], []
+    committed = threading.Event()
+    gate = threading.Event()
+
+    def on_late_commit(params):
+        late.append(params)
+        committed.set()
+
+    writer = GroupCommitWriter(lambda: FakeConnection(written, gate), 'INSERT', window=0, timeout=0.05,
+                               on_late_commit=on_late_commit)
+    with pytest.raises(mysql.connector.errors.OperationalError):
+        writer.submit((1,))
+    gate.set()
+    assert committed.wait(5)
+    writer.close()
+    assert written == late == [(1,)]
+    assert writer.stats()['late_rows'] == 1
+
+
+def test_late_commit_reaches_the_leaderboard(backend, client, judge_headers, monkeypatch):
+    assert client.post('/change-event').status_code == 200
+    assert client.post('/set-current-performer', json={'performer_id': 1}, headers=judge_headers(1)).status_code == 200
+
+    gate = threading.Event()
+    committed = threading.Event()
+    original_get_connection = backend.get_db_connection
+
+    def slow_connection():
+        gate.wait(5)
+        return original_get_connection()
+
+    def record_late_score(params):
+        backend.record_late_score(params)
+        committed.set()
+
+    writer = GroupCommitWriter(slow_connection, backend.INSERT_SCORES_QUERY, window=0, timeout=0.05,
+                               on_late_commit=record_late_score)
+    monkeypatch.setattr(backend, 'score_writer', writer)
+
+    body = {'judge_id': 1, 'performer_id': 1, 'scores': SCORES}
+    assert client.post('/scores', json=body, headers=judge_headers(1)).status_code == 500
+    gate.set()
+    assert committed.wait(5)
+
+    assert backend.leaderboard.has_score(1, 1)
+    scores = client.get('/current-scores').get_json()['scores']
+    assert [(row['judge_id'], row['performer_id']) for row in scores] == [(1, 1)]
+    assert client.post('/scores', json=body, headers=judge_headers(1)).status_code == 400
+    writer.close()
@@ -0,0 +1,35 @@
+import os
+import runpy
+
+import pytest
+
+CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gunicorn.conf.py')
+
+
+def stream_limit(monkeypatch, **env):
+    monkeypatch.delenv('STREAM_MAX_CLIENTS', raising=False)
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    runpy.run_path(CONFIG)
+    return os.environ.get('STREAM_MAX_CLIENTS')
+
+
+@pytest.mark.parametrize('worker_class,threads,expected', [
+    ('gthread', '32', '16'),
+    ('gthread', '4', '2'),
+    ('sync', '8', '4'),
+    ('sync', '1', '0'),
+])
+def test_streams_leave_threads_for_regular_requests(monkeypatch, worker_class, threads, expected):
+    limit = stream_limit(monkeypatch, GUNICORN_WORKER_CLASS=worker_class, GUNICORN_THREADS=threads)
+    assert limit == expected
+
+
+def test_async_workers_keep_the_app_default(monkeypatch):
+    assert stream_limit(monkeypatch, GUNICORN_WORKER_CLASS='gevent') is None
+
+
+def test_explicit_limit_wins(monkeypatch):
+    monkeypatch.setenv('STREAM_MAX_CLIENTS', '5')
+    runpy.run_path(CONFIG)
+    assert os.environ['STREAM_MAX_CLIENTS'] == '5'
@@ -0,0 +1,147 @@
+import queue
+import socket
+import threading
+import time
+
+import pytest
+
+from invalidation import LocalChannel, LocalHub, RelayServer, SocketChannel, StalenessGuard
+
+
+def receiver(channel):
+    received = queue.Queue()
+    channel.start(lambda kind, data: received.put((kind, data)))
+    return received
+
+
+def test_local_channel_delivers_to_other_nodes_only():
+    hub = LocalHub()
+    first, second, third = LocalChannel(hub), LocalChannel(hub), LocalChannel(hub)
+    received = [receiver(channel) for channel in (first, second, third)]
+    first.publish('score', {'event_id': 1, 'scores': (1, 2)})
+    assert received[0].empty()
+    for messages in received[1:]:
+        # Delivered as JSON would carry it: tuples become lists
+        assert messages.get_nowait() == ('score', {'event_id': 1, 'scores': [1, 2]})
+    assert first.stats()['published'] == 1 and second.stats()['received'] == 1
+
+
+def test_handler_errors_do_not_stop_delivery():
+    hub = LocalHub()
+    sender, failing = LocalChannel(hub), LocalChannel(hub)
+    failing.start(lambda kind, data: 1 / 0)
+    sender.publish('resync', {})
+    assert failing.stats()['received'] == 1
+
+
+@pytest.fixture
+def relay():
+    server = RelayServer(('127.0.0.1', 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def connected_channel(relay, count):
+    channel = SocketChannel(*relay.server_address, reconnect_delay=0.05, send_timeout=0.2)
+    messages = receiver(channel)
+    wait_for(lambda: len(relay._clients) == count)
+    return channel, messages
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'condition not met'
+        time.sleep(0.01)
+
+
+def test_relay_forwards_between_socket_channels(relay):
+    first, first_messages = connected_channel(relay, 1)
+    second, second_messages = connected_channel(relay, 2)
+    try:
+        first.publish('current_performer', {'performer': {'id': 3}, 'event_id': 1})
+        assert second_messages.get(timeout=5) == ('current_performer', {'performer': {'id': 3}, 'event_id': 1})
+        assert first_messages.empty()
+    finally:
+        first.close()
+        second.close()
+
+
+def test_socket_channel_drops_while_disconnected_and_resyncs_on_reconnect(relay):
+    channel, messages = connected_channel(relay, 1)
+    try:
+        # Cut the node off: the relay closes its side of the connection
+        with relay._lock:
+            (client,) = relay._clients
+        client.shutdown(socket.SHUT_RDWR)
+        wait_for(lambda: not channel.stats()['connected'])
+        channel.publish('score', {})
+        assert channel.stats()['dropped'] == 1
+
+        assert messages.get(timeout=5) == ('resync', {})
+        assert channel.stats()['connected'] and channel.stats()['reconnects'] == 1
+    finally:
+        channel.close()
+
+
+class Watermark:
+    def __init__(self):
+        self.value = (1, 0, 0)
+        self.stale = 0
+
+    def read(self):
+        return self.value
+
+    def on_stale(self):
+        self.stale += 1
+
+
+def test_staleness_guard_accepts_a_node_that_keeps_up():
+    watermark = Watermark()
+    guard = StalenessGuard(watermark.read, watermark.on_stale, interval=0)
+    assert guard.check()
+    watermark.value = (1, 1, 2)
+    guard.live_state_changed(1)
+    guard.score_added(1)
+    guard.score_added(1)
+    assert guard.check() and guard.check()
+    assert watermark.stale == 0
+
+
+def test_staleness_guard_allows_one_interval_to_catch_up():
+    watermark = Watermark()
+    guard = StalenessGuard(watermark.read, watermark.on_stale, interval=0)
+    guard.check()
+    watermark.value = (1, 0, 1)
+    # The write is committed but its message has not arrived yet
+    assert guard.check()
+    guard.score_added(1)
+    assert guard.check()
+    assert watermark.stale == 0
+
+
+def test_staleness_guard_resyncs_a_node_that_missed_a_change():
+    watermark = Watermark()
+    guard = StalenessGuard(watermark.read, watermark.on_stale, interval=0)
+    guard.check()
+    watermark.value = (2, 1, 0)
+    guard.check()
+    assert not guard.check()
+    assert watermark.stale == 1 and guard.stats()['resyncs'] == 1
+    # Counting starts over from the watermark the node reloaded at
+    assert guard.check() and guard.check()
+    assert watermark.stale == 1
+
+
+def test_staleness_guard_follows_a_new_event():
+    watermark = Watermark()
+    guard = StalenessGuard(watermark.read, watermark.on_stale, interval=0)
+    guard.check()
+    guard.score_added(1)
+    watermark.value = (2, 1, 0)
+    guard.live_state_changed(2)
+    assert guard.check() and guard.check()
+    assert watermark.stale == 0
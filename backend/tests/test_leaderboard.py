@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from conftest import original_final_scores, random_rows
+from leaderboard import CRITERIA, Leaderboard
+
+
+# Weights like 0.1 and 0.7 make the float totals depend on summation order
+CASES = [
+    (seed, performers, judges, weights, high)
+    for seed in range(5)
+    for performers, judges, weights, high in (
+        (30, 5, [0.5, 1.0, 1.5, 2.0], 5),
+        (50, 7, [0.1, 0.3, 0.7, 1.1], 5),
+        # Few distinct totals: many ties, which must keep ascending performer id order
+        (40, 2, [1.0], 2),
+    )
+]
+
+
+@pytest.mark.parametrize('seed,performers,judges,weights,high', CASES)
+def test_rebuild_matches_original_computation(seed, performers, judges, weights, high):
+    rows = random_rows(random.Random(seed), performers, judges, weights, high=high)
+    leaderboard = Leaderboard()
+    leaderboard.ensure_loaded(lambda: sorted(rows, key=lambda row: (row['performer_id'], row['judge_id'])))
+    assert leaderboard.ranked() == original_final_scores(rows)
+
+
+@pytest.mark.parametrize('seed,performers,judges,weights,high', CASES)
+def test_incremental_inserts_in_any_order_match_original_computation(seed, performers, judges, weights, high):
+    rng = random.Random(seed)
+    rows = random_rows(rng, performers, judges, weights, high=high)
+    leaderboard = Leaderboard()
+    leaderboard.ensure_loaded(list)
+    inserted = []
+    for row in rng.sample(rows, len(rows)):
+        leaderboard.add_score(row)
+        inserted.append(row)
+        if len(inserted) % 17 == 0:
+            assert leaderboard.ranked() == original_final_scores(inserted)
+    assert leaderboard.ranked() == original_final_scores(rows)
+
+
+def test_pages_concatenate_to_the_full_ranking():
+    rows = random_rows(random.Random(7), 40, 2, [1.0], high=2)
+    leaderboard = Leaderboard()
+    leaderboard.ensure_loaded(lambda: rows)
+    entries, after = [], None
+    while True:
+        page, after = leaderboard.page(limit=7, after=after)
+        entries.extend(page)
+        if after is None:
+            break
+    assert entries == original_final_scores(rows)
+
+
+def test_add_score_before_load_is_left_to_the_load():
+    rows = random_rows(random.Random(3), 5, 3, [1.0])
+    leaderboard = Leaderboard()
+    leaderboard.add_score(rows[0])
+    leaderboard.ensure_loaded(lambda: rows)
+    assert leaderboard.ranked() == original_final_scores(rows)
+
+
+def test_final_scores_endpoint_matches_original_computation(backend, client, judge_headers):
+    rng = random.Random(11)
+    client.post('/change-event')
+    # Load the (empty) leaderboard first so every score below is applied incrementally
+    assert client.get('/final-scores').get_json()['scores'] == []
+    for performer_id in range(1, 5):
+        client.post('/set-current-performer', json={'performer_id': performer_id}, headers=judge_headers(1))
+        for judge_id in range(1, 4):
+            scores = {criterion: rng.randint(1, 5) for criterion in CRITERIA}
+            response = client.post(
+                '/scores', json={'judge_id': judge_id, 'performer_id': performer_id, 'scores': scores},
+                headers=judge_headers(judge_id)
+            )
+            assert response.status_code == 201
+    served = client.get('/final-scores').get_json()['scores']
+    assert served == original_final_scores(backend.load_final_score_rows())
+    assert len(served) == 4
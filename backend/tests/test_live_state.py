@@ -0,0 +1,98 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+
+import archive_events
+import sqlite_standin
+from conftest import SCORES
+
+
+def live_state(database):
+    with sqlite3.connect(database) as db:
+        return db.execute('SELECT id, event_id, has_started, current_performer_id, version FROM live_state').fetchall()
+
+
+def audit_rows(database):
+    with sqlite3.connect(database) as db:
+        return tuple(db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in ('event_status', 'current_performer'))
+
+
+def set_performer(client, judge_headers, performer_id):
+    response = client.post('/set-current-performer', json={'performer_id': performer_id}, headers=judge_headers(1))
+    assert response.status_code == 200
+
+
+def run_events(client, judge_headers, count):
+    """
+    Run `count` events, each with judge 1 scoring performer 1; the last one stays running.
+    """
+    for number in range(count):
+        if number:
+            client.post('/change-event')
+        client.post('/change-event')
+        set_performer(client, judge_headers, 1)
+        body = {'judge_id': 1, 'performer_id': 1, 'scores': SCORES}
+        assert client.post('/scores', json=body, headers=judge_headers(1)).status_code == 201
+    return client.get('/event-status').get_json()['event_id']
+
+
+def test_writes_update_the_single_live_state_row(client, judge_headers, database):
+    assert live_state(database) == [(1, 1, 0, None, 0)]
+    event_id = client.post('/change-event').get_json()['event_id']
+    set_performer(client, judge_headers, 2)
+    set_performer(client, judge_headers, 3)
+    assert live_state(database) == [(1, event_id, 1, 3, 3)]
+    client.post('/change-event')
+    assert live_state(database) == [(1, event_id, 0, 3, 4)]
+    assert audit_rows(database) == (2, 2)
+
+
+def test_singleton_row_cannot_be_duplicated(database):
+    with sqlite3.connect(database) as db:
+        with pytest.raises(sqlite3.IntegrityError):
+            db.execute('INSERT INTO live_state (id, event_id) VALUES (2, 1)')
+
+
+def test_reads_do_not_need_the_audit_log(backend, client, judge_headers, database, monkeypatch):
+    monkeypatch.setattr(backend, 'history_log', False)
+    client.post('/change-event')
+    set_performer(client, judge_headers, 2)
+    assert audit_rows(database) == (0, 0)
+    backend.cache.clear()
+    assert client.get('/event-status').get_json()['is_ongoing'] is True
+    assert client.get('/current-performer').get_json()['performer']['id'] == 2
+    assert client.get('/canVote/1', headers=judge_headers(1)).get_json()['canVote'] is True
+
+
+def test_past_events_are_archived(client, judge_headers, database):
+    active = run_events(client, judge_headers, 3)
+    with closing(sqlite_standin.connect(database, autocommit=True)) as conn:
+        archived = archive_events.archive_events(conn, keep=1)
+        assert [event_id for event_id, rows in archived] == [active - 2]
+        archived = archive_events.archive_events(conn)
+        assert archived == [(active - 1, 1)]
+        assert archive_events.archive_events(conn) == []
+    with sqlite3.connect(database) as db:
+        assert db.execute('SELECT event_id FROM scores').fetchall() == [(active,)]
+        assert db.execute('SELECT event_id FROM scores_archive ORDER BY event_id').fetchall() == [(active - 2,), (active - 1,)]
+    assert client.get('/current-scores').get_json()['scores'][0]['judge_id'] == 1
+
+
+def test_drop_deletes_past_scores_without_archiving(client, judge_headers, database):
+    active = run_events(client, judge_headers, 2)
+    with closing(sqlite_standin.connect(database, autocommit=True)) as conn:
+        assert archive_events.archive_events(conn, drop=True) == [(active - 1, 1)]
+    with sqlite3.connect(database) as db:
+        assert db.execute('SELECT event_id FROM scores').fetchall() == [(active,)]
+        assert db.execute('SELECT COUNT(*) FROM scores_archive').fetchone() == (0,)
+
+
+def test_compaction_keeps_the_audit_rows_of_recent_events(client, judge_headers, database):
+    active = run_events(client, judge_headers, 3)
+    with closing(sqlite_standin.connect(database, autocommit=True)) as conn:
+        # The oldest event started, ended and had one performer
+        assert archive_events.compact_history(conn, 2) == 3
+    with sqlite3.connect(database) as db:
+        assert {row[0] for row in db.execute('SELECT event_id FROM event_status')} == {active - 1, active}
+        assert {row[0] for row in db.execute('SELECT event_id FROM current_performer')} == {active - 1, active}
@@ -0,0 +1,87 @@
+import gzip
+import json
+
+import brotli
+import pytest
+
+import sqlite_standin
+import versioning
+from conftest import SCORES
+
+
+@pytest.fixture
+def scored(client, judge_headers):
+    """
+    Judges 1 and 3 have scored performer 1, judge 2 performer 2.
+    """
+    client.post('/change-event')
+    for judge_id, performer_id in ((1, 1), (3, 1), (2, 2)):
+        client.post('/set-current-performer', json={'performer_id': performer_id}, headers=judge_headers(1))
+        body = {'judge_id': judge_id, 'performer_id': performer_id, 'scores': SCORES}
+        assert client.post('/scores', json=body, headers=judge_headers(judge_id)).status_code == 201
+
+
+def test_matrix_holds_the_same_totals_as_the_rows(client, scored):
+    matrix = client.get('/current-scores?format=matrix').get_json()
+    assert matrix['performer_ids'] == [1, 2, 3, 4]
+    assert matrix['judge_ids'] == [1, 2, 3]
+    total = sum(SCORES.values())
+    assert matrix['scores'] == [[total, None, total], [None, total, None], [None] * 3, [None] * 3]
+
+    cells = {
+        (performer_id, judge_id): score
+        for performer_id, row in zip(matrix['performer_ids'], matrix['scores'])
+        for judge_id, score in zip(matrix['judge_ids'], row)
+        if score is not None
+    }
+    rows = client.get('/current-scores').get_json()['scores']
+    assert cells == {(row['performer_id'], row['judge_id']): row['total_score'] for row in rows}
+
+
+def test_unknown_format_is_rejected(client):
+    assert client.get('/current-scores?format=csv').status_code == 400
+
+
+@pytest.mark.parametrize('encoding, decompress', [('gzip', gzip.decompress), ('br', brotli.decompress)])
+def test_response_is_compressed_when_accepted(client, scored, monkeypatch, encoding, decompress):
+    monkeypatch.setattr(versioning, 'COMPRESS_MIN_BYTES', 0)
+    plain = client.get('/current-scores?format=matrix')
+    assert 'Content-Encoding' not in plain.headers
+
+    response = client.get('/current-scores?format=matrix', headers={'Accept-Encoding': encoding})
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert json.loads(decompress(response.get_data())) == plain.get_json()
+    assert response.headers['ETag'] == plain.headers['ETag'][:-1] + f'-{encoding}"'
+
+    revalidated = client.get('/current-scores?format=matrix', headers={
+        'Accept-Encoding': encoding, 'If-None-Match': response.headers['ETag']
+    })
+    assert revalidated.status_code == 304
+
+
+def test_small_responses_are_sent_uncompressed(client):
+    response = client.get('/current-scores?format=matrix', headers={'Accept-Encoding': 'gzip'})
+    assert len(response.get_data()) < versioning.COMPRESS_MIN_BYTES
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_compressed_matrix_is_cached_until_the_next_score(client, judge_headers, scored, monkeypatch):
+    monkeypatch.setattr(versioning, 'COMPRESS_MIN_BYTES', 0)
+    compressions = []
+    compress = versioning._compress
+    monkeypatch.setattr(versioning, '_compress', lambda body, encoding: compressions.append(encoding) or compress(body, encoding))
+
+    first = client.get('/current-scores?format=matrix', headers={'Accept-Encoding': 'gzip'})
+    queries = sqlite_standin.query_count()
+    second = client.get('/current-scores?format=matrix', headers={'Accept-Encoding': 'gzip'})
+    assert second.get_data() == first.get_data()
+    assert sqlite_standin.query_count() == queries
+    assert compressions == ['gzip']
+
+    client.post('/set-current-performer', json={'performer_id': 2}, headers=judge_headers(1))
+    body = {'judge_id': 1, 'performer_id': 2, 'scores': SCORES}
+    assert client.post('/scores', json=body, headers=judge_headers(1)).status_code == 201
+    third = client.get('/current-scores?format=matrix', headers={'Accept-Encoding': 'gzip'})
+    assert json.loads(gzip.decompress(third.get_data()))['scores'][1][0] == sum(SCORES.values())
+    assert compressions == ['gzip', 'gzip']
@@ -0,0 +1,98 @@
+from collections import Counter
+
+import pytest
+
+import metrics
+import sqlite_standin
+from conftest import SCORES
+
+
+@pytest.fixture
+def executed(monkeypatch, backend):
+    """
+    Every SQL statement the database receives, recorded below the instrumented pool.
+    """
+    statements = []
+    for method in ('execute', 'executemany'):
+        original = getattr(sqlite_standin.StandinCursor, method)
+
+        def record(self, sql, *args, _original=original, **kwargs):
+            statements.append(sql)
+            return _original(self, sql, *args, **kwargs)
+        monkeypatch.setattr(sqlite_standin.StandinCursor, method, record)
+    return statements
+
+
+# (method, path, body, judge id whose token is sent), in an order where each request
+# finds the state the previous ones left behind
+REQUESTS = [
+    ('post', '/change-event', None, None),
+    ('get', '/event-status', None, None),
+    ('get', '/performers', None, None),
+    ('post', '/set-current-performer', {'performer_id': 1}, 1),
+    ('get', '/current-performer', None, None),
+    ('get', '/canVote/1', None, 1),
+    ('post', '/scores', {'judge_id': 1, 'performer_id': 1, 'scores': SCORES}, 1),
+    ('post', '/scores/batch', {'submissions': [{'judge_id': 2, 'performer_id': 1, 'scores': SCORES}]}, 2),
+    ('get', '/canVote', None, None),
+    ('get', '/performers-and-judges', None, None),
+    ('get', '/current-scores', None, None),
+    ('get', '/current-scores?limit=1', None, None),
+    ('get', '/current-scores?format=matrix', None, None),
+    ('get', '/final-scores', None, None),
+    ('post', '/judge/login', {'email': 'judge1@sjsu.edu', 'password': 'password1'}, None),
+    ('post', '/judge/login', {'email': 'judge1@sjsu.edu', 'password': 'wrong'}, None),
+]
+
+
+def route_labels(backend, method, path):
+    adapter = backend.app.url_map.bind('localhost')
+    rule, _ = adapter.match(path.split('?')[0], method=method.upper(), return_rule=True)
+    return method.upper(), rule.rule
+
+
+def statement_snapshot(backend):
+    return {labels[0]: backend.query_duration.count(labels) for labels in list(backend.query_duration._series)}
+
+
+def test_counters_match_the_statements_each_route_executes(backend, client, judge_headers, executed):
+    seen = Counter()
+    for method, path, body, judge_id in REQUESTS:
+        labels = route_labels(backend, method, path)
+        route_before = backend.request_db_queries.value(labels)
+        statements_before = statement_snapshot(backend)
+        executed.clear()
+
+        send = client.post if method == 'post' else client.get
+        response = send(path, json=body, headers=judge_headers(judge_id) if judge_id else {})
+        assert response.status_code < 500, path
+
+        expected = Counter(metrics.statement_name(sql) for sql in executed)
+        assert backend.request_db_queries.value(labels) - route_before == len(executed), path
+        statements_after = statement_snapshot(backend)
+        observed = {
+            name: count - statements_before.get(name, 0)
+            for name, count in statements_after.items() if count != statements_before.get(name, 0)
+        }
+        assert observed == dict(expected), path
+        seen.update(expected)
+
+    # The sequence exercises the reads and writes of every hot table
+    assert {'INSERT scores', 'SELECT scores', 'SELECT live_state', 'UPDATE live_state', 'SELECT judge'} <= set(seen)
+
+
+def test_cached_reads_count_no_statements(backend, client, executed):
+    client.get('/performers')
+    executed.clear()
+    labels = ('GET', '/performers')
+    before = backend.request_db_queries.value(labels)
+    client.get('/performers')
+    assert executed == []
+    assert backend.request_db_queries.value(labels) == before
+
+
+def test_metrics_endpoint_renders_route_counters(backend, client, executed):
+    client.get('/event-status')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'scoreboard_http_request_db_queries_total{method="GET",route="/event-status"}' in body
+    assert 'scoreboard_db_query_duration_seconds_count{statement="SELECT live_state"}' in body
@@ -0,0 +1,162 @@
+"""
+The migrations are MySQL DDL, so they run against a scratch database on the MySQL
+server named by TEST_MYSQL_HOST (with TEST_MYSQL_USER / TEST_MYSQL_PASSWORD), and
+are skipped without one.
+"""
+import os
+import uuid
+from contextlib import closing
+
+import mysql.connector
+import pytest
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+# The tables as the backend created them before any migration
+ORIGINAL_SCHEMA = """
+    CREATE TABLE performer (id INT AUTO_INCREMENT PRIMARY KEY, name VARCHAR(100) NOT NULL);
+    CREATE TABLE judge (
+        judge_id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        email VARCHAR(100) NOT NULL,
+        password VARCHAR(100) NOT NULL,
+        weight FLOAT NOT NULL DEFAULT 1
+    );
+    CREATE TABLE scores (
+        score_id INT AUTO_INCREMENT PRIMARY KEY,
+        judge_id INT NOT NULL,
+        performer_id INT NOT NULL,
+        presentation INT NOT NULL,
+        stage_presence INT NOT NULL,
+        choreography INT NOT NULL,
+        timing INT NOT NULL,
+        performance INT NOT NULL,
+        FOREIGN KEY (judge_id) REFERENCES judge (judge_id),
+        FOREIGN KEY (performer_id) REFERENCES performer (id)
+    );
+    CREATE TABLE event_status (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        has_started BOOLEAN NOT NULL,
+        event_datetime DATETIME NOT NULL
+    );
+    CREATE TABLE current_performer (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        performer_id INT NOT NULL,
+        entry_timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+"""
+
+pytestmark = pytest.mark.skipif(not os.environ.get('TEST_MYSQL_HOST'), reason='needs TEST_MYSQL_HOST')
+
+
+def statements(script):
+    lines = [line for line in script.splitlines() if not line.lstrip().startswith('--')]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def run_script(conn, script):
+    with conn.cursor() as cursor:
+        for statement in statements(script):
+            cursor.execute(statement)
+
+
+def migrate(conn, *names):
+    for name in names:
+        with open(os.path.join(MIGRATIONS, name)) as f:
+            run_script(conn, f.read())
+
+
+@pytest.fixture
+def mysql_db():
+    """
+    A connection to a new, empty database holding the original tables, dropped afterwards.
+    """
+    name = f"scoreboard_test_{uuid.uuid4().hex[:12]}"
+    options = {
+        'host': os.environ['TEST_MYSQL_HOST'],
+        'user': os.environ.get('TEST_MYSQL_USER', 'root'),
+        'password': os.environ.get('TEST_MYSQL_PASSWORD', ''),
+        'autocommit': True,
+    }
+    with closing(mysql.connector.connect(**options)) as admin:
+        with admin.cursor() as cursor:
+            cursor.execute(f"CREATE DATABASE {name}")
+        try:
+            with closing(mysql.connector.connect(database=name, **options)) as conn:
+                run_script(conn, ORIGINAL_SCHEMA)
+                run_script(conn, """
+                    INSERT INTO performer (id, name) VALUES (1, 'Performer 1'), (2, 'Performer 2');
+                    INSERT INTO judge (judge_id, name, email, password) VALUES (1, 'Judge 1', 'judge1@sjsu.edu', 'password1');
+                """)
+                yield conn
+        finally:
+            with admin.cursor() as cursor:
+                cursor.execute(f"DROP DATABASE {name}")
+
+
+def query(conn, sql, params=()):
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def insert_score(conn, performer_id, event_id=None):
+    columns, values = 'judge_id, performer_id', [1, performer_id]
+    if event_id is not None:
+        columns, values = 'event_id, ' + columns, [event_id] + values
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO scores ({columns}, presentation, stage_presence, choreography, timing, performance) "
+            f"VALUES ({', '.join(['%s'] * len(values))}, 3, 3, 3, 3, 3)",
+            values
+        )
+
+
+def test_event_migration_moves_existing_rows_into_event_1(mysql_db):
+    insert_score(mysql_db, 1)
+    insert_score(mysql_db, 1)
+    run_script(mysql_db, """
+        INSERT INTO event_status (has_started, event_datetime) VALUES (TRUE, NOW());
+        INSERT INTO current_performer (performer_id) VALUES (2);
+    """)
+    migrate(mysql_db, '001_scores_unique_submission.sql', '002_event_scoped_scores.sql')
+
+    assert query(mysql_db, "SELECT id FROM event") == [(1,)]
+    assert query(mysql_db, "SELECT score_id, event_id FROM scores") == [(1, 1)]
+    assert query(mysql_db, "SELECT event_id FROM event_status") == [(1,)]
+    assert query(mysql_db, "SELECT event_id, performer_id FROM current_performer") == [(1, 2)]
+    assert query(mysql_db, "SELECT COUNT(*) FROM scores_archive") == [(0,)]
+
+
+def test_a_judge_scores_a_performer_once_per_event(mysql_db):
+    migrate(mysql_db, '001_scores_unique_submission.sql', '002_event_scoped_scores.sql')
+    insert_score(mysql_db, 1, event_id=1)
+    with pytest.raises(mysql.connector.IntegrityError):
+        insert_score(mysql_db, 1, event_id=1)
+    insert_score(mysql_db, 1, event_id=2)
+    # event_id no longer has a default: every new row names its event
+    with pytest.raises(mysql.connector.Error):
+        insert_score(mysql_db, 2)
+
+
+def test_live_state_is_seeded_from_the_latest_history_rows(mysql_db):
+    migrate(mysql_db, '001_scores_unique_submission.sql', '002_event_scoped_scores.sql')
+    run_script(mysql_db, """
+        INSERT INTO event (id, started_at) VALUES (2, NOW());
+        INSERT INTO event_status (event_id, has_started, event_datetime) VALUES (1, TRUE, NOW() - INTERVAL 2 HOUR);
+        INSERT INTO event_status (event_id, has_started, event_datetime) VALUES (2, TRUE, NOW() - INTERVAL 1 HOUR);
+        INSERT INTO current_performer (event_id, performer_id, entry_timestamp) VALUES (2, 1, NOW() - INTERVAL 2 MINUTE);
+        INSERT INTO current_performer (event_id, performer_id, entry_timestamp) VALUES (2, 2, NOW() - INTERVAL 1 MINUTE);
+    """)
+    migrate(mysql_db, '003_live_state.sql')
+
+    assert query(mysql_db, "SELECT id, event_id, has_started, current_performer_id, version FROM live_state") == [
+        (1, 2, 1, 2, 0)
+    ]
+    with pytest.raises(mysql.connector.Error):
+        run_script(mysql_db, "INSERT INTO live_state (id, event_id) VALUES (2, 2)")
+
+
+def test_live_state_of_a_database_without_history(mysql_db):
+    migrate(mysql_db, '001_scores_unique_submission.sql', '002_event_scoped_scores.sql', '003_live_state.sql')
+    assert query(mysql_db, "SELECT event_id, has_started, current_performer_id FROM live_state") == [(1, 0, None)]
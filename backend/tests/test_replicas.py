@@ -0,0 +1,63 @@
+import sqlite3
+
+import pytest
+
+from conftest import SCORES, standin_pool
+
+
+@pytest.fixture
+def lagging_replica(backend, database, tmp_path, monkeypatch):
+    """
+    snapshot(): copy the primary to a replica that then stops replicating.
+    """
+    path = str(tmp_path / 'replica.db')
+    pool = standin_pool(backend, path)
+    monkeypatch.setattr(backend, 'replica_pools', [pool])
+    monkeypatch.setattr(backend, 'db_replica_hosts', ['replica'])
+
+    def snapshot():
+        with sqlite3.connect(database) as primary, sqlite3.connect(path) as replica:
+            primary.backup(replica)
+    snapshot()
+    yield snapshot
+    pool.close_all()
+
+
+def stored_events(database):
+    with sqlite3.connect(database) as conn:
+        return [row[0] for row in conn.execute('SELECT event_id FROM scores')]
+
+
+def test_scores_go_to_the_event_on_the_primary(backend, client, judge_headers, database, lagging_replica):
+    first = client.post('/change-event').get_json()['event_id']
+    lagging_replica()
+    client.post('/change-event')
+    second = client.post('/change-event').get_json()['event_id']
+    assert second != first
+
+    assert client.get('/event-status').get_json()['event_id'] == second
+    assert client.post('/set-current-performer', json={'performer_id': 1}, headers=judge_headers(1)).status_code == 200
+    body = {'judge_id': 1, 'performer_id': 1, 'scores': SCORES}
+    assert client.post('/scores', json=body, headers=judge_headers(1)).status_code == 201
+    assert stored_events(database) == [second]
+
+
+def test_reads_stay_on_the_primary_while_replicas_may_lag(backend, client, judge_headers, lagging_replica):
+    client.post('/change-event')
+    client.post('/set-current-performer', json={'performer_id': 1}, headers=judge_headers(1))
+    lagging_replica()
+    body = {'judge_id': 1, 'performer_id': 1, 'scores': SCORES}
+    assert client.post('/scores', json=body, headers=judge_headers(1)).status_code == 201
+
+    # The replica has no score yet; the listing cached for this version must have it
+    assert len(client.get('/current-scores').get_json()['scores']) == 1
+    assert len(client.get('/current-scores').get_json()['scores']) == 1
+    assert backend.replica_pools[0].stats()['checkouts'] == 0
+
+
+def test_reads_use_the_replica_once_it_has_caught_up(backend, client, lagging_replica, monkeypatch):
+    client.post('/change-event')
+    lagging_replica()
+    monkeypatch.setattr(backend, 'db_replica_max_lag', 0)
+    assert client.get('/current-scores').status_code == 200
+    assert backend.replica_pools[0].stats()['checkouts'] == 1
@@ -0,0 +1,144 @@
+import math
+import random
+import sqlite3
+
+import numpy as np
+import pytest
+
+import scoring
+from conftest import original_final_scores, random_rows
+from leaderboard import CRITERIA
+
+WEIGHTS = {1: 1.0, 2: 2.0, 3: 1.0}
+
+# (performer_id, judge_id, criteria): judge totals are
+#   performer 1: 25, 5, 25   performer 2: 15, 15, 15   performer 3: 10, 5, -
+HAND_SCORES = [
+    (1, 1, (5, 5, 5, 5, 5)),
+    (1, 2, (1, 1, 1, 1, 1)),
+    (1, 3, (5, 5, 5, 5, 5)),
+    (2, 1, (1, 5, 3, 3, 3)),
+    (2, 2, (1, 5, 3, 3, 3)),
+    (2, 3, (1, 5, 5, 1, 3)),
+    (3, 1, (5, 1, 1, 1, 2)),
+    (3, 2, (1, 1, 1, 1, 1)),
+]
+
+
+def hand_rows():
+    return [
+        {
+            'performer_id': performer_id,
+            'performer_name': f'Performer {performer_id}',
+            'judge_id': judge_id,
+            'judge_name': f'Judge {judge_id}',
+            **dict(zip(CRITERIA, criteria)),
+            'weight': WEIGHTS[judge_id],
+        }
+        for performer_id, judge_id, criteria in HAND_SCORES
+    ]
+
+
+def ranked(method='weighted', criterion_weights=None, tiebreak=()):
+    arrays = scoring.ScoreArrays.from_rows(hand_rows())
+    order, totals = scoring.rank(arrays, method, criterion_weights, tiebreak)
+    return [int(arrays.performer_ids[p]) for p in order], [float(totals[p]) for p in order]
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_weighted_matches_the_original_computation(seed):
+    rng = random.Random(seed)
+    # Few score values and weights, so equal totals are common
+    rows = random_rows(rng, performers=rng.randint(1, 30), judges=rng.randint(1, 6),
+                       weights=[0.5, 1.0, 1.5, 2.0], low=1, high=2)
+    rng.shuffle(rows)
+    arrays = scoring.ScoreArrays.from_rows(rows)
+    assert arrays.entries(*scoring.rank(arrays)) == original_final_scores(rows)
+
+
+def test_weighted_ties_go_to_the_lower_performer_id():
+    # 25 + 2 x 5 + 25 and 15 + 2 x 15 + 15 are both 60
+    assert ranked() == ([1, 2, 3], [60.0, 60.0, 20.0])
+
+
+def test_trimmed_mean_drops_the_highest_and_lowest_judge():
+    # 5 and one 25 are dropped from performer 1; performer 3 has only two judges: (10 + 5) / 2
+    assert ranked('trimmed_mean') == ([1, 2, 3], [25.0, 15.0, 7.5])
+
+
+def test_zscore_standardizes_each_judge():
+    # Judge 1: mean 50/3, std sqrt(350)/3; judge 2: mean 25/3, std sqrt(200)/3; judge 3: mean 20, std 5
+    j1 = [25 / math.sqrt(350), -5 / math.sqrt(350), -20 / math.sqrt(350)]
+    j2 = [-1 / math.sqrt(2), math.sqrt(2), -1 / math.sqrt(2)]
+    j3 = [1.0, -1.0]
+    expected = {
+        1: (j1[0] + 2 * j2[0] + j3[0]) / 4,
+        2: (j1[1] + 2 * j2[1] + j3[1]) / 4,
+        3: (j1[2] + 2 * j2[2]) / 3,
+    }
+    order, totals = ranked('zscore')
+    assert order == [2, 1, 3]
+    assert totals == pytest.approx([expected[performer_id] for performer_id in order])
+
+
+def test_zscore_ignores_a_judge_without_spread():
+    rows = [row for row in hand_rows() if row['judge_id'] != 3]
+    for row in rows:
+        if row['judge_id'] == 2:
+            row.update(dict.fromkeys(CRITERIA, 3))
+    arrays = scoring.ScoreArrays.from_rows(rows)
+    order, totals = scoring.rank(arrays, 'zscore')
+    # Only judge 1 ranks; judge 2's weight still counts in every average
+    j1 = np.array([25, -5, -20]) / math.sqrt(350)
+    assert list(order) == [0, 1, 2]
+    assert totals == pytest.approx(j1 / 3)
+
+
+def test_criteria_weights():
+    # presentation counts 0 and stage_presence 2: performer 2's judge totals become 19,
+    # performer 3's 6 and 5, performer 1's are unchanged
+    assert ranked(criterion_weights={'presentation': 0, 'stage_presence': 2}) == (
+        [2, 1, 3], [76.0, 60.0, 16.0]
+    )
+
+
+# Raw sums of performers 1 and 2: presentation 11 v 3, stage_presence 11 v 15,
+# choreography 11 v 11, timing 11 v 7
+@pytest.mark.parametrize('tiebreak, expected', [
+    ([], [1, 2, 3]),
+    (['presentation'], [1, 2, 3]),
+    (['stage_presence'], [2, 1, 3]),
+    (['choreography', 'stage_presence'], [2, 1, 3]),
+    (['choreography', 'timing'], [1, 2, 3]),
+])
+def test_tiebreak(tiebreak, expected):
+    order, totals = ranked(tiebreak=tiebreak)
+    assert order == expected
+    assert totals[:2] == [60.0, 60.0]
+
+
+@pytest.fixture
+def hand_scored(database):
+    with sqlite3.connect(database) as db:
+        db.executemany("UPDATE judge SET weight = ? WHERE judge_id = ?",
+                       [(weight, judge_id) for judge_id, weight in WEIGHTS.items()])
+        db.executemany(
+            "INSERT INTO scores (event_id, judge_id, performer_id, presentation, stage_presence, "
+            "choreography, timing, performance) VALUES (1, ?, ?, ?, ?, ?, ?, ?)",
+            [(judge_id, performer_id, *criteria) for performer_id, judge_id, criteria in HAND_SCORES]
+        )
+
+
+@pytest.mark.parametrize('query, options', [
+    ('', {}),
+    ('?tiebreak=stage_presence', {'tiebreak': ['stage_presence']}),
+    ('?method=trimmed_mean', {'method': 'trimmed_mean'}),
+    ('?method=zscore', {'method': 'zscore'}),
+    ('?criteria_weights=presentation:0,stage_presence:2',
+     {'criterion_weights': {'presentation': 0, 'stage_presence': 2}}),
+])
+def test_final_scores_endpoint(client, hand_scored, query, options):
+    order, totals = ranked(**options)
+    scores = client.get(f'/final-scores{query}').get_json()['scores']
+    assert [entry['performer_name'] for entry in scores] == [f'Performer {p}' for p in order]
+    assert [entry['total_score'] for entry in scores] == pytest.approx(totals)
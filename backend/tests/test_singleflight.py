@@ -0,0 +1,132 @@
+import threading
+import time
+
+import mysql.connector
+import pytest
+
+from singleflight import FlightTimeout, SingleFlight
+
+
+def run_in_thread(flights, key, function):
+    """
+    Run flights.do(key, function) in a thread; returns the thread and its outcome.
+    """
+    outcome = {}
+
+    def run():
+        try:
+            outcome['result'] = flights.do(key, function)
+        except Exception as err:
+            outcome['error'] = err
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, outcome
+
+
+def wait_for_follower(flights):
+    deadline = time.monotonic() + 5
+    while not any(call.waiters for call in list(flights._calls.values())):
+        assert time.monotonic() < deadline, 'no follower joined the flight'
+        time.sleep(0.001)
+
+
+def blocking(gate, started, result=None, error=None):
+    def function():
+        started.set()
+        gate.wait(5)
+        if error is not None:
+            raise error
+        return result
+    return function
+
+
+def test_concurrent_callers_share_one_execution():
+    flights = SingleFlight()
+    gate, started = threading.Event(), threading.Event()
+    thread, outcome = run_in_thread(flights, 'key', blocking(gate, started, result=42))
+    assert started.wait(5)
+    follower = run_in_thread(flights, 'key', lambda: pytest.fail('ran twice'))
+    wait_for_follower(flights)
+    gate.set()
+    thread.join(5)
+    follower[0].join(5)
+    assert outcome['result'] == (42, False)
+    assert follower[1]['result'] == (42, True)
+    assert flights.stats()['executions'] == 1
+
+
+def test_follower_times_out_without_cancelling_the_leader():
+    flights = SingleFlight(timeout=0.05)
+    gate, started = threading.Event(), threading.Event()
+    thread, outcome = run_in_thread(flights, 'key', blocking(gate, started, result='done'))
+    assert started.wait(5)
+    with pytest.raises(FlightTimeout):
+        flights.do('key', lambda: pytest.fail('ran twice'))
+    gate.set()
+    thread.join(5)
+    assert outcome['result'] == ('done', False)
+    assert flights.stats()['timeouts'] == 1
+
+
+def test_leader_error_reaches_followers():
+    flights = SingleFlight()
+    gate, started = threading.Event(), threading.Event()
+    error = mysql.connector.errors.OperationalError(msg='lost connection')
+    thread, outcome = run_in_thread(flights, 'key', blocking(gate, started, error=error))
+    assert started.wait(5)
+    follower = run_in_thread(flights, 'key', lambda: pytest.fail('ran twice'))
+    wait_for_follower(flights)
+    gate.set()
+    thread.join(5)
+    follower[0].join(5)
+    assert outcome['error'] is error and follower[1]['error'] is error
+    # Nothing is remembered: the next call runs again
+    assert flights.do('key', lambda: 'fresh') == ('fresh', False)
+
+
+def test_timed_out_coalesced_load_answers_503(backend, client, monkeypatch):
+    monkeypatch.setattr(backend.cache_flights, 'timeout', 0.05)
+    gate, started = threading.Event(), threading.Event()
+    original = backend.load_performers
+
+    def slow_load_performers():
+        started.set()
+        gate.wait(5)
+        return original()
+    monkeypatch.setattr(backend, 'load_performers', slow_load_performers)
+
+    leader = {}
+    thread = threading.Thread(target=lambda: leader.update(response=backend.app.test_client().get('/performers')))
+    thread.start()
+    assert started.wait(5)
+    response = client.get('/performers')
+    gate.set()
+    thread.join(5)
+
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert 'error' in response.get_json()
+    assert leader['response'].status_code == 200
+
+
+def test_leader_database_error_is_the_followers_error(backend, client, monkeypatch):
+    gate, started = threading.Event(), threading.Event()
+
+    def failing_load_performers():
+        started.set()
+        gate.wait(5)
+        raise mysql.connector.errors.OperationalError(msg='lost connection')
+    monkeypatch.setattr(backend, 'load_performers', failing_load_performers)
+
+    responses = []
+    thread = threading.Thread(target=lambda: responses.append(backend.app.test_client().get('/performers')))
+    thread.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=lambda: responses.append(client.get('/performers')))
+    follower.start()
+    wait_for_follower(backend.cache_flights)
+    gate.set()
+    thread.join(5)
+    follower.join(5)
+    assert [response.status_code for response in responses] == [500, 500]
+    assert [response.get_json()['error'] for response in responses] == ['Failed to retrieve performers'] * 2
@@ -0,0 +1,48 @@
+import json
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def one_listing(backend, monkeypatch):
+    monkeypatch.setattr(backend, 'stream_max_listings', 1)
+    monkeypatch.setattr(backend, 'stream_listings', threading.BoundedSemaphore(1))
+
+
+def test_streamed_listing_matches_buffered(client):
+    streamed = client.get('/current-scores?stream=1')
+    assert streamed.status_code == 200
+    assert json.loads(streamed.get_data()) == client.get('/current-scores').get_json()
+
+
+def test_stalled_stream_limits_further_streams_only(client, one_listing):
+    stalled = client.get('/current-scores?stream=1', buffered=False)
+    assert stalled.status_code == 200
+
+    refused = client.get('/current-scores?stream=1&limit=2')
+    assert refused.status_code == 503
+    assert client.get('/current-scores').status_code == 200
+
+    stalled.close()
+    assert client.get('/current-scores?stream=1&limit=2').status_code == 200
+
+
+def test_closed_stream_returns_its_connection(backend, client, one_listing):
+    stalled = client.get('/current-scores?stream=1', buffered=False)
+    assert backend.db_pool.stats()['in_use'] == 1
+    stalled.close()
+    assert backend.db_pool.stats()['in_use'] == 0
+
+
+def test_head_and_aborted_streams_return_their_connections(backend, client):
+    for _ in range(3):
+        client.head('/current-scores?stream=1').close()
+    assert backend.db_pool.stats()['in_use'] == 0
+
+    for _ in range(3):
+        aborted = client.get('/current-scores?stream=1', buffered=False)
+        next(aborted.response)
+        aborted.close()
+    assert backend.db_pool.stats()['in_use'] == 0
+    assert client.get('/current-scores?stream=1').status_code == 200
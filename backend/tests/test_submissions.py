@@ -0,0 +1,88 @@
+import sqlite3
+
+import pytest
+
+from conftest import SCORES
+
+
+@pytest.fixture
+def started(client, judge_headers):
+    client.post('/change-event')
+    client.post('/set-current-performer', json={'performer_id': 1}, headers=judge_headers(1))
+
+
+def submission(performer_id, judge_id=1, scores=SCORES):
+    return {'judge_id': judge_id, 'performer_id': performer_id, 'scores': scores}
+
+
+def stored_scores(database):
+    with sqlite3.connect(database) as db:
+        return db.execute('SELECT judge_id, performer_id FROM scores ORDER BY score_id').fetchall()
+
+
+def insert_directly(backend, database, judge_id, performer_id):
+    # A score written by another backend process, unknown to this one's caches
+    with sqlite3.connect(database) as db:
+        db.execute(
+            'INSERT INTO scores (event_id, judge_id, performer_id, presentation, stage_presence,'
+            ' choreography, timing, performance) VALUES (?, ?, ?, 3, 3, 3, 3, 3)',
+            (backend.current_event_id(), judge_id, performer_id)
+        )
+
+
+def test_duplicate_score_is_rejected(client, judge_headers, database, started):
+    assert client.post('/scores', json=submission(1), headers=judge_headers(1)).status_code == 201
+    response = client.post('/scores', json=submission(1), headers=judge_headers(1))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Scores already submitted for this performer by this judge'
+    assert stored_scores(database) == [(1, 1)]
+
+
+def test_duplicate_found_by_the_unique_constraint_is_rejected(backend, client, judge_headers, database, started):
+    insert_directly(backend, database, 1, 1)
+    response = client.post('/scores', json=submission(1), headers=judge_headers(1))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Scores already submitted for this performer by this judge'
+    assert stored_scores(database) == [(1, 1)]
+
+
+def test_batch_reports_a_status_per_submission(client, judge_headers, database, started):
+    assert client.post('/scores', json=submission(2), headers=judge_headers(1)).status_code == 201
+    response = client.post('/scores/batch', headers=judge_headers(1), json={'submissions': [
+        submission(1),
+        submission(1),
+        submission(2),
+        submission(3, judge_id=2),
+        submission(3, scores={**SCORES, 'timing': 6}),
+        submission(999),
+        'not a submission',
+        submission(3),
+    ]})
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['inserted'] == 2
+    assert [result['status'] for result in body['results']] == [201, 400, 400, 403, 400, 404, 400, 201]
+    assert [result['index'] for result in body['results']] == list(range(8))
+    assert 'error' not in body['results'][0] and 'error' in body['results'][1]
+    assert stored_scores(database) == [(1, 2), (1, 1), (1, 3)]
+
+    # Resending the same batch stores nothing new
+    response = client.post('/scores/batch', headers=judge_headers(1), json={'submissions': [submission(1), submission(3)]})
+    assert response.get_json()['inserted'] == 0
+    assert [result['status'] for result in response.get_json()['results']] == [400, 400]
+
+
+def test_batch_that_loses_a_race_stores_nothing(backend, client, judge_headers, database, started):
+    backend.leaderboard.ensure_loaded(backend.load_final_score_rows)
+    insert_directly(backend, database, 1, 3)
+    response = client.post('/scores/batch', headers=judge_headers(1), json={'submissions': [
+        submission(1),
+        submission(3),
+    ]})
+    assert response.status_code == 400
+    assert stored_scores(database) == [(1, 3)]
+
+
+@pytest.mark.parametrize('body', [{}, {'submissions': []}, {'submissions': 'x'}, []])
+def test_malformed_batch_is_rejected(client, judge_headers, started, body):
+    assert client.post('/scores/batch', json=body, headers=judge_headers(1)).status_code == 400
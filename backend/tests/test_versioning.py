@@ -0,0 +1,92 @@
+import pytest
+
+import sqlite_standin
+from conftest import SCORES
+from versioning import DataVersion
+
+
+def test_version_tokens_are_scoped_by_epoch():
+    first, second = DataVersion(), DataVersion()
+    version = first.bump()
+    assert first.parse(first.token(version)) == version
+    assert second.parse(first.token(version)) is None
+    with pytest.raises(ValueError):
+        first.parse('12')
+    with pytest.raises(ValueError):
+        first.parse(f'{first.epoch}-x')
+
+
+@pytest.fixture
+def scoring(client, judge_headers):
+    """
+    submit(judge_id): submit SCORES for performer 1 as that judge.
+    """
+    client.post('/change-event')
+    client.post('/set-current-performer', json={'performer_id': 1}, headers=judge_headers(1))
+
+    def submit(judge_id):
+        body = {'judge_id': judge_id, 'performer_id': 1, 'scores': SCORES}
+        assert client.post('/scores', json=body, headers=judge_headers(judge_id)).status_code == 201
+    return submit
+
+
+def test_since_from_another_process_gets_the_full_list(backend, client, scoring):
+    scoring(1)
+    version = client.get('/current-scores').headers['X-Data-Version']
+    scoring(2)
+    epoch, _, number = version.rpartition('-')
+    body = client.get(f'/current-scores?since=other{epoch}-{number}').get_json()
+    assert body['full'] is True and len(body['scores']) == 2
+    assert backend.data_version.parse(body['version']) == backend.data_version.current()
+
+
+def test_malformed_since_is_rejected(client):
+    assert client.get('/current-scores?since=12').status_code == 400
+
+
+@pytest.mark.parametrize('path', ['/current-scores', '/final-scores', '/current-performer', '/event-status'])
+def test_unchanged_read_is_answered_with_304(client, scoring, path):
+    scoring(1)
+    response = client.get(path)
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    queries = sqlite_standin.query_count()
+    response = client.get(path, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.get_data() == b''
+    assert response.headers['ETag'] == etag
+    assert sqlite_standin.query_count() == queries
+
+
+def test_etag_changes_after_a_write(client, scoring):
+    scoring(1)
+    etag = client.get('/current-scores').headers['ETag']
+    scoring(2)
+    response = client.get('/current-scores', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert len(response.get_json()['scores']) == 2
+
+
+def test_since_returns_only_newer_rows(client, scoring):
+    scoring(1)
+    version = client.get('/current-scores').headers['X-Data-Version']
+    scoring(2)
+    body = client.get(f'/current-scores?since={version}').get_json()
+    assert body['full'] is False
+    assert [row['judge_id'] for row in body['scores']] == [2]
+
+    body = client.get(f"/current-scores?since={body['version']}").get_json()
+    assert body == {'scores': [], 'version': body['version'], 'full': False}
+
+
+def test_since_older_than_the_change_log_gets_the_full_list(backend, client, scoring, monkeypatch):
+    monkeypatch.setattr(backend.score_changes, 'max_entries', 1)
+    scoring(1)
+    version = client.get('/current-scores').headers['X-Data-Version']
+    scoring(2)
+    scoring(3)
+    body = client.get(f'/current-scores?since={version}').get_json()
+    assert body['full'] is True
+    assert sorted(row['judge_id'] for row in body['scores']) == [1, 2, 3]
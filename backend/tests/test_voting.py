@@ -0,0 +1,95 @@
+from conftest import SCORES
+from voting import VoteTracker
+
+
+def loaded_tracker(performer_id, judge_ids, submitted_ids):
+    tracker = VoteTracker()
+    tracker.ensure_loaded(lambda: (performer_id, judge_ids, submitted_ids))
+    return tracker
+
+
+def test_judges_vote_in_id_order():
+    tracker = loaded_tracker(1, [3, 1, 2], [])
+    assert tracker.can_vote_all() == {1: True, 2: False, 3: False}
+    tracker.record(1, 1)
+    assert tracker.can_vote_all() == {1: True, 2: True, 3: False}
+    tracker.record(1, 3)
+    assert tracker.can_vote(3) is False
+    tracker.record(1, 2)
+    assert tracker.can_vote(3) is True
+
+
+def test_submissions_for_another_performer_are_ignored():
+    tracker = loaded_tracker(1, [1, 2], [])
+    tracker.record(2, 1)
+    assert tracker.can_vote(2) is False
+
+
+def test_reselecting_the_current_performer_keeps_submissions():
+    tracker = loaded_tracker(1, [1, 2], [1])
+    tracker.set_performer(1)
+    tracker.ensure_loaded(lambda: (1, [1, 2], []))
+    assert tracker.can_vote(2) is True
+
+
+def test_new_performer_reloads_their_existing_submissions():
+    tracker = loaded_tracker(1, [1, 2], [])
+    tracker.set_performer(2)
+    tracker.ensure_loaded(lambda: (2, [1, 2], [1]))
+    assert tracker.performer_id == 2
+    assert tracker.can_vote(2) is True
+
+
+def test_reset_clears_performer_and_submissions():
+    tracker = loaded_tracker(1, [1, 2], [1])
+    tracker.reset()
+    assert tracker.performer_id is None
+    assert tracker.can_vote(2) is False
+
+
+def submit(client, judge_headers, judge_id, performer_id):
+    return client.post(
+        '/scores', json={'judge_id': judge_id, 'performer_id': performer_id, 'scores': SCORES},
+        headers=judge_headers(judge_id)
+    )
+
+
+def set_performer(client, judge_headers, performer_id):
+    response = client.post('/set-current-performer', json={'performer_id': performer_id}, headers=judge_headers(1))
+    assert response.status_code == 200
+
+
+def can_vote(client, judge_headers, judge_id):
+    return client.get(f'/canVote/{judge_id}', headers=judge_headers(judge_id)).get_json()['canVote']
+
+
+def test_can_vote_survives_reselecting_the_current_performer(client, judge_headers):
+    client.post('/change-event')
+    set_performer(client, judge_headers, 1)
+    assert submit(client, judge_headers, 1, 1).status_code == 201
+    assert can_vote(client, judge_headers, 2) is True
+    set_performer(client, judge_headers, 1)
+    assert can_vote(client, judge_headers, 2) is True
+
+
+def test_can_vote_after_going_back_to_a_scored_performer(client, judge_headers):
+    client.post('/change-event')
+    set_performer(client, judge_headers, 1)
+    assert submit(client, judge_headers, 1, 1).status_code == 201
+    assert submit(client, judge_headers, 2, 1).status_code == 201
+    set_performer(client, judge_headers, 2)
+    assert can_vote(client, judge_headers, 2) is False
+    set_performer(client, judge_headers, 1)
+    assert can_vote(client, judge_headers, 3) is True
+    assert submit(client, judge_headers, 3, 1).status_code == 201
+
+
+def test_new_event_starts_with_no_submissions(client, judge_headers):
+    client.post('/change-event')
+    set_performer(client, judge_headers, 1)
+    assert submit(client, judge_headers, 1, 1).status_code == 201
+    client.post('/change-event')
+    client.post('/change-event')
+    set_performer(client, judge_headers, 1)
+    assert can_vote(client, judge_headers, 1) is True
+    assert can_vote(client, judge_headers, 2) is False
@@ -0,0 +1,51 @@
+import mysql.connector
+import pytest
+
+
+@pytest.fixture
+def warm_up_stats(backend, monkeypatch):
+    monkeypatch.setattr(backend, 'warm_up_retry', 0)
+    monkeypatch.setattr(backend, 'warm_up_stats', {'attempts': 0, 'seconds': None, 'connections': 0, 'error': None})
+    return backend.warm_up_stats
+
+
+def test_ready_once_warmed_up(backend, client, warm_up_stats):
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.get_json()['ready'] is False
+
+    backend.run_warm_up()
+    response = client.get('/ready')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['ready'] is True and body['attempts'] == 1
+    assert body['connections'] == backend.db_pool.size
+    stats = backend.db_pool.stats()
+    assert stats['idle'] == stats['open'] == backend.db_pool.size
+
+
+def test_warm_up_retries_until_the_database_is_reachable(backend, client, warm_up_stats, monkeypatch):
+    warm = backend.db_pool.warm
+    failures = []
+
+    def flaky_warm(*args, **kwargs):
+        if len(failures) < 2:
+            failures.append(client.get('/ready').get_json())
+            raise mysql.connector.errors.InterfaceError(msg="Can't connect to MySQL server")
+        return warm(*args, **kwargs)
+
+    monkeypatch.setattr(backend.db_pool, 'warm', flaky_warm)
+    backend.run_warm_up()
+    # Between attempts the last error is reported and the process stays unready
+    assert failures[1]['ready'] is False
+    assert "Can't connect" in failures[1]['error']
+
+    body = client.get('/ready').get_json()
+    assert body['ready'] is True
+    assert body['attempts'] == 3 and body['error'] is None
+
+
+def test_warm_up_prepares_statements_on_each_connection(backend, warm_up_stats):
+    backend.run_warm_up()
+    stats = backend.db_pool.stats()
+    assert stats['prepared_statements'] == len(backend.PRIMARY_STATEMENTS) * backend.db_pool.size
@@ -0,0 +1,249 @@
+import gzip
+import json
+import threading
+import time
+import uuid
+from bisect import bisect_right
+from functools import wraps
+
+from flask import Response, make_response, request
+
+from singleflight import FlightTimeout
+
+try:
+    import brotli
+except ImportError:  # optional; gzip is always available
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+COMPRESS_MIN_BYTES = 1024
+
+
+class DataVersion:
+    """
+    Monotonically increasing version of the event data, bumped by every write path.
+
+    The counter starts from the process start time in microseconds so versions keep
+    increasing across restarts. Versions are only comparable within one process, since
+    each applies the writes of the others in its own order, so every version handed to
+    clients (ETag, X-Data-Version, ?since=) is a token scoped by a random epoch: a
+    process never mistakes another one's version for its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = time.time_ns() // 1000
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def current(self):
+        with self._lock:
+            return self._value
+
+    def bump(self):
+        with self._lock:
+            self._value += 1
+            return self._value
+
+    def reset_after_fork(self):
+        # Each worker process gets its own ETag epoch
+        self._lock = threading.Lock()
+        self.epoch = uuid.uuid4().hex[:8]
+
+    def token(self, version):
+        return f"{self.epoch}-{version}"
+
+    def etag(self, version):
+        return self.token(version)
+
+    def parse(self, token):
+        """
+        Return the version in a token from token(), or None if another process (or
+        this one before a restart) issued it. Raises ValueError if it is malformed.
+        """
+        epoch, separator, version = token.rpartition('-')
+        if not separator:
+            raise ValueError(f"malformed version token: {token!r}")
+        version = int(version)
+        return version if epoch == self.epoch else None
+
+
+class ChangeLog:
+    """
+    Rows written since `floor`, each tagged with the data version of its write, so
+    readers can ask for only what changed after a version they already have.
+    Returns None from since() when the log cannot answer and a full read is needed.
+    """
+
+    def __init__(self, data_version, max_entries=10000):
+        self._data_version = data_version
+        self._lock = threading.Lock()
+        self._versions = []
+        self._rows = []
+        self.max_entries = max_entries
+        self.floor = data_version.current()
+
+    def append(self, row):
+        with self._lock:
+            version = self._data_version.bump()
+            self._versions.append(version)
+            self._rows.append(row)
+            if len(self._rows) > self.max_entries:
+                dropped = len(self._rows) - self.max_entries
+                self.floor = self._versions[dropped - 1]
+                del self._versions[:dropped]
+                del self._rows[:dropped]
+            return version
+
+    def reset(self):
+        """
+        Forget all rows, e.g. after the underlying table was cleared. Clients holding an
+        older version get a full response on their next read.
+        """
+        with self._lock:
+            self._versions = []
+            self._rows = []
+            self.floor = self._data_version.bump()
+            return self.floor
+
+    def since(self, version):
+        """
+        Return (rows written after version, current version), or None if unknown.
+        """
+        with self._lock:
+            current = self._data_version.current()
+            if version < self.floor or version > current:
+                return None
+            return self._rows[bisect_right(self._versions, version):], current
+
+
+def _accepted_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+def busy_response(message, retry_after=1):
+    """
+    503 for a request that gave up waiting on work shared with other requests (see
+    SingleFlight); the client can retry after `retry_after` seconds.
+    """
+    response = Response(json.dumps({'error': message}), status=503, mimetype='application/json')
+    response.cache_control.no_store = True
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+
+def _render(flights, key, render):
+    """
+    Run render() once for concurrent identical requests and give every caller its own
+    copy of the response, errors included. Streamed responses cannot be shared, so
+    their waiters render their own.
+    """
+    if flights is None:
+        return render()
+
+    def leader():
+        response = render()
+        snapshot = None if response.is_streamed else (
+            response.get_data(), response.status_code, response.mimetype, response.cache_control.no_store
+        )
+        return response, snapshot
+
+    try:
+        (response, snapshot), shared = flights.do(key, leader)
+    except FlightTimeout:
+        return busy_response('Timed out waiting for an identical request')
+    if not shared:
+        return response
+    if snapshot is None:
+        return render()
+    body, status, mimetype, no_store = snapshot
+    response = Response(body, status=status, mimetype=mimetype)
+    response.cache_control.no_store = no_store
+    return response
+
+
+def conditional(data_version, response_cache, compress=False, bypass=None, flights=None):
+    """
+    Decorator for read endpoints whose response depends only on the data version.
+
+    Answers If-None-Match with 304 before the view runs, and otherwise serves the
+    serialized body cached for (URL, version) so unchanged data is not re-queried
+    or re-serialized. Responses marked Cache-Control: no-store (e.g. error fallbacks)
+    are passed through untouched. Streamed responses are tagged but not cached.
+
+    With compress=True, bodies are sent brotli- or gzip-encoded when the client
+    accepts it, and each encoding is also cached until the version changes.
+
+    If bypass() returns true for a request (e.g. the client needs to read its own
+    write, which this process's version may not reflect yet), the view runs
+    uncached and the response is marked no-store.
+
+    With a SingleFlight, concurrent requests for the same URL and version that miss
+    the cache share one run of the view and one compression of each encoding.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if bypass is not None and bypass():
+                response = make_response(view(*args, **kwargs))
+                response.cache_control.no_store = True
+                return response
+
+            version = data_version.current()
+            etag = data_version.etag(version)
+
+            # Any encoding of this version is current
+            if any(request.if_none_match.contains_weak(tag) for tag in (etag, f"{etag}-br", f"{etag}-gzip")):
+                response = Response(status=304)
+                response.set_etag(etag)
+                response.headers['X-Data-Version'] = data_version.token(version)
+                if compress:
+                    response.vary.add('Accept-Encoding')
+                return response
+
+            # One slot per URL (and encoding), replaced when the version moves on
+            key = (request.full_path,)
+            cached = response_cache.get(key, version=version)
+            if cached is not None:
+                body, mimetype = cached
+                response = Response(body, status=200, mimetype=mimetype)
+            else:
+                response = _render(flights, key + (version,), lambda: make_response(view(*args, **kwargs)))
+                if response.status_code != 200 or response.cache_control.no_store:
+                    return response
+                if not response.is_streamed:
+                    body = response.get_data()
+                    response_cache.put(key, (body, response.mimetype), version=version)
+
+            if compress and not response.is_streamed:
+                response.vary.add('Accept-Encoding')
+                encoding = _accepted_encoding() if len(body) >= COMPRESS_MIN_BYTES else None
+                if encoding:
+                    encoded = response_cache.get(key + (encoding,), version=version)
+                    if encoded is None:
+                        if flights is None:
+                            encoded = _compress(body, encoding)
+                        else:
+                            encoded, _ = flights.do(key + (encoding, version), lambda: _compress(body, encoding))
+                        response_cache.put(key + (encoding,), encoded, version=version)
+                    response.set_data(encoded)
+                    response.headers['Content-Encoding'] = encoding
+                    etag = f"{etag}-{encoding}"
+
+            response.set_etag(etag)
+            response.headers['X-Data-Version'] = data_version.token(version)
+            # Let browsers revalidate with If-None-Match on every poll
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
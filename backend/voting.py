@@ -0,0 +1,99 @@
+import threading
+from bisect import bisect_left
+
+
+class VoteTracker:
+    """
+    In-memory record of which judges have scored the current performer.
+
+    Judges vote in judge_id order: a judge may vote once every judge with a lower id
+    has submitted. Submissions are kept as a bitmap indexed by the judge's position in
+    the sorted roster, plus the length of the fully submitted prefix, so answering
+    canVote is a lookup and recording a submission advances the prefix in amortized O(1).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.performer_id = None
+        self._judge_ids = []
+        self._submitted = bytearray()
+        self._prefix = 0  # number of leading judges (by id) that have submitted
+
+    def ensure_loaded(self, loader):
+        """
+        Rebuild from the database on first use or after invalidate().
+        loader() returns (current performer id or None, all judge ids, judge ids that
+        have scored the current performer).
+        """
+        with self._lock:
+            if self._loaded:
+                return
+            performer_id, judge_ids, submitted_ids = loader()
+            self.performer_id = performer_id
+            self._judge_ids = sorted(judge_ids)
+            self._reset_submissions()
+            for judge_id in submitted_ids:
+                self._mark(judge_id)
+            self._loaded = True
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded = False
+
+    def set_performer(self, performer_id):
+        """
+        Switch to a new current performer. Re-selecting the current performer changes
+        nothing. Any other performer may already have scores in this event (the head
+        judge can go back to them), so their submissions are reloaded on next use.
+        """
+        with self._lock:
+            if self._loaded and performer_id == self.performer_id:
+                return
+            self._loaded = False
+
+    def reset(self):
+        """
+        No current performer and no submissions, e.g. when a new event starts.
+        """
+        with self._lock:
+            self.performer_id = None
+            self._reset_submissions()
+
+    def record(self, performer_id, judge_id):
+        with self._lock:
+            if self._loaded and performer_id == self.performer_id:
+                self._mark(judge_id)
+
+    def knows_judge(self, judge_id):
+        with self._lock:
+            return self._position(judge_id) is not None
+
+    def can_vote(self, judge_id):
+        with self._lock:
+            return self._position(judge_id) <= self._prefix
+
+    def can_vote_all(self):
+        with self._lock:
+            return {
+                judge_id: position <= self._prefix
+                for position, judge_id in enumerate(self._judge_ids)
+            }
+
+    def _reset_submissions(self):
+        self._submitted = bytearray(len(self._judge_ids))
+        self._prefix = 0
+
+    def _position(self, judge_id):
+        position = bisect_left(self._judge_ids, judge_id)
+        if position < len(self._judge_ids) and self._judge_ids[position] == judge_id:
+            return position
+        return None
+
+    def _mark(self, judge_id):
+        position = self._position(judge_id)
+        if position is None:
+            return
+        self._submitted[position] = 1
+        while self._prefix < len(self._submitted) and self._submitted[self._prefix]:
+            self._prefix += 1
@@ -1,12 +1,19 @@
 // frontend/src/Bystander.js
 import React, { useEffect, useState } from 'react';
 import './Bystander.css';
+import { subscribeToLiveUpdates } from './liveUpdates';
 
 function Bystander() {
   const [performers, setPerformers] = useState([]);
   const [judges, setJudges] = useState([]);
   const [scores, setScores] = useState({});
 
+  // Set when the live update stream is unavailable and we have to poll instead
+  const [streamUnavailable, setStreamUnavailable] = useState(false);
+
+  // Incremented to force a full refetch of the scores (e.g. after a stream resync)
+  const [refreshCount, setRefreshCount] = useState(0);
+
   // Base URL from environment variable or default to 'http://localhost:5000'
   const API_BASE_URL = process.env.REACT_APP_API_BASE_URL || 'http://localhost:5000';
 
@@ -32,16 +39,21 @@ function Bystander() {
   useEffect(() => {
     const fetchScores = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/current-scores`);
+        // Compact form: roster ids once plus a performer x judge matrix (null = not scored yet)
+        const response = await fetch(`${API_BASE_URL}/current-scores?format=matrix`);
         const data = await response.json();
         if (response.ok) {
-          // Transform the scores into a nested object for easy lookup
+          // Transform the matrix into a nested object for easy lookup
           const scoresData = {};
-          data.scores.forEach((score) => {
-            if (!scoresData[score.performer_id]) {
-              scoresData[score.performer_id] = {};
-            }
-            scoresData[score.performer_id][score.judge_id] = score.total_score;
+          data.performer_ids.forEach((performerId, row) => {
+            const performerScores = {};
+            data.judge_ids.forEach((judgeId, column) => {
+              const total = data.scores[row][column];
+              if (total !== null) {
+                performerScores[judgeId] = total;
+              }
+            });
+            scoresData[performerId] = performerScores;
           });
           setScores(scoresData);
         } else {
@@ -52,14 +64,45 @@ function Bystander() {
       }
     };
 
-    // Fetch scores every 5 seconds
+    // Initial fetch; afterwards updates are pushed over the live stream
     fetchScores();
+    if (!streamUnavailable) {
+      return undefined;
+    }
+
+    // Fall back to fetching scores every 5 seconds
     const intervalId = setInterval(fetchScores, 5000);
 
     // Cleanup interval on component unmount
     return () => {
       clearInterval(intervalId);
     };
+  }, [API_BASE_URL, streamUnavailable, refreshCount]);
+
+  // Apply score updates pushed by the backend
+  useEffect(() => {
+    return subscribeToLiveUpdates(
+      API_BASE_URL,
+      {
+        score: (score) => {
+          setScores((previous) => ({
+            ...previous,
+            [score.performer_id]: {
+              ...previous[score.performer_id],
+              [score.judge_id]: score.total_score,
+            },
+          }));
+        },
+        event_status: (status) => {
+          // Starting an event clears all scores
+          if (status.is_ongoing) {
+            setScores({});
+          }
+        },
+        resync: () => setRefreshCount((count) => count + 1),
+      },
+      () => setStreamUnavailable(true)
+    );
   }, [API_BASE_URL]);
 
   return (
@@ -2,10 +2,19 @@
 import React, { useState, useEffect } from 'react';
 import { useLocation } from 'react-router-dom';
 import './EventDetails.css';
+import { subscribeToLiveUpdates } from './liveUpdates';
+import { readYourWritesHeaders, rememberWrite } from './readYourWrites';
+
+// Authorization header carrying the judge's session token
+function authHeaders(token) {
+  return token ? { Authorization: `Bearer ${token}` } : {};
+}
 
 function EventDetails() {
   const location = useLocation();
   const judge = location.state ? location.state.judge : null;
+  // Session token from the login; the backend requires it on the judge endpoints
+  const token = location.state ? location.state.token : null;
   const email = judge ? judge.email : '';
   const specialJudgeEmail = 'judge1@sjsu.edu';
 
@@ -39,6 +48,32 @@ function EventDetails() {
   // **New State to track voting eligibility**
   const [canVote, setCanVote] = useState(false);
 
+  // Set when the live update stream is unavailable and we have to poll instead
+  const [streamUnavailable, setStreamUnavailable] = useState(false);
+
+  // Incremented to force a refetch of everything (e.g. after a stream resync)
+  const [refreshCount, setRefreshCount] = useState(0);
+
+  // Incremented whenever a pushed update may have changed voting eligibility
+  const [canVoteRefreshCount, setCanVoteRefreshCount] = useState(0);
+
+  // Subscribe to live updates pushed by the backend
+  useEffect(() => {
+    return subscribeToLiveUpdates(
+      API_BASE_URL,
+      {
+        event_status: (status) => setEventOngoing(status.is_ongoing),
+        current_performer: (data) => {
+          setCurrentPerformer(data.performer);
+          setCanVoteRefreshCount((count) => count + 1);
+        },
+        score: () => setCanVoteRefreshCount((count) => count + 1),
+        resync: () => setRefreshCount((count) => count + 1),
+      },
+      () => setStreamUnavailable(true)
+    );
+  }, [API_BASE_URL]);
+
   // Fetch performers from the backend when the component mounts
   useEffect(() => {
     const fetchPerformers = async () => {
@@ -60,7 +95,7 @@ function EventDetails() {
     fetchPerformers();
   }, [API_BASE_URL]);
 
-  // Fetch event status every 5 seconds
+  // Fetch event status (polled every 5 seconds only without the live stream)
   useEffect(() => {
     const fetchEventStatus = async () => {
       try {
@@ -78,18 +113,23 @@ function EventDetails() {
 
     // Initial fetch
     fetchEventStatus();
+    if (!streamUnavailable) {
+      return undefined;
+    }
 
     // Set interval to fetch every 5 seconds
     const interval = setInterval(fetchEventStatus, 5000);
 
     // Clear interval on component unmount
     return () => clearInterval(interval);
-  }, [API_BASE_URL]);
+  }, [API_BASE_URL, streamUnavailable, refreshCount]);
 
   // Function to fetch current performer
   const fetchCurrentPerformer = async () => {
     try {
-      const response = await fetch(`${API_BASE_URL}/current-performer`);
+      const response = await fetch(`${API_BASE_URL}/current-performer`, {
+        headers: readYourWritesHeaders(),
+      });
       const data = await response.json();
       if (response.ok && data.performer) {
         setCurrentPerformer(data.performer);
@@ -103,24 +143,29 @@ function EventDetails() {
     }
   };
 
-  // Fetch current performer every 5 seconds
+  // Fetch current performer (polled every 5 seconds only without the live stream)
   useEffect(() => {
     // Initial fetch
     fetchCurrentPerformer();
+    if (!streamUnavailable) {
+      return undefined;
+    }
 
     // Set interval to fetch every 5 seconds
     const interval = setInterval(fetchCurrentPerformer, 5000);
 
     // Clear interval on component unmount
     return () => clearInterval(interval);
-  }, [API_BASE_URL]);
+  }, [API_BASE_URL, streamUnavailable, refreshCount]);
 
   // **New useEffect to check voting eligibility**
   useEffect(() => {
     const fetchCanVote = async () => {
       if (judge && eventOngoing) {
         try {
-          const response = await fetch(`${API_BASE_URL}/canVote/${judge.judge_id}`);
+          const response = await fetch(`${API_BASE_URL}/canVote/${judge.judge_id}`, {
+            headers: { ...authHeaders(token), ...readYourWritesHeaders() },
+          });
           const data = await response.json();
           if (response.ok) {
             setCanVote(data.canVote);
@@ -138,15 +183,18 @@ function EventDetails() {
       }
     };
 
-    // Initial fetch
+    // Initial fetch, repeated whenever a pushed score or performer change arrives
     fetchCanVote();
+    if (!streamUnavailable) {
+      return undefined;
+    }
 
     // Set interval to fetch every 5 seconds
     const interval = setInterval(fetchCanVote, 5000);
 
     // Clear interval on component unmount
     return () => clearInterval(interval);
-  }, [API_BASE_URL, judge, eventOngoing]);
+  }, [API_BASE_URL, judge, token, eventOngoing, streamUnavailable, refreshCount, canVoteRefreshCount]);
 
   const handleScoreChange = (e) => {
     setScores({
@@ -186,13 +234,14 @@ function EventDetails() {
     try {
       const response = await fetch(`${API_BASE_URL}/scores`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...authHeaders(token) },
         body: JSON.stringify(data),
       });
 
       const result = await response.json();
 
       if (response.ok) {
+        rememberWrite(response);
         alert('Scores submitted successfully!');
         // Reset scores
         setScores({
@@ -228,13 +277,14 @@ function EventDetails() {
     try {
       const response = await fetch(`${API_BASE_URL}/set-current-performer`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: { 'Content-Type': 'application/json', ...authHeaders(token) },
         body: JSON.stringify({ performer_id: nextPerformer }),
       });
 
       const data = await response.json();
 
       if (response.ok) {
+        rememberWrite(response);
         alert('Current performer updated successfully!');
         // Reset next performer selection
         setNextPerformer('');
@@ -25,8 +25,8 @@ function JudgeLogin() {
       const data = await response.json();
 
       if (response.ok) {
-        // Navigate to Event Details and pass the judge data
-        navigate('/judge/event-details', { state: { judge: data.judge } });
+        // Navigate to Event Details and pass the judge data and session token
+        navigate('/judge/event-details', { state: { judge: data.judge, token: data.token } });
       } else {
         // Display error message
         setError(data.error || 'Login failed');
@@ -0,0 +1,37 @@
+// frontend/src/liveUpdates.js
+
+// Subscribe to the backend's Server-Sent Events stream.
+// `handlers` maps event names ('score', 'current_performer', 'event_status', 'resync')
+// to callbacks receiving the parsed event data. `onUnavailable` is called once if the
+// stream cannot be used (no EventSource support, or the server refused/closed it), so
+// the caller can fall back to polling. Returns a cleanup function.
+export function subscribeToLiveUpdates(apiBaseUrl, handlers, onUnavailable) {
+  if (typeof window === 'undefined' || !window.EventSource) {
+    onUnavailable();
+    return () => {};
+  }
+
+  const source = new window.EventSource(`${apiBaseUrl}/stream`);
+  let reportedUnavailable = false;
+
+  Object.entries(handlers).forEach(([eventName, handler]) => {
+    source.addEventListener(eventName, (event) => {
+      try {
+        handler(JSON.parse(event.data));
+      } catch (error) {
+        console.error(`Error handling live update '${eventName}':`, error);
+      }
+    });
+  });
+
+  source.onerror = () => {
+    // EventSource reconnects by itself while CONNECTING; CLOSED means it gave up
+    if (source.readyState === window.EventSource.CLOSED && !reportedUnavailable) {
+      reportedUnavailable = true;
+      console.error('Live updates unavailable, falling back to polling');
+      onUnavailable();
+    }
+  };
+
+  return () => source.close();
+}
@@ -0,0 +1,19 @@
+// frontend/src/readYourWrites.js
+
+// The backend may answer reads from a lagging replica. After a successful write it
+// returns an X-Last-Write timestamp; sending it back on the reads that must reflect
+// that write (canVote, current performer) makes the backend read from the primary.
+let lastWrite = null;
+
+// Remember the write timestamp of a successful write response
+export function rememberWrite(response) {
+  const stamp = response.headers.get('X-Last-Write');
+  if (stamp) {
+    lastWrite = stamp;
+  }
+}
+
+// Headers to add to a read that must see this client's last write
+export function readYourWritesHeaders() {
+  return lastWrite ? { 'X-Last-Write': lastWrite } : {};
+}